@@ -3,41 +3,131 @@ Flake8Analyzer - Analizador especializado para ejecutar Flake8.
 
 Responsabilidad única: Ejecutar flake8 sobre código Python y
 parsear su salida en objetos Finding.
+
+Cuando pycodestyle y pyflakes están disponibles, las reglas por defecto de
+flake8 (E/W y F) se ejecutan en el mismo proceso; el subproceso de flake8
+queda como respaldo.
 """
 
+import ast
+import asyncio
 import os
 import subprocess
 import sys
 import tempfile
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pycodestyle
+    from flake8.defaults import NOQA_FILE, NOQA_INLINE_REGEXP
+    from flake8.plugins.pyflakes import FLAKE8_PYFLAKES_CODES
+    from flake8.utils import parse_comma_separated_list
+    from pyflakes.checker import Checker as PyflakesChecker
+except ImportError:
+    pycodestyle = None
+    NOQA_FILE = NOQA_INLINE_REGEXP = None
+    FLAKE8_PYFLAKES_CODES = {}
+    parse_comma_separated_list = None
+    PyflakesChecker = None
+
+from src.schemas.finding import Finding, FindingsSoA, Severity
+
+# Severidad por prefijo del código de flake8 (el resto de prefijos -> LOW)
+_SEVERITY_MAP: Dict[str, Severity] = {
+    "F": Severity.HIGH,
+    "E": Severity.MEDIUM,
+    "C": Severity.MEDIUM,
+    "W": Severity.LOW,
+    "N": Severity.LOW,
+}
+
+if pycodestyle is not None:
+
+    class _StyleChecker(pycodestyle.Checker):
+        """
+        Checker de pycodestyle sin su manejo propio de ``# noqa``.
+
+        pycodestyle pasa ``self.noqa`` a sus reglas y omite líneas con cualquier
+        ``# noqa``; flake8 lo desactiva y aplica su propia semántica por código,
+        que aquí reproduce ``Flake8Analyzer._is_noqa``.
+        """
+
+        noqa = property(lambda self: False, lambda self, value: None)
+
+
+# Tipo de problema asignado a todos los hallazgos de flake8
+_ISSUE_TYPE = "style/pep8"
 
-from src.schemas.finding import Finding, Severity
+# Opciones de .flake8 del proyecto, aplicadas igual en todos los backends (en
+# proceso y subproceso) para que los hallazgos no dependan del directorio actual
+_MAX_LINE_LENGTH = 100
+_EXTEND_IGNORE: Tuple[str, ...] = ("E203",)
 
 
 class Flake8Analyzer:
     """
     Analizador que ejecuta Flake8 sobre código Python.
 
-    Encapsula la lógica de ejecución de flake8 como subproceso
-    y el parseo de su salida a objetos Finding.
+    Encapsula la lógica de ejecución de flake8 (en proceso o como
+    subproceso) y el parseo de su salida a objetos Finding.
 
     Attributes:
         _cmd_template: Lista base de comandos para ejecutar flake8.
+        _batch_cmd_template: Igual que ``_cmd_template`` pero incluye la ruta
+            del archivo en cada línea, para separar la salida por snippet.
+        _use_subprocess: Fuerza el subproceso de flake8 aunque el backend en
+            proceso esté disponible.
+        _style_options: Opciones de pycodestyle construidas una sola vez.
     """
 
-    def __init__(self) -> None:
-        """Inicializa el analizador Flake8 con la plantilla de comandos."""
+    def __init__(self, use_subprocess: bool = False) -> None:
+        """
+        Inicializa el analizador Flake8 con la plantilla de comandos.
+
+        Args:
+            use_subprocess: Si es True, siempre ejecuta flake8 como subproceso.
+        """
         self._cmd_template: List[str] = [
             sys.executable,
             "-m",
             "flake8",
+            "--isolated",
+            f"--max-line-length={_MAX_LINE_LENGTH}",
+            f"--extend-ignore={','.join(_EXTEND_IGNORE)}",
             "--format=%(row)d:%(col)d:%(code)s:%(text)s",
         ]
+        self._batch_cmd_template: List[str] = self._cmd_template[:-1] + [
+            "--format=%(path)s:%(row)d:%(col)d:%(code)s:%(text)s",
+        ]
+        self._use_subprocess = use_subprocess
+
+        # La configuración de pycodestyle no cambia entre llamadas: se construye
+        # aquí en lugar de crear un StyleGuide por cada análisis
+        self._style_options = (
+            pycodestyle.StyleGuide(
+                parse_argv=False,
+                config_file=False,
+                max_line_length=_MAX_LINE_LENGTH,
+                ignore=pycodestyle.DEFAULT_IGNORE.split(",") + list(_EXTEND_IGNORE),
+            ).options
+            if pycodestyle is not None
+            else None
+        )
+
+    def _in_process_available(self) -> bool:
+        """Indica si las reglas de flake8 pueden ejecutarse sin subproceso."""
+        return (
+            not self._use_subprocess
+            and pycodestyle is not None
+            and PyflakesChecker is not None
+            and self._style_options is not None
+        )
 
     def analyze(
         self,
         code_content: str,
         agent_name: str = "StyleAgent",
+        code_lines: Optional[List[str]] = None,
     ) -> List[Finding]:
         """
         Ejecuta flake8 sobre el código y retorna los hallazgos.
@@ -45,36 +135,234 @@ class Flake8Analyzer:
         Args:
             code_content: Código Python a analizar.
             agent_name: Nombre del agente que solicita el análisis.
+            code_lines: ``code_content.splitlines()`` ya calculado por el llamador
+                (p. ej. ``AnalysisContext.get_lines()``) para no volver a dividirlo.
 
         Returns:
             Lista de Finding encontrados por Flake8.
             Lista vacía si flake8 no está disponible.
         """
-        findings: List[Finding] = []
-        tmp_path: Optional[str] = None
+        if self._in_process_available():
+            try:
+                output = self._run_in_process(code_content)
+            except Exception:
+                # Silenciar para no romper el análisis, igual que el subproceso
+                return []
+            return self._parse_output(output, code_content, agent_name, code_lines)
 
+        return self._run_subprocess(code_content, agent_name, code_lines)
+
+    def analyze_to_columnar(
+        self,
+        code_content: str,
+        agent_name: str = "StyleAgent",
+        code_lines: Optional[List[str]] = None,
+    ) -> FindingsSoA:
+        """
+        Igual que ``analyze`` pero retorna los hallazgos en formato columnar.
+
+        La salida de flake8 se vuelca directamente en las columnas de
+        ``FindingsSoA`` sin crear un Finding por línea; pensado para
+        exportaciones y respuestas masivas.
+
+        Args:
+            code_content: Código Python a analizar.
+            agent_name: Nombre del agente que solicita el análisis.
+            code_lines: ``code_content.splitlines()`` ya calculado (opcional).
+
+        Returns:
+            FindingsSoA con una fila por hallazgo.
+            Vacío si flake8 no está disponible.
+        """
+        soa = FindingsSoA()
         try:
-            # Crear archivo temporal con el código
-            with tempfile.NamedTemporaryFile(
-                suffix=".py",
-                delete=False,
-                mode="w",
-                encoding="utf-8",
-            ) as tmp:
-                tmp.write(code_content)
-                tmp_path = tmp.name
-
-            # Ejecutar flake8
-            cmd = self._cmd_template + [tmp_path]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False,
+            if self._in_process_available():
+                output = self._run_in_process(code_content)
+            else:
+                output = self._subprocess_output(code_content)
+        except Exception:
+            # Silenciar para no romper el análisis, igual que analyze
+            return soa
+
+        if code_lines is None:
+            code_lines = code_content.splitlines()
+        for line_number, code, msg in self._iter_rows(output.splitlines()):
+            soa.append(
+                severity=self._map_severity(code),
+                issue_type=_ISSUE_TYPE,
+                message=msg,
+                line_number=line_number,
+                agent_name=agent_name,
+                code_snippet=self._snippet(code_lines, line_number),
+                rule_id=f"FLAKE8_{code}",
             )
+        return soa
+
+    async def analyze_async(
+        self,
+        code_content: str,
+        agent_name: str = "StyleAgent",
+    ) -> List[Finding]:
+        """
+        Versión asíncrona de ``analyze`` que no bloquea el event loop.
+
+        El backend en proceso se ejecuta en un hilo (``asyncio.to_thread``) y el
+        subproceso de respaldo con ``asyncio.create_subprocess_exec``, de modo
+        que varios análisis pueden combinarse con ``asyncio.gather``.
+
+        Args:
+            code_content: Código Python a analizar.
+            agent_name: Nombre del agente que solicita el análisis.
+
+        Returns:
+            Lista de Finding encontrados por Flake8.
+            Lista vacía si flake8 no está disponible.
+        """
+        if self._in_process_available():
+            return await asyncio.to_thread(self.analyze, code_content, agent_name)
+
+        return await self._run_subprocess_async(code_content, agent_name)
+
+    def analyze_batch(
+        self,
+        codes: List[str],
+        agent_name: str = "StyleAgent",
+    ) -> List[List[Finding]]:
+        """
+        Ejecuta flake8 sobre varios snippets y retorna los hallazgos de cada uno.
+
+        Con el backend en proceso cada snippet se analiza directamente; con el
+        subproceso de respaldo todos los snippets se escriben en un directorio
+        temporal y se analizan con una sola invocación de flake8, amortizando
+        el arranque del intérprete entre los N archivos.
+
+        Args:
+            codes: Lista de códigos Python a analizar.
+            agent_name: Nombre del agente que solicita el análisis.
+
+        Returns:
+            Lista con los Finding de cada snippet, en el mismo orden que ``codes``.
+        """
+        if self._in_process_available():
+            return [self.analyze(code, agent_name) for code in codes]
+
+        return self._run_subprocess_batch(codes, agent_name)
+
+    def _run_in_process(self, code_content: str) -> str:
+        """
+        Ejecuta pycodestyle y pyflakes sin lanzar un intérprete nuevo.
+
+        Reproduce la configuración de flake8: errores de sintaxis como E999,
+        pyflakes con los códigos F de flake8, pycodestyle con sus reglas
+        ignoradas por defecto más ``_MAX_LINE_LENGTH`` y ``_EXTEND_IGNORE``, y
+        los comentarios ``# noqa`` (ver ``_is_noqa``).
+
+        Args:
+            code_content: Código Python a analizar.
+
+        Returns:
+            Salida con el mismo formato que ``_cmd_template`` (fila:col:código:texto).
+        """
+        lines = code_content.splitlines(keepends=True)
+        # "# flake8: noqa" en una línea propia desactiva todo el archivo
+        if any(NOQA_FILE.match(line) for line in lines):
+            return ""
+
+        results: List[Tuple[int, int, str, str]] = []
+        try:
+            tree = ast.parse(code_content)
+        except SyntaxError as exc:
+            # IndentationError/TabError se reportan con su propio nombre, como flake8
+            results.append(
+                (exc.lineno or 1, exc.offset or 1, "E999", f"{type(exc).__name__}: {exc.msg}")
+            )
+            return self._format_results(results, lines)
+
+        flakes = PyflakesChecker(tree, filename="<code>")
+        for message in flakes.messages:
+            code = FLAKE8_PYFLAKES_CODES.get(type(message).__name__, "F999")
+            text = message.message % message.message_args
+            results.append((message.lineno, message.col + 1, code, text))
+
+        report = pycodestyle.BaseReport(self._style_options)
+
+        def collect_error(line_number: int, offset: int, text: str, check) -> None:
+            code = report.error(line_number, offset, text, check)
+            if code:
+                results.append((line_number, offset + 1, code, text[5:]))
+
+        checker = _StyleChecker(lines=lines, options=self._style_options, report=report)
+        checker.report_error = collect_error
+        checker.check_all()
+
+        return self._format_results(results, lines)
+
+    @classmethod
+    def _format_results(cls, results: List[Tuple[int, int, str, str]], lines: List[str]) -> str:
+        """
+        Descarta los resultados silenciados con ``# noqa`` y los ordena por posición.
+
+        Args:
+            results: Tuplas (fila, columna, código, texto).
+            lines: Líneas físicas del código (con saltos de línea).
+
+        Returns:
+            Salida con el formato fila:col:código:texto, una línea por resultado.
+        """
+        kept = sorted(
+            (result for result in results if not cls._is_noqa(lines, result[0], result[2])),
+            key=lambda result: (result[0], result[1]),
+        )
+        return "\n".join(f"{row}:{col}:{code}:{text}" for row, col, code, text in kept)
+
+    @staticmethod
+    def _is_noqa(lines: List[str], line_number: int, code: str) -> bool:
+        """
+        Indica si ``code`` está silenciado en la línea física ``line_number``.
+
+        Misma semántica que flake8: ``# noqa`` silencia todo y ``# noqa: CÓDIGOS``
+        solo los códigos listados (o con ese prefijo).
+
+        Args:
+            lines: Líneas físicas del código.
+            line_number: Número de línea (1-based) del resultado.
+            code: Código del resultado (ej: F401).
+
+        Returns:
+            True si el resultado debe descartarse.
+        """
+        if not 1 <= line_number <= len(lines):
+            return False
+        match = NOQA_INLINE_REGEXP.search(lines[line_number - 1])
+        if match is None:
+            return False
+        codes_str = match.group("codes")
+        if codes_str is None:
+            return True
+        return code.startswith(tuple(parse_comma_separated_list(codes_str)))
+
+    def _run_subprocess(
+        self, code_content: str, agent_name: str, code_lines: Optional[List[str]] = None
+    ) -> List[Finding]:
+        """
+        Ejecuta flake8 como subproceso enviando el código por stdin.
+
+        Args:
+            code_content: Código Python a analizar.
+            agent_name: Nombre del agente que solicita el análisis.
+            code_lines: Líneas del código ya divididas (opcional).
+
+        Returns:
+            Lista de Finding encontrados por Flake8.
+            Lista vacía si flake8 no está disponible.
+        """
+        findings: List[Finding] = []
+
+        try:
+            output = self._subprocess_output(code_content)
 
             # Parsear salida
-            findings = self._parse_output(result.stdout, code_content, agent_name)
+            findings = self._parse_output(output, code_content, agent_name, code_lines)
 
         except FileNotFoundError:
             # flake8 no está instalado
@@ -82,13 +370,110 @@ class Flake8Analyzer:
         except Exception:
             # Otros errores - silenciar para no romper el análisis
             pass
-        finally:
-            # Limpiar archivo temporal
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except OSError:
-                    pass
+
+        return findings
+
+    def _subprocess_output(self, code_content: str) -> str:
+        """
+        Ejecuta flake8 leyendo de stdin ("-"), sin archivo temporal.
+
+        Args:
+            code_content: Código Python a analizar.
+
+        Returns:
+            Salida estándar de flake8 (fila:col:código:texto).
+
+        Raises:
+            FileNotFoundError: Si flake8 no está instalado.
+        """
+        result = subprocess.run(
+            self._stdin_cmd(),
+            input=code_content,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+        )
+        return result.stdout
+
+    async def _run_subprocess_async(self, code_content: str, agent_name: str) -> List[Finding]:
+        """
+        Ejecuta flake8 como subproceso asíncrono enviando el código por stdin.
+
+        Args:
+            code_content: Código Python a analizar.
+            agent_name: Nombre del agente que solicita el análisis.
+
+        Returns:
+            Lista de Finding encontrados por Flake8.
+            Lista vacía si flake8 no está disponible.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._stdin_cmd(),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _stderr = await process.communicate(code_content.encode("utf-8"))
+        except Exception:
+            # flake8 no instalado u otros errores - silenciar como en analyze
+            return []
+
+        return self._parse_output(stdout.decode("utf-8"), code_content, agent_name)
+
+    def _stdin_cmd(self) -> List[str]:
+        """Comando de flake8 que lee el código desde stdin."""
+        return self._cmd_template + ["--stdin-display-name", "snippet.py", "-"]
+
+    def _run_subprocess_batch(self, codes: List[str], agent_name: str) -> List[List[Finding]]:
+        """
+        Ejecuta un único subproceso de flake8 para todos los snippets.
+
+        Cada snippet se escribe como ``<índice>.py``. La salida de flake8 se lee
+        línea a línea desde el pipe y cada línea se parsea al llegar, asignándola
+        al snippet según el nombre de archivo: no se retiene la salida completa.
+
+        Args:
+            codes: Lista de códigos Python a analizar.
+            agent_name: Nombre del agente que solicita el análisis.
+
+        Returns:
+            Lista con los Finding de cada snippet (listas vacías si flake8
+            no está disponible).
+        """
+        if not codes:
+            return []
+
+        findings: List[List[Finding]] = [[] for _ in codes]
+        code_lines = [code.splitlines() for code in codes]
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                filenames = [f"{index}.py" for index in range(len(codes))]
+                for filename, code in zip(filenames, codes):
+                    with open(os.path.join(tmp_dir, filename), "w", encoding="utf-8") as tmp:
+                        tmp.write(code)
+
+                with subprocess.Popen(
+                    self._batch_cmd_template + filenames,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    encoding="utf-8",
+                    cwd=tmp_dir,
+                ) as process:
+                    # Demultiplexar por nombre de archivo: "<índice>.py:fila:col:código:texto"
+                    for line in process.stdout:
+                        path, _, rest = line.rstrip("\n").partition(":")
+                        index = os.path.basename(path).removesuffix(".py")
+                        if index.isdigit() and int(index) < len(codes):
+                            findings[int(index)].extend(
+                                self._iter_parse((rest,), code_lines[int(index)], agent_name)
+                            )
+        except Exception:
+            # flake8 no instalado u otros errores - silenciar como en analyze
+            return [[] for _ in codes]
 
         return findings
 
@@ -97,51 +482,82 @@ class Flake8Analyzer:
         output: str,
         code_content: str,
         agent_name: str,
+        code_lines: Optional[List[str]] = None,
     ) -> List[Finding]:
         """
         Parsea la salida de flake8 y genera objetos Finding.
 
+        El código se divide en líneas una sola vez (o se reutiliza ``code_lines``)
+        y cada snippet se obtiene por índice.
+
         Args:
             output: Salida estándar de flake8.
             code_content: Código original para extraer snippets.
             agent_name: Nombre del agente para los findings.
+            code_lines: ``code_content.splitlines()`` ya calculado (opcional).
 
         Returns:
             Lista de Finding parseados.
         """
-        findings: List[Finding] = []
-        lines = code_content.splitlines()
+        if code_lines is None:
+            code_lines = code_content.splitlines()
+        return list(self._iter_parse(output.splitlines(), code_lines, agent_name))
 
-        for line in output.splitlines():
-            parts = line.split(":", 3)
-            if len(parts) < 4:
-                continue
+    def _iter_parse(
+        self,
+        output_lines: Iterable[str],
+        lines: List[str],
+        agent_name: str,
+    ) -> Iterator[Finding]:
+        """
+        Parsea líneas de salida de flake8 de forma perezosa.
+
+        Args:
+            output_lines: Líneas de salida (lista o stream del subproceso).
+            lines: Líneas del código original para extraer snippets.
+            agent_name: Nombre del agente para los findings.
+
+        Yields:
+            Un Finding por cada línea válida.
+        """
+        for line_number, code, msg in self._iter_rows(output_lines):
+            yield Finding(
+                severity=self._map_severity(code),
+                issue_type=_ISSUE_TYPE,
+                message=msg,
+                line_number=line_number,
+                code_snippet=self._snippet(lines, line_number),
+                suggestion=None,
+                agent_name=agent_name,
+                rule_id=f"FLAKE8_{code}",
+            )
 
-            line_str, _col_str, code, msg = parts
+    @staticmethod
+    def _iter_rows(output_lines: Iterable[str]) -> Iterator[Tuple[int, str, str]]:
+        """
+        Divide las líneas de salida de flake8 en (fila, código, mensaje).
+
+        Args:
+            output_lines: Líneas de salida (lista o stream del subproceso).
+
+        Yields:
+            Una tupla por cada línea válida.
+        """
+        for line in output_lines:
+            # Formato fijo fila:col:código:texto; líneas inválidas se omiten
             try:
+                line_str, _col_str, code, msg = line.split(":", 3)
                 line_number = int(line_str)
             except ValueError:
                 continue
+            yield line_number, code, msg.strip()
 
-            severity = self._map_severity(code)
-            code_snippet = ""
-            if 1 <= line_number <= len(lines):
-                code_snippet = lines[line_number - 1]
-
-            findings.append(
-                Finding(
-                    severity=severity,
-                    issue_type="style/pep8",
-                    message=msg.strip(),
-                    line_number=line_number,
-                    code_snippet=code_snippet,
-                    suggestion=None,
-                    agent_name=agent_name,
-                    rule_id=f"FLAKE8_{code}",
-                )
-            )
-
-        return findings
+    @staticmethod
+    def _snippet(lines: List[str], line_number: int) -> str:
+        """Retorna la línea ``line_number`` del código, o "" si no existe."""
+        if 1 <= line_number <= len(lines):
+            return lines[line_number - 1]
+        return ""
 
     @staticmethod
     def _map_severity(code: str) -> Severity:
@@ -161,12 +577,4 @@ class Flake8Analyzer:
         Returns:
             Nivel de severidad correspondiente.
         """
-        if not code:
-            return Severity.LOW
-
-        prefix = code[0].upper()
-        if prefix == "F":
-            return Severity.HIGH
-        if prefix in ("E", "C"):
-            return Severity.MEDIUM
-        return Severity.LOW
+        return _SEVERITY_MAP.get(code[:1].upper(), Severity.LOW)
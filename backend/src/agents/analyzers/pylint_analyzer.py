@@ -9,7 +9,7 @@ import os
 import subprocess
 import sys
 import tempfile
-from typing import List, Optional
+from typing import IO, Callable, List, Optional
 
 from src.schemas.finding import Finding, Severity
 
@@ -23,10 +23,21 @@ class PylintAnalyzer:
 
     Attributes:
         _cmd_template: Lista base de comandos para ejecutar pylint.
+        _tempfile_factory: Fábrica del archivo temporal donde se escribe el código.
     """
 
-    def __init__(self) -> None:
-        """Inicializa el analizador Pylint con la plantilla de comandos."""
+    def __init__(
+        self,
+        tempfile_factory: Callable[..., IO[str]] = tempfile.NamedTemporaryFile,
+    ) -> None:
+        """
+        Inicializa el analizador Pylint con la plantilla de comandos.
+
+        Args:
+            tempfile_factory: Fábrica compatible con ``tempfile.NamedTemporaryFile``
+                (inyectable para tests sin acceso al sistema de archivos).
+        """
+        self._tempfile_factory = tempfile_factory
         self._cmd_template: List[str] = [
             sys.executable,
             "-m",
@@ -57,7 +68,7 @@ class PylintAnalyzer:
 
         try:
             # Crear archivo temporal con el código
-            with tempfile.NamedTemporaryFile(
+            with self._tempfile_factory(
                 suffix=".py",
                 delete=False,
                 mode="w",
@@ -6,7 +6,7 @@ que pueden causar problemas de rendimiento, complejidad temporal excesiva o fuga
 """
 
 import ast
-from typing import List, Set
+from typing import Callable, List, Set
 
 from src.agents.base_agent import BaseAgent
 from src.schemas.analysis import AnalysisContext
@@ -153,6 +153,9 @@ class PerformanceAgent(BaseAgent):
         super().__init__(
             name="PerformanceAgent", version="1.1.0", category="performance", enabled=True
         )
+        # Dependencias inyectables (los tests las reemplazan sin parchear módulos)
+        self._get_ast: Callable[[AnalysisContext], ast.Module] = AnalysisContext.get_ast
+        self._visitor_factory: Callable[[], PerformanceVisitor] = PerformanceVisitor
 
     def analyze(self, context: AnalysisContext) -> List[Finding]:
         """
@@ -168,10 +171,11 @@ class PerformanceAgent(BaseAgent):
         findings: List[Finding] = []
 
         try:
-            tree = ast.parse(context.code_content)
+            # AST cacheado en el contexto: se parsea una sola vez por código fuente
+            tree = self._get_ast(context)
 
             # 1. Ejecutar el visitante principal (detecta problemas y recursos seguros)
-            visitor = PerformanceVisitor()
+            visitor = self._visitor_factory()
             visitor.visit(tree)
 
             for item in visitor.findings_data:
@@ -64,7 +64,7 @@ class QualityAgent(BaseAgent):
         try:
             # Parsear AST una sola vez
             try:
-                ast_tree = ast.parse(context.code_content)
+                ast_tree = context.get_ast()
             except SyntaxError as e:
                 self.log_error(f"Error de sintaxis al parsear AST: {e}")
                 return findings
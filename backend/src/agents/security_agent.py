@@ -9,14 +9,24 @@ Este agente analiza código Python en busca de problemas de seguridad comunes in
 """
 
 import ast
+import functools
 import re
-from typing import Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 
 from src.agents.base_agent import BaseAgent
 from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Finding, Severity
 
 
+class _CompiledRules(NamedTuple):
+    """Reglas regex de SecurityAgent ya compiladas (inmutables, compartidas)."""
+
+    sql_matchers: Tuple[Callable[[str], Any], ...]
+    credential_matchers: Tuple[Tuple[Callable[[str], Any], str, Severity], ...]
+    placeholder_matchers: Tuple[Callable[[str], Any], ...]
+    keyword_prefilter: re.Pattern
+
+
 class SecurityAgent(BaseAgent):
     """
     Agente especializado en detectar vulnerabilidades de seguridad en código Python.
@@ -64,38 +74,41 @@ class SecurityAgent(BaseAgent):
     }
 
     # Patrones de inyección SQL (regex) - CORREGIDOS
+    # Los cuantificadores posesivos (*+, {n,}+) nunca ceden caracteres ya
+    # consumidos: el siguiente token no puede coincidir con ellos, así que la
+    # semántica no cambia y se evita el backtracking sobre líneas adversariales
     SQL_INJECTION_PATTERNS: List[str] = [
-        r'execute\s*\(\s*["\'].*\+',  # Concatenación con +
-        r'execute\s*\(\s*f["\']',  # f-strings en execute directo
-        r'execute\s*\(\s*["\'].*%s',  # %s formatting
-        r'execute\s*\(\s*["\'].*\.format',  # .format() en execute
-        r'\.execute\s*\(\s*["\'].*\+\s*\w',  # execute con concatenación y variable
+        r'execute\s*+\(\s*+["\'][^+\n]*+\+',  # Concatenación con +
+        r'execute\s*+\(\s*+f["\']',  # f-strings en execute directo
+        r'execute\s*+\(\s*+["\'].*%s',  # %s formatting
+        r'execute\s*+\(\s*+["\'].*\.format',  # .format() en execute
+        r'\.execute\s*+\(\s*+["\'].*\+\s*+\w',  # execute con concatenación y variable
     ]
 
     # Patrones de credenciales (regex)
     CREDENTIAL_PATTERNS: List[dict] = [
         {
-            "pattern": r'password\s*=\s*["\'][^"\']{8,}["\']',
+            "pattern": r'password\s*+=\s*+["\'][^"\']{8,}+["\']',
             "name": "password",
             "severity": Severity.CRITICAL,
         },
         {
-            "pattern": r'api[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
+            "pattern": r'api[_-]?key\s*+=\s*+["\'][^"\']{10,}+["\']',
             "name": "api_key",
             "severity": Severity.CRITICAL,
         },
         {
-            "pattern": r'secret[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
+            "pattern": r'secret[_-]?key\s*+=\s*+["\'][^"\']{10,}+["\']',
             "name": "secret_key",
             "severity": Severity.CRITICAL,
         },
         {
-            "pattern": r'token\s*=\s*["\'][^"\']{10,}["\']',
+            "pattern": r'token\s*+=\s*+["\'][^"\']{10,}+["\']',
             "name": "token",
             "severity": Severity.HIGH,
         },
         {
-            "pattern": r'access[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
+            "pattern": r'access[_-]?key\s*+=\s*+["\'][^"\']{10,}+["\']',
             "name": "access_key",
             "severity": Severity.HIGH,
         },
@@ -125,6 +138,9 @@ class SecurityAgent(BaseAgent):
         "Blowfish",
     }
 
+    # Palabra clave presente en todos los SQL_INJECTION_PATTERNS (prefiltro)
+    SQL_KEYWORD: str = "execute"
+
     SQL_INJECTION_MESSAGE = (
         "Posible vulnerabilidad de inyección SQL detectada - "
         "entrada de usuario concatenada o formateada en consulta"
@@ -137,8 +153,75 @@ class SecurityAgent(BaseAgent):
     def __init__(self):
         """Inicializa SecurityAgent con reglas de seguridad predefinidas."""
         super().__init__(name="SecurityAgent", version="1.0.0", category="security", enabled=True)
+
+        # Reglas compiladas compartidas por todas las instancias de la clase
+        self._rules: _CompiledRules = type(self)._compiled_rules()
+
         self.logger.info("SecurityAgent inicializado con 4 módulos de detección")
 
+    @classmethod
+    @functools.cache
+    def _compiled_rules(cls) -> _CompiledRules:
+        """
+        Compila las reglas regex una sola vez por clase (cache a nivel de clase).
+
+        Los matchers precompilados evitan recompilar o decidir regex vs literal
+        en cada línea: el bucle de análisis solo invoca el método de búsqueda.
+
+        Returns:
+            _CompiledRules inmutable con los matchers de SQL, credenciales,
+            placeholders y el prefiltro de palabras clave
+        """
+        # Prefiltro multi-patrón: una sola regex con todas las palabras clave
+        # (execute, password, api_key, ...) que se recorre una vez sobre el código
+        credential_keywords = "|".join(
+            config["pattern"].split(r"\s*", 1)[0] for config in cls.CREDENTIAL_PATTERNS
+        )
+        return _CompiledRules(
+            sql_matchers=tuple(
+                cls._build_matcher(pattern, re.IGNORECASE | re.MULTILINE)
+                for pattern in cls.SQL_INJECTION_PATTERNS
+            ),
+            credential_matchers=tuple(
+                (
+                    re.compile(config["pattern"], re.IGNORECASE).search,
+                    config["name"],
+                    config["severity"],
+                )
+                for config in cls.CREDENTIAL_PATTERNS
+            ),
+            placeholder_matchers=tuple(
+                cls._build_matcher(pattern, re.IGNORECASE) for pattern in cls.PLACEHOLDER_PATTERNS
+            ),
+            keyword_prefilter=re.compile(
+                rf"(?P<sql>{cls.SQL_KEYWORD})|(?P<credential>{credential_keywords})",
+                re.IGNORECASE,
+            ),
+        )
+
+    @staticmethod
+    def _build_matcher(pattern: str, flags: int = 0) -> Callable[[str], Any]:
+        """
+        Construye el método de búsqueda para un patrón.
+
+        Si el patrón no contiene metacaracteres regex se usa una búsqueda literal
+        (``in``), mucho más barata; en otro caso se precompila la regex.
+
+        Args:
+            pattern: Patrón regex o literal
+            flags: Flags de ``re``; con IGNORECASE el literal y el texto recibido
+                se comparan en minúsculas
+
+        Returns:
+            Callable que recibe el texto y retorna un valor truthy si hay coincidencia
+        """
+        if re.escape(pattern) == pattern:
+            if flags & re.IGNORECASE:
+                literal = pattern.lower()
+                return lambda text: literal in text.lower()
+            return lambda text: pattern in text
+        return re.compile(pattern, flags).search
+
     def analyze(self, context: AnalysisContext) -> List[Finding]:
         """
         Analiza código Python en busca de vulnerabilidades de seguridad.
@@ -169,6 +252,7 @@ class SecurityAgent(BaseAgent):
         """
         self.log_info(f"Iniciando análisis de seguridad para {context.filename}")
         findings: List[Finding] = []
+        keyword_lines = self._find_keyword_lines(context)
 
         try:
             # Módulo 1: Detectar funciones peligrosas
@@ -177,12 +261,14 @@ class SecurityAgent(BaseAgent):
             self.log_debug(f"Funciones peligrosas: {len(dangerous_findings)} hallazgos")
 
             # Módulo 2: Detectar patrones de inyección SQL (regex + AST)
-            sql_findings = self._detect_sql_injection(context)
+            sql_findings = self._detect_sql_injection(context, keyword_lines["sql"])
             findings.extend(sql_findings)
             self.log_debug(f"Inyección SQL: {len(sql_findings)} hallazgos")
 
             # Módulo 3: Detectar credenciales hardcodeadas
-            credential_findings = self._detect_hardcoded_credentials(context)
+            credential_findings = self._detect_hardcoded_credentials(
+                context, keyword_lines["credential"]
+            )
             findings.extend(credential_findings)
             self.log_debug(f"Credenciales hardcodeadas: {len(credential_findings)} hallazgos")
 
@@ -274,7 +360,32 @@ class SecurityAgent(BaseAgent):
 
         return findings
 
-    def _detect_sql_injection(self, context: AnalysisContext) -> List[Finding]:
+    def _find_keyword_lines(self, context: AnalysisContext) -> Dict[str, Set[int]]:
+        """
+        Localiza en una sola pasada las líneas candidatas para las reglas regex.
+
+        Recorre el código una vez con el prefiltro de palabras clave y convierte
+        cada offset en número de línea mediante búsqueda binaria sobre los saltos
+        de línea. Solo esas líneas pueden coincidir con las reglas completas.
+
+        Args:
+            context: Contexto de análisis con el código a analizar
+
+        Returns:
+            Diccionario {"sql": líneas, "credential": líneas} (1-based)
+        """
+        keyword_lines: Dict[str, Set[int]] = {"sql": set(), "credential": set()}
+        for match in self._rules.keyword_prefilter.finditer(context.code_content):
+            # Cada alternativa del prefiltro es un grupo con nombre
+            group = match.lastgroup
+            if group is not None:
+                keyword_lines[group].add(context.get_line_number(match.start()))
+
+        return keyword_lines
+
+    def _detect_sql_injection(
+        self, context: AnalysisContext, candidate_lines: Optional[Set[int]] = None
+    ) -> List[Finding]:
         """
         Detecta vulnerabilidades de inyección SQL usando patrones regex mejorados.
 
@@ -287,31 +398,38 @@ class SecurityAgent(BaseAgent):
 
         Args:
             context: Contexto de análisis con el código a analizar
+            candidate_lines: Líneas que contienen la palabra clave SQL (se calculan
+                si no se proporcionan)
 
         Returns:
             Lista de hallazgos para vulnerabilidades de inyección SQL
         """
         findings: List[Finding] = []
         found_sql_lines: Set[int] = set()
+        if candidate_lines is None:
+            candidate_lines = self._find_keyword_lines(context)["sql"]
 
-        findings.extend(self._detect_sql_injection_patterns(context, found_sql_lines))
+        findings.extend(
+            self._detect_sql_injection_patterns(context, found_sql_lines, candidate_lines)
+        )
         findings.extend(self._detect_sql_injection_ast(context, found_sql_lines))
         return findings
 
     def _detect_sql_injection_patterns(
-        self, context: AnalysisContext, found_sql_lines: Set[int]
+        self, context: AnalysisContext, found_sql_lines: Set[int], candidate_lines: Set[int]
     ) -> List[Finding]:
-        """Analiza línea por línea usando regex para detectar SQL injection directa."""
+        """Aplica las regex de SQL injection directa solo a las líneas candidatas."""
         findings: List[Finding] = []
-        lines = context.code_content.splitlines()
+        lines = context.get_lines()
 
-        for line_num, line in enumerate(lines, start=1):
+        for line_num in sorted(candidate_lines):
+            line = lines[line_num - 1]
             stripped = line.strip()
             if not stripped or stripped.startswith("#") or line_num in found_sql_lines:
                 continue
 
-            for pattern in self.SQL_INJECTION_PATTERNS:
-                if re.search(pattern, line, re.IGNORECASE | re.MULTILINE):
+            for matcher in self._rules.sql_matchers:
+                if matcher(line):
                     findings.append(
                         Finding(
                             severity=Severity.HIGH,
@@ -433,7 +551,9 @@ class SecurityAgent(BaseAgent):
             return True
         return False
 
-    def _detect_hardcoded_credentials(self, context: AnalysisContext) -> List[Finding]:
+    def _detect_hardcoded_credentials(
+        self, context: AnalysisContext, candidate_lines: Optional[Set[int]] = None
+    ) -> List[Finding]:
         """
         Detecta credenciales hardcodeadas usando patrones regex y detección de placeholders.
 
@@ -447,25 +567,26 @@ class SecurityAgent(BaseAgent):
 
         Args:
             context: Contexto de análisis con el código a analizar
+            candidate_lines: Líneas que contienen alguna palabra clave de
+                credenciales (se calculan si no se proporcionan)
 
         Returns:
             Lista de hallazgos para credenciales hardcodeadas
         """
         findings: List[Finding] = []
-        lines = context.code_content.splitlines()
+        lines = context.get_lines()
+        if candidate_lines is None:
+            candidate_lines = self._find_keyword_lines(context)["credential"]
 
-        for line_num, line in enumerate(lines, start=1):
+        for line_num in sorted(candidate_lines):
+            line = lines[line_num - 1]
             # Saltar comentarios y líneas vacías
             stripped = line.strip()
             if not stripped or stripped.startswith("#"):
                 continue
 
-            for cred_config in self.CREDENTIAL_PATTERNS:
-                pattern = cred_config["pattern"]
-                cred_name = cred_config["name"]
-                severity = cred_config["severity"]
-
-                match = re.search(pattern, line, re.IGNORECASE)
+            for matcher, cred_name, severity in self._rules.credential_matchers:
+                match = matcher(line)
                 if match:
                     value = match.group(0).split("=")[1].strip().strip("\"'")
                     if self._is_placeholder(value) or len(value) < 8:
@@ -595,7 +716,7 @@ class SecurityAgent(BaseAgent):
         Returns:
             Fragmento de código como string
         """
-        lines = context.code_content.splitlines()
+        lines = context.get_lines()
 
         if 1 <= line_number <= len(lines):
             start = max(0, line_number - 1 - context_lines)
@@ -639,10 +760,4 @@ class SecurityAgent(BaseAgent):
         Returns:
             True si el valor es un placeholder, False en caso contrario
         """
-        value_lower = value.lower()
-
-        for pattern in self.PLACEHOLDER_PATTERNS:
-            if re.search(pattern, value_lower, re.IGNORECASE):
-                return True
-
-        return False
+        return any(matcher(value) for matcher in self._rules.placeholder_matchers)
@@ -12,13 +12,25 @@ Este agente analiza codigo Python en busca de problemas de estilo incluyendo:
 
 import ast
 import re
-from typing import Dict, List, Set
+from typing import Dict, List, NamedTuple, Optional, Set, Union
 
 from src.agents.analyzers import flake8_analyzer, pylint_analyzer
 from src.agents.base_agent import BaseAgent
 from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Finding, Severity
 
+_DefinitionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+_ImportNode = Union[ast.Import, ast.ImportFrom]
+
+
+class _StyleNodes(NamedTuple):
+    """Nodos del AST que usan los chequeos de estilo, agrupados en una sola pasada."""
+
+    definitions: List[_DefinitionNode]
+    imports: List[_ImportNode]
+    naming: List[Union[_DefinitionNode, ast.Assign]]
+    used_names: Set[str]
+
 
 class StyleAgent(BaseAgent):
     """Agente especializado en detectar violaciones de estilo en codigo Python.
@@ -82,18 +94,21 @@ class StyleAgent(BaseAgent):
             findings.extend(line_findings)
             self.log_debug(f"Estilo de lineas: {len(line_findings)} hallazgos")
 
+            # Recorrido unico del AST compartido por los modulos 2-4
+            style_nodes = self._collect_style_nodes(context)
+
             # Modulo 2: docstrings
-            docstring_findings = self._check_docstrings(context)
+            docstring_findings = self._check_docstrings(context, style_nodes)
             findings.extend(docstring_findings)
             self.log_debug(f"Docstrings: {len(docstring_findings)} hallazgos")
 
             # Modulo 3: imports
-            import_findings = self._check_imports(context)
+            import_findings = self._check_imports(context, style_nodes)
             findings.extend(import_findings)
             self.log_debug(f"Imports: {len(import_findings)} hallazgos")
 
             # Modulo 4: convenciones de nombres
-            naming_findings = self._check_naming_conventions(context)
+            naming_findings = self._check_naming_conventions(context, style_nodes)
             findings.extend(naming_findings)
             self.log_debug(f"Convenciones de nombres: {len(naming_findings)} hallazgos")
 
@@ -146,14 +161,14 @@ class StyleAgent(BaseAgent):
         - Mas de dos lineas en blanco consecutivas
         """
         findings: List[Finding] = []
-        lines = context.code_content.splitlines()
+        lines = context.get_lines()
         blank_run = 0
 
         for line_num, line in enumerate(lines, start=1):
             stripped = line.rstrip("\n")
 
             # Contar lineas en blanco consecutivas
-            if stripped.strip() == "":
+            if not stripped.strip():
                 blank_run += 1
             else:
                 blank_run = 0
@@ -180,7 +195,7 @@ class StyleAgent(BaseAgent):
                 )
 
             # Espacios en blanco al final de la linea
-            if stripped.rstrip(" \t") != stripped:
+            if stripped.endswith((" ", "\t")):
                 findings.append(
                     Finding(
                         severity=Severity.LOW,
@@ -194,8 +209,8 @@ class StyleAgent(BaseAgent):
                     )
                 )
 
-            # Tabs en la indentacion
-            if re.match(r"^\t+", line) or re.match(r"^ +\t+", line):
+            # Tabs en la indentacion (equivale a ^\t+ o ^ +\t+ sin pasar por re)
+            if line.lstrip(" ").startswith("\t"):
                 findings.append(
                     Finding(
                         severity=Severity.MEDIUM,
@@ -227,86 +242,103 @@ class StyleAgent(BaseAgent):
         return findings
 
     # ---------------------------------------------------------------------
-    # Modulo 2: docstrings
+    # Recorrido del AST
     # ---------------------------------------------------------------------
-    def _check_docstrings(self, context: AnalysisContext) -> List[Finding]:
+    def _collect_style_nodes(self, context: AnalysisContext) -> _StyleNodes:
         """
-        Detecta docstrings faltantes en funciones y clases publicas.
+        Recorre el AST una sola vez y agrupa los nodos que revisan los modulos
+        de docstrings, imports y convenciones de nombres.
+
+        Si el codigo tiene errores de sintaxis devuelve grupos vacios.
         """
-        findings: List[Finding] = []
+        nodes = _StyleNodes(definitions=[], imports=[], naming=[], used_names=set())
 
         try:
-            tree = ast.parse(context.code_content)
+            tree = context.get_ast()
         except SyntaxError:
-            return findings
+            return nodes
 
         for node in ast.walk(tree):
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                name = node.name
-                if not self._is_public_member(name):
-                    continue
+                nodes.definitions.append(node)
+                nodes.naming.append(node)
+            elif isinstance(node, ast.Assign):
+                nodes.naming.append(node)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                nodes.imports.append(node)
+            elif isinstance(node, ast.Name):
+                nodes.used_names.add(node.id)
 
-                doc = ast.get_docstring(node)
-                if not doc:
-                    if isinstance(node, ast.AsyncFunctionDef):
-                        node_type = "funcion asincrona"
-                    elif isinstance(node, ast.ClassDef):
-                        node_type = "clase"
-                    else:
-                        node_type = "funcion"
+        return nodes
 
-                    findings.append(
-                        Finding(
-                            severity=Severity.LOW,
-                            issue_type="style/documentation",
-                            message=f"La {node_type} publica '{name}' no tiene docstring",
-                            line_number=node.lineno,
-                            code_snippet=self._get_code_snippet(context, node.lineno),
-                            suggestion=(
-                                "Agrega un docstring descriptivo que explique el "
-                                "comportamiento, parametros y valor de retorno"
-                            ),
-                            agent_name=self.name,
-                            rule_id="STYLE010_MISSING_DOCSTRING",
-                        )
+    # ---------------------------------------------------------------------
+    # Modulo 2: docstrings
+    # ---------------------------------------------------------------------
+    def _check_docstrings(
+        self, context: AnalysisContext, nodes: Optional[_StyleNodes] = None
+    ) -> List[Finding]:
+        """
+        Detecta docstrings faltantes en funciones y clases publicas.
+        """
+        findings: List[Finding] = []
+        if nodes is None:
+            nodes = self._collect_style_nodes(context)
+
+        for node in nodes.definitions:
+            name = node.name
+            if not self._is_public_member(name):
+                continue
+
+            doc = ast.get_docstring(node)
+            if not doc:
+                if isinstance(node, ast.AsyncFunctionDef):
+                    node_type = "funcion asincrona"
+                elif isinstance(node, ast.ClassDef):
+                    node_type = "clase"
+                else:
+                    node_type = "funcion"
+
+                findings.append(
+                    Finding(
+                        severity=Severity.LOW,
+                        issue_type="style/documentation",
+                        message=f"La {node_type} publica '{name}' no tiene docstring",
+                        line_number=node.lineno,
+                        code_snippet=self._get_code_snippet(context, node.lineno),
+                        suggestion=(
+                            "Agrega un docstring descriptivo que explique el "
+                            "comportamiento, parametros y valor de retorno"
+                        ),
+                        agent_name=self.name,
+                        rule_id="STYLE010_MISSING_DOCSTRING",
                     )
+                )
 
         return findings
 
     # ---------------------------------------------------------------------
     # Modulo 3: imports
     # ---------------------------------------------------------------------
-    def _check_imports(self, context: AnalysisContext) -> List[Finding]:  # noqa: C901
+    def _check_imports(  # noqa: C901
+        self, context: AnalysisContext, nodes: Optional[_StyleNodes] = None
+    ) -> List[Finding]:
         """
         Detecta problemas basicos en imports:
         - Imports no usados
         - Imports duplicados
         """
         findings: List[Finding] = []
-
-        try:
-            tree = ast.parse(context.code_content)
-        except SyntaxError:
-            return findings
+        if nodes is None:
+            nodes = self._collect_style_nodes(context)
 
         imported: Dict[str, List[int]] = {}
-        used_names: Set[str] = set()
+        used_names = nodes.used_names
 
-        # Recolectar imports y usos de nombres
-        for node in ast.walk(tree):
-            # Imports
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    alias_name = alias.asname or alias.name
-                    imported.setdefault(alias_name, []).append(node.lineno)
-            elif isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    alias_name = alias.asname or alias.name
-                    imported.setdefault(alias_name, []).append(node.lineno)
-
-            # Uso de nombres
-            if isinstance(node, ast.Name):
-                used_names.add(node.id)
+        # Recolectar imports (Import e ImportFrom)
+        for node in nodes.imports:
+            for alias in node.names:
+                alias_name = alias.asname or alias.name
+                imported.setdefault(alias_name, []).append(node.lineno)
 
         # Detectar imports no usados
         for name, lines in imported.items():
@@ -347,18 +379,17 @@ class StyleAgent(BaseAgent):
     # ---------------------------------------------------------------------
     # Modulo 4: convenciones de nombres
     # ---------------------------------------------------------------------
-    def _check_naming_conventions(self, context: AnalysisContext) -> List[Finding]:  # noqa: C901
+    def _check_naming_conventions(  # noqa: C901
+        self, context: AnalysisContext, nodes: Optional[_StyleNodes] = None
+    ) -> List[Finding]:
         """
         Detecta violaciones de convenciones de nombres para funciones, clases y variables.
         """
         findings: List[Finding] = []
+        if nodes is None:
+            nodes = self._collect_style_nodes(context)
 
-        try:
-            tree = ast.parse(context.code_content)
-        except SyntaxError:
-            return findings
-
-        for node in ast.walk(tree):
+        for node in nodes.naming:
             # Funciones
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 name = node.name
@@ -495,6 +526,7 @@ class StyleAgent(BaseAgent):
             findings = self.flake8_analyzer.analyze(
                 code_content=context.code_content,
                 agent_name=self.name,
+                code_lines=context.get_lines(),
             )
             self.log_debug(f"Flake8Analyzer retorno {len(findings)} hallazgos")
         except FileNotFoundError:
@@ -538,7 +570,7 @@ class StyleAgent(BaseAgent):
         """
         Extrae un fragmento de codigo alrededor de una linea dada.
         """
-        lines = context.code_content.splitlines()
+        lines = context.get_lines()
 
         if 1 <= line_number <= len(lines):
             start = max(0, line_number - 1 - context_lines)
@@ -30,6 +30,9 @@ class AISettings(BaseSettings):
         AI_TEMPERATURE: Temperatura del modelo (0.0-1.0, menor = más determinista)
         AI_MAX_OUTPUT_TOKENS: Límite de tokens en respuesta
         AI_RATE_LIMIT_PER_HOUR: Límite de llamadas por usuario por hora
+        AI_EXPLANATION_CACHE_SIZE: Explicaciones recientes en memoria (0 = sin cache)
+        AI_CACHE_HITS_CONSUME_RATE_LIMIT: Si los aciertos de cache cuentan para el límite
+        AI_MAX_CONCURRENT_EXPLANATIONS: Llamadas simultáneas al modelo en explain_findings
         AI_MAX_RETRIES: Intentos máximos ante errores transitorios
         AI_BACKOFF_FACTOR: Factor de espera exponencial entre reintentos
     """
@@ -85,6 +88,22 @@ class AISettings(BaseSettings):
         description="Límite de llamadas por usuario por hora",
     )
 
+    # Cache de explicaciones (evita repetir llamadas para el mismo hallazgo)
+    AI_EXPLANATION_CACHE_SIZE: int = Field(
+        default=1024,
+        ge=0,
+        description="Número máximo de explicaciones cacheadas en memoria (0 = deshabilitado)",
+    )
+    AI_CACHE_HITS_CONSUME_RATE_LIMIT: bool = Field(
+        default=False,
+        description="Si una explicación servida desde cache consume el rate limit",
+    )
+    AI_MAX_CONCURRENT_EXPLANATIONS: int = Field(
+        default=4,
+        ge=1,
+        description="Máximo de explicaciones generadas en paralelo por explain_findings",
+    )
+
     # Retry Configuration (exponential backoff)
     AI_MAX_RETRIES: int = Field(
         default=3,
@@ -7,10 +7,11 @@ enviados a la IA generativa.
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import cached_property, lru_cache
+from typing import Dict, Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class SecurityContext:
     """
     Contexto de seguridad para una categoría de vulnerabilidad.
@@ -22,14 +23,41 @@ class SecurityContext:
         mitigation: Estrategias de mitigación genéricas
         references: URLs de documentación oficial
         cwe_ids: IDs de CWE relacionados
+
+    Note:
+        references y cwe_ids se guardan como tuplas: el contexto es inmutable y
+        hashable, y se conserva el orden con el que se muestran en el prompt.
     """
 
     category: str
     description: str
     impact: str
     mitigation: str
-    references: List[str]
-    cwe_ids: List[str]
+    references: Tuple[str, ...]
+    cwe_ids: Tuple[str, ...]
+
+    @cached_property
+    def formatted(self) -> str:
+        """Texto formateado para el prompt de IA (se calcula una sola vez)."""
+        return f"""
+=== CONTEXTO DE SEGURIDAD (OWASP) ===
+Categoría: {self.category}
+
+Descripción:
+{self.description}
+
+Impacto Potencial:
+{self.impact}
+
+Estrategias de Mitigación:
+{self.mitigation}
+
+Referencias:
+{chr(10).join(f"- {ref}" for ref in self.references)}
+
+CWEs Relacionados: {", ".join(self.cwe_ids)}
+===================================
+"""
 
 
 # =============================================================================
@@ -56,11 +84,11 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Deshabilitar listado de directorios del servidor web.\n"
             "5. Registrar fallos de control de acceso y alertar a administradores."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/A01_2021-Broken_Access_Control/",
             "https://cheatsheetseries.owasp.org/cheatsheets/Authorization_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-200", "CWE-284", "CWE-285", "CWE-352", "CWE-639"],
+        ),
+        cwe_ids=("CWE-200", "CWE-284", "CWE-285", "CWE-352", "CWE-639"),
     ),
     # A02:2021 - Cryptographic Failures
     "cryptographic_failures": SecurityContext(
@@ -81,11 +109,11 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Usar protocolos actualizados (TLS 1.3) para datos en tránsito.\n"
             "5. No usar algoritmos criptográficos obsoletos (MD5, SHA1, DES)."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/A02_2021-Cryptographic_Failures/",
             "https://cheatsheetseries.owasp.org/cheatsheets/Cryptographic_Storage_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-259", "CWE-327", "CWE-328", "CWE-330", "CWE-331"],
+        ),
+        cwe_ids=("CWE-259", "CWE-327", "CWE-328", "CWE-330", "CWE-331"),
     ),
     # A03:2021 - Injection
     "injection": SecurityContext(
@@ -106,14 +134,14 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Usar LIMIT y otros controles SQL para prevenir divulgación masiva.\n"
             "5. No concatenar cadenas con datos del usuario en consultas dinámicas."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/A03_2021-Injection/",
             "https://cheatsheetseries.owasp.org/cheatsheets/"
             "SQL_Injection_Prevention_Cheat_Sheet.html",
             "https://cheatsheetseries.owasp.org/cheatsheets/"
             "Query_Parameterization_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-77", "CWE-78", "CWE-79", "CWE-89", "CWE-94"],
+        ),
+        cwe_ids=("CWE-77", "CWE-78", "CWE-79", "CWE-89", "CWE-94"),
     ),
     # A04:2021 - Insecure Design
     "insecure_design": SecurityContext(
@@ -134,11 +162,11 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Integrar controles de seguridad en las historias de usuario.\n"
             "5. Escribir pruebas unitarias y de integración para validar flujos críticos."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/A04_2021-Insecure_Design/",
             "https://cheatsheetseries.owasp.org/cheatsheets/Threat_Modeling_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-209", "CWE-256", "CWE-501", "CWE-522"],
+        ),
+        cwe_ids=("CWE-209", "CWE-256", "CWE-501", "CWE-522"),
     ),
     # A05:2021 - Security Misconfiguration
     "security_misconfiguration": SecurityContext(
@@ -159,12 +187,12 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Arquitectura de aplicación segmentada con contenedores.\n"
             "5. Enviar directivas de seguridad a clientes (CSP, X-Frame-Options)."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/A05_2021-Security_Misconfiguration/",
             "https://cheatsheetseries.owasp.org/cheatsheets/"
             "Configuration_Security_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-16", "CWE-611", "CWE-1004", "CWE-2"],
+        ),
+        cwe_ids=("CWE-16", "CWE-611", "CWE-1004", "CWE-2"),
     ),
     # A06:2021 - Vulnerable and Outdated Components
     "vulnerable_components": SecurityContext(
@@ -185,12 +213,12 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Obtener componentes solo de fuentes oficiales sobre enlaces seguros.\n"
             "5. Monitorear bibliotecas y componentes sin mantenimiento."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/" "A06_2021-Vulnerable_and_Outdated_Components/",
             "https://cheatsheetseries.owasp.org/cheatsheets/"
             "Vulnerable_Dependency_Management_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-1104"],
+        ),
+        cwe_ids=("CWE-1104",),
     ),
     # A07:2021 - Identification and Authentication Failures
     "authentication_failures": SecurityContext(
@@ -211,12 +239,12 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. Limitar o retrasar cada vez más los intentos de login fallidos.\n"
             "5. Usar un gestor de sesiones seguro del lado del servidor con alta entropía."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/A07_2021-Identification_and_Authentication_Failures/",
             "https://cheatsheetseries.owasp.org/cheatsheets/Authentication_Cheat_Sheet.html",
             "https://cheatsheetseries.owasp.org/cheatsheets/Session_Management_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-287", "CWE-384", "CWE-307", "CWE-613"],
+        ),
+        cwe_ids=("CWE-287", "CWE-384", "CWE-307", "CWE-613"),
     ),
     # A08:2021 - Software and Data Integrity Failures
     "integrity_failures": SecurityContext(
@@ -241,11 +269,11 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "5. No enviar datos serializados sin firmar o sin cifrar "
             "a clientes no confiables."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/" "A08_2021-Software_and_Data_Integrity_Failures/",
             "https://cheatsheetseries.owasp.org/cheatsheets/" "Deserialization_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-829", "CWE-494", "CWE-502"],
+        ),
+        cwe_ids=("CWE-829", "CWE-494", "CWE-502"),
     ),
     # A09:2021 - Security Logging and Monitoring Failures
     "logging_failures": SecurityContext(
@@ -271,11 +299,11 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "para actividades sospechosas.\n"
             "5. Establecer un plan de respuesta y recuperación de incidentes."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/" "A09_2021-Security_Logging_and_Monitoring_Failures/",
             "https://cheatsheetseries.owasp.org/cheatsheets/Logging_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-117", "CWE-223", "CWE-532", "CWE-778"],
+        ),
+        cwe_ids=("CWE-117", "CWE-223", "CWE-532", "CWE-778"),
     ),
     # A10:2021 - Server-Side Request Forgery (SSRF)
     "ssrf": SecurityContext(
@@ -296,12 +324,12 @@ OWASP_TOP_10: Dict[str, SecurityContext] = {
             "4. No enviar respuestas raw al cliente.\n"
             "5. Deshabilitar redirecciones HTTP y usar listas de permitidos para URL."
         ),
-        references=[
+        references=(
             "https://owasp.org/Top10/" "A10_2021-Server-Side_Request_Forgery_%28SSRF%29/",
             "https://cheatsheetseries.owasp.org/cheatsheets/"
             "Server_Side_Request_Forgery_Prevention_Cheat_Sheet.html",
-        ],
-        cwe_ids=["CWE-918"],
+        ),
+        cwe_ids=("CWE-918",),
     ),
 }
 
@@ -344,12 +372,19 @@ RULE_TO_OWASP_MAPPING: Dict[str, str] = {
     "xpath_injection": "injection",
 }
 
+# Índice inverso regla/issue_type -> SecurityContext: una sola búsqueda en
+# diccionario en lugar de resolver RULE_TO_OWASP_MAPPING y OWASP_TOP_10
+_CONTEXT_BY_RULE: Dict[str, Optional[SecurityContext]] = {
+    key: OWASP_TOP_10.get(owasp_key) for key, owasp_key in RULE_TO_OWASP_MAPPING.items()
+}
+
 
 # =============================================================================
 # Funciones de utilidad
 # =============================================================================
 
 
+@lru_cache(maxsize=256)
 def get_security_context(
     rule_id: Optional[str] = None,
     issue_type: Optional[str] = None,
@@ -363,25 +398,26 @@ def get_security_context(
 
     Returns:
         SecurityContext si se encuentra mapeo, None en caso contrario
+
+    Note:
+        Función pura sobre tablas estáticas: el resultado se memoiza por
+        (rule_id, issue_type).
     """
     # Primero intentar con rule_id
-    if rule_id:
-        owasp_key = RULE_TO_OWASP_MAPPING.get(rule_id)
-        if owasp_key:
-            return OWASP_TOP_10.get(owasp_key)
+    if rule_id and rule_id in _CONTEXT_BY_RULE:
+        return _CONTEXT_BY_RULE[rule_id]
 
     # Luego intentar con issue_type
     if issue_type:
         # Normalizar issue_type (convertir espacios/guiones a underscore)
         normalized = issue_type.lower().replace("-", "_").replace(" ", "_")
-        owasp_key = RULE_TO_OWASP_MAPPING.get(normalized)
-        if owasp_key:
-            return OWASP_TOP_10.get(owasp_key)
+        if normalized in _CONTEXT_BY_RULE:
+            return _CONTEXT_BY_RULE[normalized]
 
         # Buscar coincidencia parcial
-        for key, owasp_category in RULE_TO_OWASP_MAPPING.items():
+        for key, context in _CONTEXT_BY_RULE.items():
             if key in normalized or normalized in key:
-                return OWASP_TOP_10.get(owasp_category)
+                return context
 
     return None
 
@@ -394,24 +430,6 @@ def format_security_context(context: SecurityContext) -> str:
         context: Contexto de seguridad OWASP
 
     Returns:
-        str: Texto formateado para el prompt de IA
+        str: Texto formateado para el prompt de IA (cacheado en el contexto)
     """
-    return f"""
-=== CONTEXTO DE SEGURIDAD (OWASP) ===
-Categoría: {context.category}
-
-Descripción:
-{context.description}
-
-Impacto Potencial:
-{context.impact}
-
-Estrategias de Mitigación:
-{context.mitigation}
-
-Referencias:
-{chr(10).join(f"- {ref}" for ref in context.references)}
-
-CWEs Relacionados: {", ".join(context.cwe_ids)}
-===================================
-"""
+    return context.formatted
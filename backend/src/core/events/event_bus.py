@@ -4,12 +4,15 @@ Event Bus para comunicación desacoplada entre componentes.
 
 import logging
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.core.events.observers import EventObserver
 
 logger = logging.getLogger(__name__)
 
+# Firma de EventObserver.on_event, resuelta una vez por observer en _handlers
+EventHandler = Callable[[str, Dict[str, Any]], None]
+
 
 class EventType(str, Enum):
     """Tipos de eventos estándar del sistema."""
@@ -28,18 +31,29 @@ class EventBus:
 
     Permite que el AnalysisService notifique progreso sin conocer
     detalles de WebSockets o persistencia.
+
+    Los métodos on_event de los observers se resuelven una sola vez al
+    suscribirse y se guardan en una tupla inmutable que publish recorre
+    directamente; suscribir o desuscribir reemplaza la tupla completa, por lo
+    que una publicación en curso (p. ej. desde otro hilo) no se ve afectada.
     """
 
     _instance: Optional["EventBus"] = None
     _observers: List[EventObserver] = []
+    _handlers: Tuple[Tuple[EventObserver, EventHandler], ...] = ()
 
     def __new__(cls) -> "EventBus":
         """Implementación del patrón Singleton."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._observers = []
+            cls._handlers = ()
         return cls._instance
 
+    def _rebuild_handlers(self) -> None:
+        """Recalcula la tupla (observer, on_event) usada al publicar."""
+        type(self)._handlers = tuple((observer, observer.on_event) for observer in self._observers)
+
     def subscribe(self, observer: EventObserver) -> None:
         """
         Registra un observer para recibir eventos.
@@ -49,6 +63,7 @@ class EventBus:
         """
         if observer not in self._observers:
             self._observers.append(observer)
+            self._rebuild_handlers()
 
     def unsubscribe(self, observer: EventObserver) -> None:
         """
@@ -59,6 +74,7 @@ class EventBus:
         """
         if observer in self._observers:
             self._observers.remove(observer)
+            self._rebuild_handlers()
 
     def publish(self, event_type: str, data: Dict[str, Any]) -> None:
         """
@@ -72,13 +88,38 @@ class EventBus:
         if isinstance(event_type, Enum):
             event_type = event_type.value
 
-        for observer in self._observers:
+        for observer, on_event in self._handlers:
             try:
-                observer.on_event(event_type, data)
+                on_event(event_type, data)
             except Exception as e:
                 # Log error pero no interrumpir otros observers
                 logger.error(f"Error in observer {observer}: {e}")
 
+    def publish_batch(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Publica varios eventos en una sola entrega por observer.
+
+        Cada observer recibe todos los eventos en orden antes de pasar al
+        siguiente. Un fallo en un evento no impide entregar los demás.
+
+        Args:
+            events: Pares (event_type, data) a publicar.
+        """
+        batch = [
+            (event_type.value if isinstance(event_type, Enum) else event_type, data)
+            for event_type, data in events
+        ]
+        if not batch:
+            return
+
+        for observer, on_event in self._handlers:
+            for event_type, data in batch:
+                try:
+                    on_event(event_type, data)
+                except Exception as e:
+                    logger.error(f"Error in observer {observer}: {e}")
+
     def clear(self) -> None:
         """Elimina todos los observers."""
         self._observers.clear()
+        self._rebuild_handlers()
@@ -12,11 +12,12 @@ class EventObserver(ABC):
     """
 
     @abstractmethod
-    async def on_event(self, event: Dict[str, Any]) -> None:
+    def on_event(self, event_type: str, data: Dict[str, Any]) -> None:
         """
-        Método invocado cuando ocurre un evento.
+        Método invocado (de forma síncrona) por el EventBus cuando ocurre un evento.
 
         Args:
-            event: Diccionario con los datos del evento (tipo, timestamp, payload).
+            event_type: Tipo de evento (valor de EventType).
+            data: Datos del evento (timestamp, payload).
         """
         pass
@@ -103,7 +103,7 @@ class AIResponseError(AIClientError):
 # =============================================================================
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AIResponse:
     """
     Respuesta estructurada de una llamada a la IA.
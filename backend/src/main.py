@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config.settings import settings
+from src.core.database import get_pool_status
 from src.routers.analysis import router as analysis_router
 from src.routers.auth import router as auth_router
 from src.routers.findings import router as findings_router
@@ -68,6 +69,12 @@ async def health_check():
     return {"status": "healthy", "version": "1.0.0", "service": "CodeGuard AI Backend"}
 
 
+@app.get("/health/db")
+async def database_pool_health():
+    """Estadísticas del pool de conexiones a la base de datos"""
+    return {"status": "healthy", "pool": get_pool_status()}
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -6,6 +6,7 @@ usuarios de Clerk con la base de datos (AC Escenario 1).
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
@@ -56,7 +57,9 @@ async def login(
     auth_service = AuthService(clerk_client, user_repository)
 
     try:
-        user = auth_service.login_user(token)
+        # verify_token y el repositorio son síncronos: se ejecutan en el
+        # threadpool para no bloquear el event loop
+        user = await run_in_threadpool(auth_service.login_user, token)
         return user
 
     except ClerkTokenExpiredError:
@@ -95,7 +98,7 @@ async def get_current_user_info(
     clerk_client = ClerkClient()
 
     try:
-        payload = clerk_client.verify_token(token)
+        payload = await run_in_threadpool(clerk_client.verify_token, token)
 
         return User(
             id=payload["user_id"],
@@ -13,7 +13,7 @@ Principios de diseño:
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 
 class AIExplanationRequest(BaseModel):
@@ -86,6 +86,7 @@ class AIExplanation(BaseModel):
     )
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "explanation": (
@@ -108,25 +109,25 @@ class AIExplanation(BaseModel):
                 "tokens_used": 450,
                 "generated_at": "2024-01-15T10:30:00Z",
             }
-        }
+        },
     )
 
+    @field_serializer("generated_at", when_used="json")
+    def _serialize_generated_at(self, value: datetime) -> str:
+        """Serializa ``generated_at`` con ``isoformat()`` (``+00:00``), el formato persistido."""
+        return value.isoformat()
+
     def to_dict(self) -> dict:
         """
         Convierte a diccionario para almacenamiento en JSONB.
 
+        Usa el serializador de pydantic-core (modo JSON); ``generated_at`` sale
+        con ``isoformat()``, igual que ``Finding.detected_at``.
+
         Returns:
             Diccionario serializable
         """
-        return {
-            "explanation": self.explanation,
-            "suggested_fix": self.suggested_fix,
-            "attack_example": self.attack_example,
-            "references": self.references,
-            "model_used": self.model_used,
-            "tokens_used": self.tokens_used,
-            "generated_at": self.generated_at.isoformat(),
-        }
+        return self.model_dump(mode="json")
 
     @classmethod
     def from_dict(cls, data: dict) -> "AIExplanation":
@@ -139,12 +140,8 @@ class AIExplanation(BaseModel):
         Returns:
             Instancia de AIExplanation
         """
-        # Convertir string ISO a datetime si es necesario
-        generated_at = data.get("generated_at")
-        if isinstance(generated_at, str):
-            data["generated_at"] = datetime.fromisoformat(generated_at.replace("Z", "+00:00"))
-
-        return cls(**data)
+        # pydantic-core parsea el string ISO (con "Z" u offset) sin mutar ``data``
+        return cls.model_validate(data)
 
 
 class AIExplanationResponse(BaseModel):
@@ -195,13 +192,14 @@ class RateLimitInfo(BaseModel):
     reset_at: datetime = Field(..., description="Hora de reset")
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "requests_remaining": 8,
                 "requests_limit": 10,
                 "reset_at": "2024-01-15T11:00:00Z",
             }
-        }
+        },
     )
 
 
@@ -3,7 +3,9 @@ Esquemas de análisis usando Pydantic v2
 """
 
 import ast as python_ast
+from bisect import bisect_right
 from datetime import datetime, timezone
+from itertools import accumulate
 from textwrap import dedent
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
@@ -50,6 +52,7 @@ class AnalysisContext(BaseModel):
     # Se Usa PrivateAttr en Pydantic v2 por sugerencia
     _ast_cache: Optional[python_ast.Module] = PrivateAttr(default=None)
     _lines_cache: Optional[List[str]] = PrivateAttr(default=None)
+    _line_offsets_cache: Optional[List[int]] = PrivateAttr(default=None)
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -93,7 +96,7 @@ class AnalysisContext(BaseModel):
     @property
     def line_count(self) -> int:
         """Retorna el número de líneas del código."""
-        return len(self.code_content.splitlines())  # pylint: disable=no-member
+        return len(self.get_lines())
 
     @property
     def char_count(self) -> int:
@@ -138,6 +141,33 @@ class AnalysisContext(BaseModel):
             self._lines_cache = self.code_content.splitlines()  # pylint: disable=no-member
         return self._lines_cache
 
+    def get_line_offsets(self) -> List[int]:
+        """
+        Retorna el offset de inicio de cada línea en code_content (lazy loading).
+
+        Los cortes de línea son los mismos que usa get_lines(), por lo que el
+        índice i corresponde a la línea i + 1.
+
+        Returns:
+            Lista de offsets (0-based) donde comienza cada línea
+        """
+        if self._line_offsets_cache is None:
+            line_lengths = map(len, self.code_content.splitlines(keepends=True))
+            self._line_offsets_cache = list(accumulate(line_lengths, initial=0))[:-1]
+        return self._line_offsets_cache
+
+    def get_line_number(self, offset: int) -> int:
+        """
+        Convierte un offset de code_content en número de línea en O(log n).
+
+        Args:
+            offset: Posición (0-based) dentro de code_content
+
+        Returns:
+            Número de línea (1-based) que contiene el offset
+        """
+        return max(bisect_right(self.get_line_offsets(), offset), 1)
+
     def get_line(self, line_number: int) -> Optional[str]:
         """
         Retorna una línea específica del código (1-based indexing).
@@ -4,11 +4,14 @@ Esquemas para hallazgos encontrados en análisis
 
 from __future__ import annotations
 
+import sys
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, ClassVar, Dict, Optional, cast
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 
 class Severity(str, Enum):
@@ -29,6 +32,13 @@ class Severity(str, Enum):
     INFO = "INFO"
 
 
+# Orden estable de severidades para codificarlas como un byte en FindingsSoA
+_SEVERITY_CODES = tuple(Severity)
+_SEVERITY_INDEX: Dict[Severity, int] = {
+    severity: index for index, severity in enumerate(_SEVERITY_CODES)
+}
+
+
 class Finding(BaseModel):
     """
     Hallazgo encontrado durante el análisis de código.
@@ -70,6 +80,7 @@ class Finding(BaseModel):
     )
 
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "severity": "CRITICAL",
@@ -81,7 +92,7 @@ class Finding(BaseModel):
                 "suggestion": "Use ast.literal_eval() instead",
                 "rule_id": "SEC001_EVAL",
             }
-        }
+        },
     )
 
     PENALTY_BY_SEVERITY: ClassVar[Dict[Severity, int]] = {
@@ -92,6 +103,11 @@ class Finding(BaseModel):
         Severity.INFO: 0,
     }
 
+    @field_serializer("detected_at", when_used="json")
+    def _serialize_detected_at(self, value: datetime) -> str:
+        """Serializa ``detected_at`` con ``isoformat()`` (``+00:00``), el formato persistido."""
+        return value.isoformat()
+
     @property
     def is_critical(self) -> bool:
         """Retorna True si el hallazgo es crítico."""
@@ -118,45 +134,24 @@ class Finding(BaseModel):
         Returns:
             Instancia de Finding
         """
-        detected_at_str = data.get("detected_at")
-        detected_at = (
-            datetime.fromisoformat(detected_at_str)
-            if detected_at_str
-            else datetime.now(timezone.utc)
-        )
-        return cls(
-            severity=Severity(data["severity"]),
-            issue_type=data["issue_type"],
-            message=data["message"],
-            line_number=data["line_number"],
-            agent_name=data["agent_name"],
-            code_snippet=data.get("code_snippet"),
-            suggestion=data.get("suggestion"),
-            rule_id=data.get("rule_id"),
-            detected_at=detected_at,
-        )
+        if not data.get("detected_at"):
+            # Sin timestamp persistido: se usa el default_factory (ahora, UTC)
+            data = {key: value for key, value in data.items() if key != "detected_at"}
+        # pydantic-core parsea el string ISO (con "Z" u offset) sin mutar ``data``
+        return cls.model_validate(data)
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Convierte el Finding a diccionario para persistencia.
 
+        Usa el serializador de pydantic-core (modo JSON), igual que
+        ``AIExplanation.to_dict``: ``severity`` sale como su valor y
+        ``detected_at`` como ``isoformat()``, igual que ``FindingsSoA.to_dict``.
+
         Returns:
             Diccionario con todos los campos del finding
         """
-        severity_value = cast(Severity, self.severity).value
-        detected_at_value = cast(datetime, self.detected_at)
-
-        return {
-            "severity": severity_value,
-            "issue_type": self.issue_type,
-            "message": self.message,
-            "line_number": self.line_number,
-            "agent_name": self.agent_name,
-            "code_snippet": self.code_snippet,
-            "suggestion": self.suggestion,
-            "rule_id": self.rule_id,
-            "detected_at": detected_at_value.isoformat(),
-        }
+        return self.model_dump(mode="json")
 
     def calculate_penalty(self) -> int:
         """
@@ -166,3 +161,143 @@ class Finding(BaseModel):
             Penalty points (CRITICAL=10, HIGH=5, MEDIUM=2, LOW=1, INFO=0)
         """
         return self.PENALTY_BY_SEVERITY.get(self.severity, 0)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Interna strings repetidos (rule_id, issue_type, agent_name)."""
+    return sys.intern(value) if value is not None else None
+
+
+@dataclass(slots=True)
+class FindingsSoA:
+    """
+    Hallazgos en formato columnar (struct-of-arrays) para salida masiva.
+
+    Cada atributo es una columna paralela: la fila ``i`` corresponde al
+    hallazgo ``i``. Las severidades se guardan como un byte, los números de
+    línea en un ``array('I')`` y los strings repetidos se internan, evitando
+    un modelo Pydantic por hallazgo cuando hay miles de ellos.
+
+    Attributes:
+        detected_at: Timestamp común a todos los hallazgos del lote
+        severities: Índice de cada severidad en ``Severity`` (u8)
+        line_numbers: Números de línea (1-based)
+        issue_types: Tipos de problema (internados)
+        messages: Descripciones de los problemas
+        agent_names: Agentes que detectaron cada hallazgo (internados)
+        rule_ids: IDs de regla (internados, opcionales)
+        code_snippets: Fragmentos de código (opcionales)
+        suggestions: Sugerencias de corrección (opcionales)
+
+    Example:
+        soa = analyzer.analyze_to_columnar(code)
+        payload = orjson.dumps(soa.to_dict())
+        first = soa[0]  # Finding construido bajo demanda
+    """
+
+    detected_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    severities: bytearray = field(default_factory=bytearray)
+    line_numbers: array = field(default_factory=lambda: array("I"))
+    issue_types: List[str] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    agent_names: List[str] = field(default_factory=list)
+    rule_ids: List[Optional[str]] = field(default_factory=list)
+    code_snippets: List[Optional[str]] = field(default_factory=list)
+    suggestions: List[Optional[str]] = field(default_factory=list)
+
+    @classmethod
+    def from_findings(cls, findings: Iterable[Finding]) -> "FindingsSoA":
+        """
+        Transpone una colección de Finding a formato columnar.
+
+        Args:
+            findings: Hallazgos a convertir
+
+        Returns:
+            Instancia de FindingsSoA con una fila por hallazgo
+        """
+        soa = cls()
+        for finding in findings:
+            soa.append(
+                severity=finding.severity,
+                issue_type=finding.issue_type,
+                message=finding.message,
+                line_number=finding.line_number,
+                agent_name=finding.agent_name,
+                code_snippet=finding.code_snippet,
+                suggestion=finding.suggestion,
+                rule_id=finding.rule_id,
+            )
+        return soa
+
+    def append(
+        self,
+        severity: Severity,
+        issue_type: str,
+        message: str,
+        line_number: int,
+        agent_name: str,
+        code_snippet: Optional[str] = None,
+        suggestion: Optional[str] = None,
+        rule_id: Optional[str] = None,
+    ) -> None:
+        """Agrega una fila sin construir un Finding."""
+        self.severities.append(_SEVERITY_INDEX[severity])
+        self.line_numbers.append(line_number)
+        self.issue_types.append(sys.intern(issue_type))
+        self.messages.append(message)
+        self.agent_names.append(sys.intern(agent_name))
+        self.rule_ids.append(_intern(rule_id))
+        self.code_snippets.append(code_snippet)
+        self.suggestions.append(suggestion)
+
+    def __len__(self) -> int:
+        return len(self.severities)
+
+    def __getitem__(self, index: int) -> Finding:
+        """
+        Vista por filas: construye el Finding ``index`` bajo demanda.
+
+        Args:
+            index: Posición de la fila (admite índices negativos)
+
+        Returns:
+            Finding con los valores de la fila
+
+        Raises:
+            IndexError: Si el índice está fuera de rango
+        """
+        row = range(len(self))[index]
+        return Finding(
+            severity=_SEVERITY_CODES[self.severities[row]],
+            issue_type=self.issue_types[row],
+            message=self.messages[row],
+            line_number=self.line_numbers[row],
+            agent_name=self.agent_names[row],
+            code_snippet=self.code_snippets[row],
+            suggestion=self.suggestions[row],
+            rule_id=self.rule_ids[row],
+            detected_at=self.detected_at,
+        )
+
+    def __iter__(self) -> Iterator[Finding]:
+        return map(self.__getitem__, range(len(self)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convierte las columnas a listas serializables en JSON.
+
+        Returns:
+            Diccionario con una lista por columna, listo para ``orjson.dumps``
+        """
+        return {
+            "detected_at": self.detected_at.isoformat(),
+            "severities": [_SEVERITY_CODES[code].value for code in self.severities],
+            "line_numbers": self.line_numbers.tolist(),
+            "issue_types": self.issue_types,
+            "messages": self.messages,
+            "agent_names": self.agent_names,
+            "rule_ids": self.rule_ids,
+            "code_snippets": self.code_snippets,
+            "suggestions": self.suggestions,
+        }
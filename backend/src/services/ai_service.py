@@ -11,10 +11,25 @@ Principios de diseño:
 - Async: Todas las operaciones son asíncronas
 """
 
+import asyncio
+import hashlib
 import logging
-from collections import defaultdict
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# pysimdjson es opcional (no está en requirements.txt): sin él se usa json_loads
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 from src.core.config.ai_config import get_ai_settings
 from src.external.gemini_client import get_ai_client
@@ -33,6 +48,52 @@ from src.services.mcp_context_enricher import (
 
 logger = logging.getLogger(__name__)
 
+# Campos de la respuesta JSON del modelo que se usan para construir AIExplanation
+_RESPONSE_FIELDS: Tuple[str, ...] = ("explanation", "suggested_fix", "attack_example", "references")
+
+# Un parser de simdjson por hilo: se reutiliza entre llamadas pero no es thread-safe
+_simdjson_local = threading.local()
+_MISSING = object()
+
+
+def _load_response_fields(content: str) -> Dict[str, Any]:
+    """
+    Extrae de la respuesta JSON solo los campos de ``_RESPONSE_FIELDS``.
+
+    Con pysimdjson (API On-Demand) el documento se recorre de forma perezosa y
+    solo se materializan esos campos; sin él se usa ``json_loads`` completo.
+
+    Args:
+        content: JSON de la respuesta del modelo
+
+    Returns:
+        Diccionario campo -> valor con los campos presentes en la respuesta
+
+    Raises:
+        ValueError: Si el contenido no es JSON válido
+    """
+    if simdjson is None:
+        data = json_loads(content)
+        return {field: data[field] for field in _RESPONSE_FIELDS if field in data}
+
+    parser = getattr(_simdjson_local, "parser", None)
+    if parser is None:
+        parser = _simdjson_local.parser = simdjson.Parser()
+
+    document = parser.parse(content.encode())
+    fields: Dict[str, Any] = {}
+    for field in _RESPONSE_FIELDS:
+        value = document.get(field, _MISSING)
+        if value is _MISSING:
+            continue
+        # El documento se invalida en el próximo parse: copiar subárboles
+        if isinstance(value, simdjson.Array):
+            value = value.as_list()
+        elif isinstance(value, simdjson.Object):
+            value = value.as_dict()
+        fields[field] = value
+    return fields
+
 
 class RateLimitExceeded(Exception):
     """Excepción cuando el usuario excede su límite de requests."""
@@ -52,72 +113,128 @@ class InMemoryRateLimiter:
     """
     Rate limiter en memoria para controlar requests por usuario.
 
+    Implementa un token bucket: cada usuario tiene un saldo de tokens que se
+    recarga de forma continua a razón de ``limit_per_hour / 3600`` tokens por
+    segundo, hasta ``limit_per_hour``. Cada request consume un token. Solo se
+    guarda ``(tokens, última recarga)`` por usuario: memoria y tiempo O(1).
+    Las recargas se miden con un reloj monotónico (``time.monotonic()`` por
+    defecto, inyectable para tests), inmune a ajustes del reloj del sistema;
+    el reloj de pared solo se usa para informar ``reset_at``.
+
     Esta implementación es para desarrollo. En producción se puede
     reemplazar por un RateLimiter basado en Redis siguiendo el
     patrón Adapter.
 
+    Los buckets se reparten en ``SHARD_COUNT`` particiones según
+    ``hash(user_id)``, cada una con su propio lock: requests concurrentes de
+    usuarios distintos casi nunca compiten por el mismo lock.
+
     Attributes:
         limit_per_hour: Máximo de requests por hora
-        user_requests: Diccionario de requests por usuario
+        shards: Particiones (user_id -> (tokens, última recarga), lock)
     """
 
-    def __init__(self, limit_per_hour: int = 10):
+    SHARD_COUNT: int = 16
+
+    def __init__(self, limit_per_hour: int = 10, clock: Optional[Callable[[], float]] = None):
         """
         Inicializa el rate limiter.
 
         Args:
             limit_per_hour: Límite de requests por usuario por hora
+            clock: Reloj monotónico en segundos (default: time.monotonic)
         """
         self._limit_per_hour = limit_per_hour
-        # user_id -> list of timestamps
-        self._user_requests: Dict[str, list[datetime]] = defaultdict(list)
+        self._clock = clock or time.monotonic
+        self._refill_per_second = limit_per_hour / 3600
+        # Cada partición: user_id -> (tokens disponibles, última recarga) + su lock
+        self._shards: Tuple[Tuple[Dict[str, Tuple[float, float]], threading.Lock], ...] = tuple(
+            ({}, threading.Lock()) for _ in range(self.SHARD_COUNT)
+        )
 
-    def check_and_consume(self, user_id: str) -> RateLimitInfo:
+    def _shard(self, user_id: str) -> Tuple[Dict[str, Tuple[float, float]], threading.Lock]:
         """
-        Verifica si el usuario puede hacer un request y lo consume.
+        Retorna la partición (buckets, lock) que corresponde al usuario.
 
         Args:
             user_id: ID del usuario
 
         Returns:
-            RateLimitInfo con el estado actual
+            Tupla (diccionario de buckets, lock de la partición)
+        """
+        return self._shards[hash(user_id) % self.SHARD_COUNT]
 
-        Raises:
-            RateLimitExceeded: Si el usuario excede su límite
+    def _refill(self, buckets: Dict[str, Tuple[float, float]], user_id: str, now: float) -> float:
         """
-        now = datetime.now(timezone.utc)
-        hour_ago = now - timedelta(hours=1)
+        Calcula los tokens disponibles del usuario recargando desde la última vez.
 
-        # Limpiar requests antiguos
-        self._user_requests[user_id] = [ts for ts in self._user_requests[user_id] if ts > hour_ago]
+        Args:
+            buckets: Buckets de la partición del usuario
+            user_id: ID del usuario
+            now: Instante actual según el reloj monotónico
 
-        # Calcular info de rate limit
-        requests_used = len(self._user_requests[user_id])
-        requests_remaining = max(0, self._limit_per_hour - requests_used)
+        Returns:
+            Tokens disponibles (como máximo limit_per_hour)
+        """
+        tokens, last_refill = buckets.get(user_id, (float(self._limit_per_hour), now))
+        elapsed = now - last_refill
+        return min(float(self._limit_per_hour), tokens + elapsed * self._refill_per_second)
 
-        # Calcular cuando se resetea (1 hora desde el request más antiguo)
-        if self._user_requests[user_id]:
-            oldest = min(self._user_requests[user_id])
-            reset_at = oldest + timedelta(hours=1)
+    def _build_info(self, tokens: float) -> RateLimitInfo:
+        """
+        Construye el RateLimitInfo para un saldo de tokens.
+
+        Args:
+            tokens: Tokens disponibles tras la operación
+
+        Returns:
+            RateLimitInfo con requests restantes y el instante en que el bucket se llena
+        """
+        now = datetime.now(timezone.utc)
+        if self._refill_per_second:
+            missing = self._limit_per_hour - tokens
+            reset_at = now + timedelta(seconds=missing / self._refill_per_second)
         else:
             reset_at = now + timedelta(hours=1)
 
-        rate_limit_info = RateLimitInfo(
-            requests_remaining=requests_remaining - 1 if requests_remaining > 0 else 0,
+        return RateLimitInfo(
+            requests_remaining=int(tokens),
             requests_limit=self._limit_per_hour,
             reset_at=reset_at,
         )
 
+    def check_and_consume(self, user_id: str) -> RateLimitInfo:
+        """
+        Verifica si el usuario puede hacer un request y lo consume.
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            RateLimitInfo con el estado actual
+
+        Raises:
+            RateLimitExceeded: Si el usuario excede su límite
+        """
+        buckets, lock = self._shard(user_id)
+
+        with lock:
+            now = self._clock()
+            tokens = self._refill(buckets, user_id, now)
+            allowed = tokens >= 1
+            if allowed:
+                # Consumir request
+                tokens -= 1
+            buckets[user_id] = (tokens, now)
+
         # Verificar límite
-        if requests_remaining <= 0:
+        if not allowed:
             raise RateLimitExceeded(
                 f"Rate limit exceeded. Limit: {self._limit_per_hour}/hour",
-                rate_limit_info,
+                self._build_info(tokens),
             )
 
-        # Consumir request
-        self._user_requests[user_id].append(now)
-        return rate_limit_info
+        return self._build_info(tokens)
 
     def get_remaining(self, user_id: str) -> RateLimitInfo:
         """
@@ -129,25 +246,12 @@ class InMemoryRateLimiter:
         Returns:
             RateLimitInfo con el estado actual
         """
-        now = datetime.now(timezone.utc)
-        hour_ago = now - timedelta(hours=1)
+        buckets, lock = self._shard(user_id)
 
-        # Limpiar y contar
-        self._user_requests[user_id] = [ts for ts in self._user_requests[user_id] if ts > hour_ago]
-        requests_used = len(self._user_requests[user_id])
-        requests_remaining = max(0, self._limit_per_hour - requests_used)
+        with lock:
+            tokens = self._refill(buckets, user_id, self._clock())
 
-        if self._user_requests[user_id]:
-            oldest = min(self._user_requests[user_id])
-            reset_at = oldest + timedelta(hours=1)
-        else:
-            reset_at = now + timedelta(hours=1)
-
-        return RateLimitInfo(
-            requests_remaining=requests_remaining,
-            requests_limit=self._limit_per_hour,
-            reset_at=reset_at,
-        )
+        return self._build_info(tokens)
 
 
 class AIExplainerService:
@@ -222,6 +326,7 @@ IMPORTANTE:
         ai_client: Optional[AIClient] = None,
         context_enricher: Optional[MCPContextEnricher] = None,
         rate_limiter: Optional[InMemoryRateLimiter] = None,
+        explanation_cache_size: Optional[int] = None,
     ):
         """
         Inicializa el servicio con dependencias inyectadas.
@@ -230,6 +335,9 @@ IMPORTANTE:
             ai_client: Cliente de IA (default: VertexAIClient)
             context_enricher: Enriquecedor de contexto (default: MCPContextEnricher)
             rate_limiter: Rate limiter (default: InMemoryRateLimiter)
+            explanation_cache_size: Tamaño de los caches LRU de explicaciones y
+                de respuestas parseadas (default: AI_EXPLANATION_CACHE_SIZE,
+                0 los deshabilita)
         """
         settings = get_ai_settings()
 
@@ -238,6 +346,18 @@ IMPORTANTE:
         self._rate_limiter = rate_limiter or InMemoryRateLimiter(
             limit_per_hour=settings.AI_RATE_LIMIT_PER_HOUR
         )
+        self._explanation_cache: "OrderedDict[Tuple[Any, ...], AIExplanation]" = OrderedDict()
+        self._explanation_cache_size = (
+            settings.AI_EXPLANATION_CACHE_SIZE
+            if explanation_cache_size is None
+            else explanation_cache_size
+        )
+        self._cache_hits_consume_rate_limit = settings.AI_CACHE_HITS_CONSUME_RATE_LIMIT
+        # Respuestas del modelo ya parseadas: (digest del contenido, modelo, tokens)
+        self._parse_cache: "OrderedDict[Tuple[bytes, str, int], AIExplanation]" = OrderedDict()
+        # Explicaciones en curso: hallazgos idénticos esperan la misma llamada al modelo
+        self._inflight: Dict[Tuple[Any, ...], "asyncio.Future[AIExplanation]"] = {}
+        self._max_concurrent = settings.AI_MAX_CONCURRENT_EXPLANATIONS
 
     async def explain_finding(
         self,
@@ -256,6 +376,122 @@ IMPORTANTE:
         Returns:
             Tupla (AIExplanation, RateLimitInfo)
 
+        Raises:
+            RateLimitExceeded: Si el usuario excede su límite
+            AIExplanationError: Si hay error en la generación
+        """
+        # 0. Reutilizar la explicación de un hallazgo idéntico ya explicado
+        cache_key = self._cache_key(finding, code_context)
+        cached = self._explanation_cache.get(cache_key)
+        if cached is not None:
+            self._explanation_cache.move_to_end(cache_key)
+            logger.info(f"AI explanation cache hit: rule_id={finding.rule_id}, user_id={user_id}")
+            return cached, self._reused_rate_limit_info(user_id)
+
+        # 0b. Unirse a una explicación idéntica que ya se está generando
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            logger.info(f"Joining in-flight AI explanation: rule_id={finding.rule_id}")
+            try:
+                explanation = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not inflight.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                # Se canceló el request que generaba (p. ej. cliente desconectado),
+                # no este: reintentar desde el cache, otra generación o una nueva
+                logger.info(f"In-flight AI explanation cancelled, retrying: {finding.rule_id}")
+                return await self.explain_finding(finding, code_context, user_id)
+            return explanation, self._reused_rate_limit_info(user_id)
+
+        future: "asyncio.Future[AIExplanation]" = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            explanation, rate_limit_info = await self._generate_explanation(
+                finding, code_context, user_id, cache_key
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marcar la excepción como recuperada si nadie más esperaba
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+        future.set_result(explanation)
+        return explanation, rate_limit_info
+
+    async def explain_findings(
+        self,
+        findings: List[Finding],
+        code_context: Optional[str] = None,
+        user_id: str = "anonymous",
+        max_concurrent: Optional[int] = None,
+    ) -> List[Tuple[AIExplanation, RateLimitInfo]]:
+        """
+        Genera explicaciones para varios hallazgos de forma concurrente.
+
+        Las llamadas se lanzan con asyncio.gather limitadas por un semáforo;
+        los hallazgos idénticos se resuelven con una sola llamada al modelo.
+
+        Args:
+            findings: Hallazgos a explicar
+            code_context: Código fuente completo para contexto (opcional)
+            user_id: ID del usuario para rate limiting
+            max_concurrent: Máximo de llamadas simultáneas
+                (default: AI_MAX_CONCURRENT_EXPLANATIONS)
+
+        Returns:
+            Lista de tuplas (AIExplanation, RateLimitInfo) en el orden de ``findings``
+
+        Raises:
+            RateLimitExceeded: Si el usuario excede su límite
+            AIExplanationError: Si hay error en la generación
+        """
+        semaphore = asyncio.Semaphore(max_concurrent or self._max_concurrent)
+
+        async def explain(finding: Finding) -> Tuple[AIExplanation, RateLimitInfo]:
+            async with semaphore:
+                return await self.explain_finding(finding, code_context, user_id)
+
+        return list(await asyncio.gather(*map(explain, findings)))
+
+    def _reused_rate_limit_info(self, user_id: str) -> RateLimitInfo:
+        """
+        Estado del rate limit para una explicación reutilizada (cache o en curso).
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            RateLimitInfo, consumiendo un request solo si así está configurado
+        """
+        if self._cache_hits_consume_rate_limit:
+            return self._rate_limiter.check_and_consume(user_id)
+        return self._rate_limiter.get_remaining(user_id)
+
+    async def _generate_explanation(
+        self,
+        finding: Finding,
+        code_context: Optional[str],
+        user_id: str,
+        cache_key: Tuple[Any, ...],
+    ) -> Tuple[AIExplanation, RateLimitInfo]:
+        """
+        Genera una explicación nueva llamando al modelo de IA.
+
+        Args:
+            finding: El hallazgo a explicar
+            code_context: Código fuente completo para contexto (opcional)
+            user_id: ID del usuario para rate limiting
+            cache_key: Clave de cache del hallazgo
+
+        Returns:
+            Tupla (AIExplanation, RateLimitInfo)
+
         Raises:
             RateLimitExceeded: Si el usuario excede su límite
             AIExplanationError: Si hay error en la generación
@@ -279,7 +515,7 @@ IMPORTANTE:
             response = await self._ai_client.generate_explanation(prompt)
 
             # 5. Parsear respuesta
-            explanation = self._parse_response(
+            explanation = self._parse_response_cached(
                 response.content, response.model_name, response.tokens_used
             )
 
@@ -287,6 +523,7 @@ IMPORTANTE:
                 f"AI explanation generated successfully. " f"tokens_used={response.tokens_used}"
             )
 
+            self._store_explanation(cache_key, explanation)
             return explanation, rate_limit_info
 
         except AIRateLimitError as e:
@@ -304,6 +541,104 @@ IMPORTANTE:
             logger.error(f"Unexpected error generating explanation: {e}")
             raise AIExplanationError(f"Error inesperado generando explicación: {e}") from e
 
+    @staticmethod
+    def _cache_key(finding: Finding, code_context: Optional[str]) -> Tuple[Any, ...]:
+        """
+        Construye la clave de cache de una explicación.
+
+        Incluye todos los campos del hallazgo que forman el prompt salvo
+        ``line_number`` y ``agent_name``, que se excluyen a propósito: el mismo
+        problema en otra línea (o detectado por otro agente) comparte explicación.
+        El snippet y el código fuente entran como digest BLAKE2b de 16 bytes,
+        igual que en ``_parse_response_cached``, para no retenerlos como claves.
+
+        Args:
+            finding: Hallazgo a explicar
+            code_context: Código fuente completo (opcional)
+
+        Returns:
+            Tupla hashable que identifica la explicación
+        """
+
+        def digest(text: Optional[str]) -> Optional[bytes]:
+            if text is None:
+                return None
+            return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+        return (
+            finding.rule_id,
+            finding.issue_type,
+            finding.severity,
+            finding.message,
+            finding.suggestion,
+            digest(finding.code_snippet),
+            digest(code_context),
+        )
+
+    def _store_explanation(self, cache_key: Tuple[Any, ...], explanation: AIExplanation) -> None:
+        """
+        Guarda una explicación en el cache LRU, descartando la más antigua si se llena.
+
+        Args:
+            cache_key: Clave generada por _cache_key
+            explanation: Explicación a cachear
+        """
+        self._lru_put(self._explanation_cache, cache_key, explanation)
+
+    def _lru_put(
+        self, cache: "OrderedDict[Any, AIExplanation]", key: Any, value: AIExplanation
+    ) -> None:
+        """
+        Inserta en un cache LRU del servicio respetando ``_explanation_cache_size``.
+
+        Args:
+            cache: Cache destino
+            key: Clave de la entrada
+            value: Explicación a guardar
+        """
+        if self._explanation_cache_size <= 0:
+            return
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self._explanation_cache_size:
+            cache.popitem(last=False)
+
+    def clear_caches(self) -> None:
+        """Vacía los caches de explicaciones y de respuestas parseadas."""
+        self._explanation_cache.clear()
+        self._parse_cache.clear()
+
+    def _parse_response_cached(
+        self, content: str, model_name: str, tokens_used: int
+    ) -> AIExplanation:
+        """
+        Parsea la respuesta reutilizando el resultado si el contenido ya se vio.
+
+        La clave usa un digest BLAKE2b de 16 bytes del contenido, de modo que
+        el cache no retiene las respuestas completas como claves.
+
+        Args:
+            content: Contenido de la respuesta
+            model_name: Nombre del modelo usado
+            tokens_used: Tokens consumidos
+
+        Returns:
+            AIExplanation parseada (inmutable, segura de compartir)
+        """
+        key = (
+            hashlib.blake2b(content.encode(), digest_size=16).digest(),
+            model_name,
+            tokens_used,
+        )
+        cached = self._parse_cache.get(key)
+        if cached is not None:
+            self._parse_cache.move_to_end(key)
+            return cached
+
+        explanation = self._parse_response(content, model_name, tokens_used)
+        self._lru_put(self._parse_cache, key, explanation)
+        return explanation
+
     def _build_prompt(self, enriched: EnrichedContext, code_context: Optional[str]) -> str:
         """
         Construye el prompt completo para el modelo de IA.
@@ -336,8 +671,6 @@ IMPORTANTE:
         Returns:
             AIExplanation parseada
         """
-        import json
-
         # Intentar extraer JSON de la respuesta
         try:
             # La respuesta debería ser JSON puro
@@ -350,18 +683,10 @@ IMPORTANTE:
                 # Remover primera y última línea (```json y ```)
                 clean_content = "\n".join(lines[1:-1])
 
-            data = json.loads(clean_content)
+            # simdjson u orjson si están instalados; sus errores heredan de ValueError
+            data = _load_response_fields(clean_content)
 
-            return AIExplanation(
-                explanation=data.get("explanation", "Sin explicación disponible"),
-                suggested_fix=data.get("suggested_fix", "# Sin sugerencia disponible"),
-                attack_example=data.get("attack_example"),
-                references=data.get("references"),
-                model_used=model_name,
-                tokens_used=tokens_used,
-            )
-
-        except json.JSONDecodeError:
+        except ValueError:
             # Si no es JSON válido, usar el contenido como explicación
             logger.warning("Could not parse AI response as JSON, using raw content")
             return AIExplanation(
@@ -373,6 +698,15 @@ IMPORTANTE:
                 tokens_used=tokens_used,
             )
 
+        return AIExplanation(
+            explanation=data.get("explanation", "Sin explicación disponible"),
+            suggested_fix=data.get("suggested_fix", "# Sin sugerencia disponible"),
+            attack_example=data.get("attack_example"),
+            references=data.get("references"),
+            model_used=model_name,
+            tokens_used=tokens_used,
+        )
+
     def get_rate_limit_info(self, user_id: str) -> RateLimitInfo:
         """
         Obtiene el estado del rate limit para un usuario.
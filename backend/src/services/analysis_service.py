@@ -2,6 +2,7 @@
 Servicio de análisis de código para CodeGuard AI.
 """
 
+import asyncio
 from datetime import datetime, timezone
 from typing import List, Tuple
 from uuid import uuid4
@@ -75,27 +76,7 @@ class AnalysisService:
         self.event_bus.publish(AnalysisEventType.ANALYSIS_STARTED, {"id": str(analysis_id)})
 
         # 3. Ejecutar Agentes (SecurityAgent, StyleAgent y QualityAgent)
-        findings: List[Finding] = []
-
-        # Security Agent + Style Agent
-        try:
-            security_agent = SecurityAgent()
-            style_agent = StyleAgent()
-
-            security_findings = security_agent.analyze(context)
-            style_findings = style_agent.analyze(context)
-
-            findings = security_findings + style_findings
-
-        except Exception as e:
-            logger.error(f"Error ejecutando agentes de analisis: {e}")
-
-        # Quality Agent
-        try:
-            quality_agent = QualityAgent()
-            findings.extend(quality_agent.analyze(context))
-        except Exception as e:
-            logger.error(f"Error ejecutando QualityAgent: {e}")
+        findings = await self._run_agents(context)
 
         # 4. Calcular Quality Score (RN8)
         quality_score = self._calculate_quality_score(findings)
@@ -125,6 +106,48 @@ class AnalysisService:
 
         return saved_review
 
+    async def _run_agents(self, context: AnalysisContext) -> List[Finding]:
+        """
+        Ejecuta los agentes de análisis de forma concurrente.
+
+        Cada agente corre en un hilo con asyncio.to_thread para que el event loop
+        siga atendiendo otras peticiones mientras tanto. El análisis (regex,
+        ``ast.parse``) no libera el GIL, así que la ganancia es un loop libre y
+        no paralelismo de CPU. El fallo de un agente se registra sin descartar
+        los hallazgos del resto; una cancelación se propaga.
+
+        Args:
+            context: Contexto de análisis compartido por los agentes.
+
+        Returns:
+            List[Finding]: Hallazgos de todos los agentes, en orden de agente.
+
+        Raises:
+            asyncio.CancelledError: Si la ejecución de algún agente fue cancelada.
+        """
+        agents = []
+        for agent_class in (SecurityAgent, StyleAgent, QualityAgent):
+            try:
+                agents.append(agent_class())
+            except Exception as e:
+                logger.error(f"Error inicializando agente de analisis: {e}")
+
+        results = await asyncio.gather(
+            *(asyncio.to_thread(agent.analyze, context) for agent in agents),
+            return_exceptions=True,
+        )
+
+        findings: List[Finding] = []
+        for agent, result in zip(agents, results):
+            if isinstance(result, BaseException):
+                # CancelledError (y KeyboardInterrupt/SystemExit) no son fallos del agente
+                if not isinstance(result, Exception):
+                    raise result
+                logger.error(f"Error ejecutando {agent.name}: {result}")
+                continue
+            findings.extend(result)
+        return findings
+
     async def _validate_file(self, file: UploadFile) -> Tuple[str, str]:
         """
         Valida las restricciones del archivo (RN4).
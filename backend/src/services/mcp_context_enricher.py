@@ -14,6 +14,7 @@ Principios de diseño:
 - Async: Todas las operaciones son asíncronas para consistencia
 """
 
+import asyncio
 from dataclasses import dataclass
 from typing import Optional
 
@@ -22,7 +23,7 @@ from src.external.mcp_client import MCPClient, get_mcp_client
 from src.schemas.finding import Finding
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnrichedContext:
     """
     Contexto enriquecido para un hallazgo.
@@ -63,6 +64,10 @@ class MCPContextEnricher:
         - Testeabilidad: MCP client inyectable facilita testing
     """
 
+    # Tamaño (caracteres) de code_snippet a partir del cual el formateo se
+    # ejecuta en un hilo para no bloquear el event loop
+    OFFLOAD_SNIPPET_THRESHOLD: int = 4096
+
     def __init__(self, mcp_client: Optional[MCPClient] = None):
         """
         Inicializa el enricher con un cliente MCP.
@@ -85,8 +90,13 @@ class MCPContextEnricher:
         # Buscar contexto de seguridad usando MCP client
         security_context = await self._mcp_client.get_security_context(finding)
 
-        # Formatear el contexto del hallazgo
-        formatted_context = self._format_finding_context(finding, security_context)
+        # Formatear el contexto del hallazgo (snippets grandes fuera del event loop)
+        if finding.code_snippet and len(finding.code_snippet) > self.OFFLOAD_SNIPPET_THRESHOLD:
+            formatted_context = await asyncio.to_thread(
+                self._format_finding_context, finding, security_context
+            )
+        else:
+            formatted_context = self._format_finding_context(finding, security_context)
 
         return EnrichedContext(
             finding=finding,
@@ -97,15 +107,18 @@ class MCPContextEnricher:
 
     async def enrich_batch(self, findings: list[Finding]) -> list[EnrichedContext]:
         """
-        Enriquece múltiples hallazgos de forma eficiente.
+        Enriquece múltiples hallazgos de forma concurrente.
+
+        Los hallazgos se enriquecen en paralelo con asyncio.gather, de modo que
+        un cliente MCP con I/O real no suma la latencia de cada llamada.
 
         Args:
             findings: Lista de hallazgos a enriquecer
 
         Returns:
-            Lista de EnrichedContext
+            Lista de EnrichedContext en el mismo orden que ``findings``
         """
-        return [await self.enrich(finding) for finding in findings]
+        return list(await asyncio.gather(*map(self.enrich, findings)))
 
     def _format_finding_context(
         self, finding: Finding, security_context: Optional[SecurityContext]
@@ -148,22 +161,25 @@ class MCPContextEnricher:
         Returns:
             Texto formateado con información del hallazgo
         """
-        lines = [
+        parts = (
             "## Hallazgo Detectado",
             f"- **Tipo**: {finding.issue_type}",
             f"- **Severidad**: {finding.severity.value.upper()}",
             f"- **Mensaje**: {finding.message}",
             f"- **Línea**: {finding.line_number}",
             f"- **Agente**: {finding.agent_name}",
+        )
+        # Campos opcionales: solo se incluyen si tienen valor
+        extras = [
+            line
+            for line in (
+                f"- **Regla**: {finding.rule_id}" if finding.rule_id else None,
+                f"- **Sugerencia inicial**: {finding.suggestion}" if finding.suggestion else None,
+            )
+            if line
         ]
 
-        if finding.rule_id:
-            lines.append(f"- **Regla**: {finding.rule_id}")
-
-        if finding.suggestion:
-            lines.append(f"- **Sugerencia inicial**: {finding.suggestion}")
-
-        return "\n".join(lines)
+        return "\n".join((*parts, *extras))
 
     def _format_code_section(self, finding: Finding) -> str:
         """
@@ -29,10 +29,29 @@ def encrypt_aes256(content: str) -> bytes:
     Raises:
         ValueError: Si el contenido es nulo o vacío.
     """
-    if not content:
+    return encrypt_aes256_bytes(content.encode("utf-8") if content else b"")
+
+
+def encrypt_aes256_bytes(data: bytes) -> bytes:
+    """
+    Encripta contenido ya codificado en UTF-8 usando Fernet (AES-256).
+
+    Evita la codificación intermedia cuando el llamador ya dispone de los
+    bytes originales (por ejemplo, el contenido leído del archivo subido).
+
+    Args:
+        data: Bytes del código fuente a encriptar.
+
+    Returns:
+        bytes: El contenido encriptado listo para almacenar en BD.
+
+    Raises:
+        ValueError: Si el contenido es nulo o vacío.
+    """
+    if not data:
         raise ValueError("El contenido a encriptar no puede estar vacío")
 
-    return _CIPHER.encrypt(content.encode("utf-8"))
+    return _CIPHER.encrypt(data)
 
 
 def decrypt_aes256(encrypted_content: bytes) -> str:
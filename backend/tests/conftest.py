@@ -2,10 +2,13 @@
 Pytest configuration and fixtures
 """
 
+import functools
+
 import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
+from src.schemas.analysis import AnalysisContext
 
 
 @pytest.fixture
@@ -14,6 +17,27 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def performance_agent():
+    """Shared PerformanceAgent (stateless across analyze calls)"""
+    # Deferred: src.main does not load this agent, only its tests need it
+    from src.agents.performance_agent import PerformanceAgent
+
+    return PerformanceAgent()
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_context(code: str, filename: str) -> AnalysisContext:
+    """One AnalysisContext per (code, filename); its AST is parsed once and cached"""
+    return AnalysisContext(code_content=code, filename=filename)
+
+
+@pytest.fixture(scope="session")
+def make_context():
+    """Factory of shared AnalysisContexts: tests must not mutate the returned context"""
+    return _cached_context
+
+
 @pytest.fixture
 def sample_python_code():
     """Sample Python code for testing"""
@@ -0,0 +1,26 @@
+"""
+Helpers shared by the agent test modules.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+from src.schemas.finding import Finding, Severity
+
+# Severity rank (0 = most severe) for ordering checks
+SEVERITY_RANK: Dict[Severity, int] = {severity: rank for rank, severity in enumerate(Severity)}
+
+
+def is_sorted_by_severity(findings: Iterable[Finding]) -> bool:
+    """Check in a single pass that findings never go from less to more severe."""
+    ranks = [SEVERITY_RANK[finding.severity] for finding in findings]
+    return all(a <= b for a, b in zip(ranks, ranks[1:]))
+
+
+def group_findings(
+    findings: Iterable[Finding], key: str = "issue_type"
+) -> Dict[Any, List[Finding]]:
+    """Index findings by one of their attributes (issue_type by default) in a single pass."""
+    groups: Dict[Any, List[Finding]] = {}
+    for finding in findings:
+        groups.setdefault(getattr(finding, key), []).append(finding)
+    return groups
@@ -0,0 +1,55 @@
+"""
+Fixtures compartidos por los tests de integración.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.enums.user_role import UserRole
+from src.schemas.analysis import AnalysisContext
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient de FastAPI inicializado una sola vez por módulo."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def _restore_dependency_overrides():
+    """Restaura app.dependency_overrides al estado previo a cada test."""
+    snapshot = dict(app.dependency_overrides)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(snapshot)
+
+
+@pytest.fixture(scope="session")
+def large_clean_code() -> str:
+    """Código limpio de ~500 líneas construido una sola vez por sesión."""
+    return "\n".join(
+        ["def safe_function():", *[f"    x_{i} = {i} * 2" for i in range(500)], "    return x_499"]
+    )
+
+
+@pytest.fixture(scope="session")
+def large_clean_context(large_clean_code) -> AnalysisContext:
+    """Contexto del código limpio con el AST ya parseado (una sola vez por sesión)."""
+    context = AnalysisContext(code_content=large_clean_code, filename="large_clean.py")
+    context.get_ast()
+    return context
+
+
+@pytest.fixture(scope="session")
+def mock_user_entity():
+    """UserEntity falso de solo lectura (AuthService solo lee sus atributos)."""
+    return SimpleNamespace(
+        id="user_123",
+        email="test@example.com",
+        name="Test User",
+        role=UserRole.DEVELOPER,
+    )
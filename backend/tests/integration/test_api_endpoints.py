@@ -5,10 +5,12 @@ Tests the /api/v1/analyze endpoint with realistic scenarios
 covering file validation, security analysis, and response format.
 """
 
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import datetime
 from io import BytesIO
 from unittest.mock import MagicMock, patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi import status
@@ -24,6 +26,18 @@ from src.schemas.user import Role, User
 # =============================================================================
 
 
+@dataclass(slots=True)
+class _FakeAnalysis:
+    """Resultado de análisis con solo los campos que serializa el endpoint."""
+
+    id: UUID
+    filename: str
+    status: str
+    quality_score: int
+    total_findings: int
+    created_at: datetime
+
+
 @pytest.fixture
 def mock_user() -> User:
     """Usuario autenticado de prueba."""
@@ -45,9 +59,22 @@ def mock_db_session():
     return session
 
 
+def _restore_override(dependency, previous) -> None:
+    """Restaura el override previo de una dependencia (o lo elimina si no había)."""
+    if previous is None:
+        app.dependency_overrides.pop(dependency, None)
+    else:
+        app.dependency_overrides[dependency] = previous
+
+
 @pytest.fixture
-def client(mock_user: User, mock_db_session):
-    """Cliente de prueba con dependencias mockeadas."""
+def dependency_overrides(mock_user: User, mock_db_session):
+    """
+    Sobrescribe auth y DB solo durante el test.
+
+    Al finalizar deshace únicamente los overrides de este módulo, sin
+    borrar los que otros módulos de la sesión hayan registrado.
+    """
 
     def override_get_current_user():
         return mock_user
@@ -55,12 +82,20 @@ def client(mock_user: User, mock_db_session):
     def override_get_db():
         yield mock_db_session
 
-    app.dependency_overrides[get_current_user] = override_get_current_user
-    app.dependency_overrides[get_db] = override_get_db
+    with ExitStack() as stack:
+        for dependency, override in (
+            (get_current_user, override_get_current_user),
+            (get_db, override_get_db),
+        ):
+            stack.callback(_restore_override, dependency, app.dependency_overrides.get(dependency))
+            app.dependency_overrides[dependency] = override
+        yield
 
-    yield TestClient(app)
 
-    app.dependency_overrides.clear()
+@pytest.fixture
+def client(client: TestClient, dependency_overrides) -> TestClient:
+    """Cliente compartido del módulo con dependencias mockeadas."""
+    return client
 
 
 # =============================================================================
@@ -68,10 +103,9 @@ def client(mock_user: User, mock_db_session):
 # =============================================================================
 
 
-def create_python_file(content: str, filename: str = "test_code.py") -> tuple:
-    """Crea un archivo Python simulado para upload."""
-    file_bytes = BytesIO(content.encode("utf-8"))
-    return ("file", (filename, file_bytes, "text/x-python"))
+def create_python_file(content_bytes: bytes, filename: str = "test_code.py") -> tuple:
+    """Crea un archivo Python simulado para upload a partir de bytes ya codificados."""
+    return ("file", (filename, BytesIO(content_bytes), "text/x-python"))
 
 
 def create_valid_python_code() -> str:
@@ -108,6 +142,11 @@ API_KEY = "sk-1234567890abcdef"
 '''
 
 
+# Muestras canónicas codificadas una sola vez al importar el módulo
+_VALID_BYTES = create_valid_python_code().encode("utf-8")
+_VULN_BYTES = create_vulnerable_code().encode("utf-8")
+
+
 # =============================================================================
 # Test Classes
 # =============================================================================
@@ -118,7 +157,7 @@ class TestAnalyzeEndpointValidation:
 
     def test_reject_non_python_file(self, client: TestClient):
         """Rechaza archivos que no son .py."""
-        file_data = create_python_file("print('hello')", "script.js")
+        file_data = create_python_file(b"print('hello')", "script.js")
 
         response = client.post("/api/v1/analyze", files=[file_data])
 
@@ -127,7 +166,7 @@ class TestAnalyzeEndpointValidation:
 
     def test_reject_file_without_extension(self, client: TestClient):
         """Rechaza archivos sin extensión."""
-        file_data = create_python_file("print('hello')", "script")
+        file_data = create_python_file(b"print('hello')", "script")
 
         response = client.post("/api/v1/analyze", files=[file_data])
 
@@ -135,7 +174,7 @@ class TestAnalyzeEndpointValidation:
 
     def test_reject_empty_file(self, client: TestClient):
         """Rechaza archivos vacíos o con menos de 5 líneas."""
-        file_data = create_python_file("# just a comment\n", "empty.py")
+        file_data = create_python_file(b"# just a comment\n", "empty.py")
 
         response = client.post("/api/v1/analyze", files=[file_data])
 
@@ -144,7 +183,7 @@ class TestAnalyzeEndpointValidation:
 
     def test_reject_file_too_large(self, client: TestClient):
         """Rechaza archivos mayores a 10MB."""
-        large_content = "x = 1\n" * (10 * 1024 * 1024 // 6 + 1)
+        large_content = b"x = 1\n" * (10 * 1024 * 1024 // 6 + 1)
         file_data = create_python_file(large_content, "large.py")
 
         response = client.post("/api/v1/analyze", files=[file_data])
@@ -153,9 +192,7 @@ class TestAnalyzeEndpointValidation:
 
     def test_reject_invalid_utf8_encoding(self, client: TestClient):
         """Rechaza archivos con codificación inválida."""
-        invalid_bytes = b"\x80\x81\x82\x83\x84"
-        file_bytes = BytesIO(invalid_bytes)
-        file_data = ("file", ("invalid.py", file_bytes, "text/x-python"))
+        file_data = create_python_file(b"\x80\x81\x82\x83\x84", "invalid.py")
 
         response = client.post("/api/v1/analyze", files=[file_data])
 
@@ -169,7 +206,7 @@ class TestAnalyzeEndpointSuccess:
     @patch("src.services.analysis_service.AnalysisService.analyze_code")
     def test_analyze_valid_python_file(self, mock_analyze, client: TestClient):
         """Analiza correctamente un archivo Python válido."""
-        mock_analyze.return_value = MagicMock(
+        mock_analyze.return_value = _FakeAnalysis(
             id=uuid4(),
             filename="test_code.py",
             status="completed",
@@ -178,7 +215,7 @@ class TestAnalyzeEndpointSuccess:
             created_at=datetime.utcnow(),
         )
 
-        file_data = create_python_file(create_valid_python_code())
+        file_data = create_python_file(_VALID_BYTES)
         response = client.post("/api/v1/analyze", files=[file_data])
 
         assert response.status_code == status.HTTP_200_OK
@@ -190,7 +227,7 @@ class TestAnalyzeEndpointSuccess:
     @patch("src.services.analysis_service.AnalysisService.analyze_code")
     def test_analyze_vulnerable_code_returns_findings(self, mock_analyze, client: TestClient):
         """Detecta vulnerabilidades y retorna findings."""
-        mock_analyze.return_value = MagicMock(
+        mock_analyze.return_value = _FakeAnalysis(
             id=uuid4(),
             filename="vulnerable.py",
             status="completed",
@@ -199,7 +236,7 @@ class TestAnalyzeEndpointSuccess:
             created_at=datetime.utcnow(),
         )
 
-        file_data = create_python_file(create_vulnerable_code(), "vulnerable.py")
+        file_data = create_python_file(_VULN_BYTES, "vulnerable.py")
         response = client.post("/api/v1/analyze", files=[file_data])
 
         assert response.status_code == status.HTTP_200_OK
@@ -215,7 +252,7 @@ class TestAnalyzeEndpointResponseFormat:
     def test_response_contains_required_fields(self, mock_analyze, client: TestClient):
         """La respuesta contiene todos los campos requeridos."""
         analysis_id = uuid4()
-        mock_analyze.return_value = MagicMock(
+        mock_analyze.return_value = _FakeAnalysis(
             id=analysis_id,
             filename="app.py",
             status="completed",
@@ -224,7 +261,7 @@ class TestAnalyzeEndpointResponseFormat:
             created_at=datetime.utcnow(),
         )
 
-        file_data = create_python_file(create_valid_python_code(), "app.py")
+        file_data = create_python_file(_VALID_BYTES, "app.py")
         response = client.post("/api/v1/analyze", files=[file_data])
 
         assert response.status_code == status.HTTP_200_OK
@@ -244,7 +281,7 @@ class TestAnalyzeEndpointResponseFormat:
     @patch("src.services.analysis_service.AnalysisService.analyze_code")
     def test_quality_score_within_bounds(self, mock_analyze, client: TestClient):
         """El quality_score está entre 0 y 100."""
-        mock_analyze.return_value = MagicMock(
+        mock_analyze.return_value = _FakeAnalysis(
             id=uuid4(),
             filename="test.py",
             status="completed",
@@ -253,7 +290,7 @@ class TestAnalyzeEndpointResponseFormat:
             created_at=datetime.utcnow(),
         )
 
-        file_data = create_python_file(create_valid_python_code())
+        file_data = create_python_file(_VALID_BYTES)
         response = client.post("/api/v1/analyze", files=[file_data])
 
         data = response.json()
@@ -270,7 +307,7 @@ class TestAnalyzeEndpointAuthentication:
         app.dependency_overrides.clear()
 
         client = TestClient(app)
-        file_data = create_python_file(create_valid_python_code())
+        file_data = create_python_file(_VALID_BYTES)
 
         response = client.post("/api/v1/analyze", files=[file_data])
 
@@ -294,7 +331,7 @@ class TestAnalyzeEndpointErrorHandling:
         """Retorna 500 en errores internos."""
         mock_analyze.side_effect = Exception("Database connection failed")
 
-        file_data = create_python_file(create_valid_python_code())
+        file_data = create_python_file(_VALID_BYTES)
         response = client.post("/api/v1/analyze", files=[file_data])
 
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1,23 +1,37 @@
 """Tests de integración para auth router."""
 
+import asyncio
 import time
-from unittest.mock import MagicMock, patch
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+import httpx
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from jose import jwt
 
-from src.main import app
-from src.models.enums.user_role import UserRole
-from src.models.user import UserEntity
+import src.routers.auth as auth_module
+from src.core.database import get_db
+from src.external.clerk_client import ClerkTokenExpiredError, ClerkTokenInvalidError
+
+# App mínima con solo el router de auth: evita montar el resto de routers y
+# middlewares de src.main para tests que solo tocan /api/v1/auth
+app = FastAPI()
+app.include_router(auth_module.router)
 
 # Test secret key
 TEST_SECRET_KEY = "test-secret-key-for-router-tests"
 
 
-def create_valid_token(user_id: str = "user_123", email: str = "test@example.com") -> str:
-    """Genera un token JWT válido para tests."""
-    now = int(time.time())
+# Granularidad (segundos) del iat para reutilizar tokens firmados entre tests
+TOKEN_TIME_BUCKET = 60
+
+
+@lru_cache(maxsize=32)
+def _encode_valid_token(user_id: str, email: str, now: int) -> str:
+    """Firma un token válido; memoizado por (user_id, email, bucket de tiempo)."""
     payload = {
         "sub": user_id,
         "email": email,
@@ -28,6 +42,13 @@ def create_valid_token(user_id: str = "user_123", email: str = "test@example.com
     return jwt.encode(payload, TEST_SECRET_KEY, algorithm="HS256")
 
 
+def create_valid_token(user_id: str = "user_123", email: str = "test@example.com") -> str:
+    """Genera un token JWT válido para tests."""
+    now = int(time.time()) // TOKEN_TIME_BUCKET * TOKEN_TIME_BUCKET
+    return _encode_valid_token(user_id, email, now)
+
+
+@lru_cache(maxsize=1)
 def create_expired_token() -> str:
     """Genera un token JWT expirado."""
     now = int(time.time())
@@ -40,49 +61,75 @@ def create_expired_token() -> str:
     return jwt.encode(payload, TEST_SECRET_KEY, algorithm="HS256")
 
 
-@pytest.fixture
+def reset_token_cache() -> None:
+    """Descarta los tokens memoizados."""
+    _encode_valid_token.cache_clear()
+    create_expired_token.cache_clear()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _token_cache():
+    """Limpia la cache de tokens al terminar el módulo."""
+    yield
+    reset_token_cache()
+
+
+@pytest.fixture(scope="module")
 def client():
-    """TestClient de FastAPI."""
-    return TestClient(app)
+    """TestClient sobre la app mínima de auth, compartido por el módulo."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
-def mock_user_entity():
-    """UserEntity mockeado."""
-    entity = MagicMock(spec=UserEntity)
-    entity.id = "user_123"
-    entity.email = "test@example.com"
-    entity.name = "Test User"
-    entity.role = UserRole.DEVELOPER
-    return entity
+def auth_mocks(monkeypatch):
+    """
+    Inyecta dobles de ClerkClient, UserRepository y la sesión de BD.
+
+    Returns:
+        SimpleNamespace con ``clerk``, ``repo`` y ``session`` para configurar
+        en cada test; monkeypatch revierte todo al finalizar.
+    """
+    mocks = SimpleNamespace(clerk=MagicMock(), repo=MagicMock(), session=MagicMock())
+
+    def override_get_db():
+        yield mocks.session
+
+    monkeypatch.setattr(auth_module, "ClerkClient", MagicMock(return_value=mocks.clerk))
+    monkeypatch.setattr(auth_module, "UserRepository", MagicMock(return_value=mocks.repo))
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    return mocks
+
+
+# (excepción de Clerk, generador de token, texto esperado en el detalle)
+TOKEN_REJECTED_CASES = [
+    pytest.param(
+        ClerkTokenExpiredError("Token expirado"), create_expired_token, "expirado", id="expired"
+    ),
+    pytest.param(
+        ClerkTokenInvalidError("Token inválido"), lambda: "invalid-token", "inválido", id="invalid"
+    ),
+]
+
+
+def _clerk_raising(auth_mocks, exc):
+    """Configura el ClerkClient mockeado para que verify_token lance ``exc``."""
+    auth_mocks.clerk.verify_token.side_effect = exc
 
 
 class TestLoginEndpoint:
     """Tests para POST /api/v1/auth/login."""
 
-    @patch("src.routers.auth.ClerkClient")
-    @patch("src.routers.auth.UserRepository")
-    @patch("src.routers.auth.get_db")
-    def test_login_success_new_user(
-        self, mock_get_db, mock_repo_class, mock_clerk_class, client, mock_user_entity
-    ):
+    def test_login_success_new_user(self, auth_mocks, client, mock_user_entity):
         """Login exitoso crea usuario nuevo."""
         # Arrange
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.return_value = {
+        auth_mocks.clerk.verify_token.return_value = {
             "sub": "user_123",
             "email": "test@example.com",
             "name": "Test User",
         }
-        mock_clerk_class.return_value = mock_clerk
-
-        mock_repo = MagicMock()
-        mock_repo.get_by_id.return_value = None  # Usuario no existe
-        mock_repo.create.return_value = mock_user_entity
-        mock_repo_class.return_value = mock_repo
-
-        mock_session = MagicMock()
-        mock_get_db.return_value = iter([mock_session])
+        auth_mocks.repo.get_by_id.return_value = None  # Usuario no existe
+        auth_mocks.repo.create.return_value = mock_user_entity
 
         token = create_valid_token()
 
@@ -98,29 +145,16 @@ class TestLoginEndpoint:
         assert data["id"] == "user_123"
         assert data["email"] == "test@example.com"
 
-    @patch("src.routers.auth.ClerkClient")
-    @patch("src.routers.auth.UserRepository")
-    @patch("src.routers.auth.get_db")
-    def test_login_success_existing_user(
-        self, mock_get_db, mock_repo_class, mock_clerk_class, client, mock_user_entity
-    ):
+    def test_login_success_existing_user(self, auth_mocks, client, mock_user_entity):
         """Login exitoso actualiza usuario existente."""
         # Arrange
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.return_value = {
+        auth_mocks.clerk.verify_token.return_value = {
             "sub": "user_123",
             "email": "updated@example.com",
             "name": "Updated Name",
         }
-        mock_clerk_class.return_value = mock_clerk
-
-        mock_repo = MagicMock()
-        mock_repo.get_by_id.return_value = mock_user_entity  # Usuario existe
-        mock_repo.update.return_value = mock_user_entity
-        mock_repo_class.return_value = mock_repo
-
-        mock_session = MagicMock()
-        mock_get_db.return_value = iter([mock_session])
+        auth_mocks.repo.get_by_id.return_value = mock_user_entity  # Usuario existe
+        auth_mocks.repo.update.return_value = mock_user_entity
 
         token = create_valid_token()
 
@@ -133,78 +167,64 @@ class TestLoginEndpoint:
         # Assert
         assert response.status_code == 200
 
-    @patch("src.routers.auth.ClerkClient")
-    @patch("src.routers.auth.get_db")
-    def test_login_token_expired(self, mock_get_db, mock_clerk_class, client):
-        """Token expirado retorna 401."""
+    @pytest.mark.asyncio
+    async def test_login_does_not_block_event_loop(self, auth_mocks, mock_user_entity):
+        """verify_token síncrono no bloquea el event loop: los logins concurrentes se solapan."""
+        delay = 0.05
+        concurrent_requests = 10
+
+        def slow_verify_token(_token):
+            time.sleep(delay)
+            return {"sub": "user_123", "email": "test@example.com", "name": "Test User"}
+
+        auth_mocks.clerk.verify_token.side_effect = slow_verify_token
+        auth_mocks.repo.get_by_id.return_value = mock_user_entity
+        auth_mocks.repo.update.return_value = mock_user_entity
+        headers = {"Authorization": f"Bearer {create_valid_token()}"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            start = time.perf_counter()
+            responses = await asyncio.gather(
+                *(
+                    async_client.post("/api/v1/auth/login", headers=headers)
+                    for _ in range(concurrent_requests)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+        assert all(r.status_code == 200 for r in responses)
+        # En serie tardaría concurrent_requests * delay (0.5s)
+        assert elapsed < 5 * delay
+
+    @pytest.mark.parametrize("exc, token_factory, detail_substr", TOKEN_REJECTED_CASES)
+    def test_login_token_rejected(self, auth_mocks, client, exc, token_factory, detail_substr):
+        """Token expirado o inválido retorna 401 con el detalle correspondiente."""
         # Arrange
-        from src.external.clerk_client import ClerkTokenExpiredError
-
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.side_effect = ClerkTokenExpiredError("Token expirado")
-        mock_clerk_class.return_value = mock_clerk
-
-        mock_session = MagicMock()
-        mock_get_db.return_value = iter([mock_session])
-
-        token = create_expired_token()
+        _clerk_raising(auth_mocks, exc)
 
         # Act
         response = client.post(
             "/api/v1/auth/login",
-            headers={"Authorization": f"Bearer {token}"},
+            headers={"Authorization": f"Bearer {token_factory()}"},
         )
 
         # Assert
         assert response.status_code == 401
-        assert "expirado" in response.json()["detail"].lower()
-
-    @patch("src.routers.auth.ClerkClient")
-    @patch("src.routers.auth.get_db")
-    def test_login_token_invalid(self, mock_get_db, mock_clerk_class, client):
-        """Token inválido retorna 401."""
-        # Arrange
-        from src.external.clerk_client import ClerkTokenInvalidError
-
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.side_effect = ClerkTokenInvalidError("Token inválido")
-        mock_clerk_class.return_value = mock_clerk
-
-        mock_session = MagicMock()
-        mock_get_db.return_value = iter([mock_session])
-
-        # Act
-        response = client.post(
-            "/api/v1/auth/login",
-            headers={"Authorization": f"Bearer invalid-token"},
-        )
-
-        # Assert
-        assert response.status_code == 401
-        assert "inválido" in response.json()["detail"].lower()
-
-    def test_login_missing_token(self, client):
-        """Sin token retorna 401 o 403 (depende de versión FastAPI)."""
-        response = client.post("/api/v1/auth/login")
-
-        # 401 en versiones nuevas de Starlette, 403 en anteriores
-        assert response.status_code in (401, 403)
+        assert detail_substr in response.json()["detail"].lower()
 
 
 class TestGetMeEndpoint:
     """Tests para GET /api/v1/auth/me."""
 
-    @patch("src.routers.auth.ClerkClient")
-    def test_get_me_success(self, mock_clerk_class, client):
+    def test_get_me_success(self, auth_mocks, client):
         """Token válido retorna datos del usuario."""
         # Arrange
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.return_value = {
+        auth_mocks.clerk.verify_token.return_value = {
             "user_id": "user_me",
             "email": "me@example.com",
             "name": "Current User",
         }
-        mock_clerk_class.return_value = mock_clerk
 
         token = create_valid_token(user_id="user_me", email="me@example.com")
 
@@ -220,51 +240,33 @@ class TestGetMeEndpoint:
         assert data["id"] == "user_me"
         assert data["email"] == "me@example.com"
 
-    @patch("src.routers.auth.ClerkClient")
-    def test_get_me_token_expired(self, mock_clerk_class, client):
-        """Token expirado retorna 401."""
+    @pytest.mark.parametrize("exc, token_factory, detail_substr", TOKEN_REJECTED_CASES)
+    def test_get_me_token_rejected(self, auth_mocks, client, exc, token_factory, detail_substr):
+        """Token expirado o inválido retorna 401 con el detalle correspondiente."""
         # Arrange
-        from src.external.clerk_client import ClerkTokenExpiredError
-
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.side_effect = ClerkTokenExpiredError("Token expirado")
-        mock_clerk_class.return_value = mock_clerk
-
-        token = create_expired_token()
+        _clerk_raising(auth_mocks, exc)
 
         # Act
         response = client.get(
             "/api/v1/auth/me",
-            headers={"Authorization": f"Bearer {token}"},
+            headers={"Authorization": f"Bearer {token_factory()}"},
         )
 
         # Assert
         assert response.status_code == 401
-        assert "expirado" in response.json()["detail"].lower()
-
-    @patch("src.routers.auth.ClerkClient")
-    def test_get_me_token_invalid(self, mock_clerk_class, client):
-        """Token inválido retorna 401."""
-        # Arrange
-        from src.external.clerk_client import ClerkTokenInvalidError
+        assert detail_substr in response.json()["detail"].lower()
 
-        mock_clerk = MagicMock()
-        mock_clerk.verify_token.side_effect = ClerkTokenInvalidError("Token inválido")
-        mock_clerk_class.return_value = mock_clerk
 
-        # Act
-        response = client.get(
-            "/api/v1/auth/me",
-            headers={"Authorization": f"Bearer bad-token"},
-        )
-
-        # Assert
-        assert response.status_code == 401
-        assert "inválido" in response.json()["detail"].lower()
+class TestMissingToken:
+    """Tests de endpoints de auth sin header Authorization."""
 
-    def test_get_me_missing_token(self, client):
+    @pytest.mark.parametrize(
+        "method,url",
+        [("post", "/api/v1/auth/login"), ("get", "/api/v1/auth/me")],
+    )
+    def test_missing_token(self, client, method, url):
         """Sin token retorna 401 o 403 (depende de versión FastAPI)."""
-        response = client.get("/api/v1/auth/me")
+        response = client.request(method, url)
 
         # 401 en versiones nuevas de Starlette, 403 en anteriores
         assert response.status_code in (401, 403)
@@ -5,117 +5,89 @@ Tests PerformanceAgent with realistic inefficient code samples
 and verifies end-to-end behavior.
 """
 
-import time
+from collections import Counter
+from pathlib import Path
 
 import pytest
 
-from src.agents.performance_agent import PerformanceAgent
 from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Severity
+from tests.helpers import group_findings, is_sorted_by_severity
 
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures"
 
-class TestPerformanceAgentIntegration:
-    """Integration tests for PerformanceAgent with realistic code."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create PerformanceAgent instance."""
-        return PerformanceAgent()
+@pytest.fixture(scope="module")
+def agent(performance_agent):
+    """PerformanceAgent shared with the unit tests (session fixture; analyze() is stateless)."""
+    return performance_agent
 
-    @pytest.fixture
-    def inefficient_data_processing_code(self):
-        """Realistic inefficient data processing code."""
-        return """
-import socket
-import time
 
-def process_large_dataset(users, transactions):
-    results = []
-    
-    # 1. Nested loops (O(n^2)) - Critical
-    # Comparing every user with every transaction
-    for user in users:
-        for tx in transactions:
-            if user['id'] == tx['user_id']:
-                results.append({'user': user, 'tx': tx})
-                
-    return results
+@pytest.fixture(scope="session")
+def inefficient_data_processing_code():
+    """Realistic inefficient data processing code, read from tests/fixtures/."""
+    return (FIXTURES_DIR / "inefficient_data_processing.txt").read_text(encoding="utf-8")
 
-def filter_allowed_items(items, allowed_list):
-    filtered = []
-    # 2. Linear search in loop - Medium
-    for item in items:
-        if item in allowed_list:  # O(n) inside loop -> O(n^2)
-            filtered.append(item)
-    return filtered
-
-def export_logs(logs):
-    # 3. Resource leak (File) - High
-    f = open('export.log', 'w')
-    for log in logs:
-        f.write(str(log) + '\\n')
-    # Missing close()
-    
-def check_server_status(host, port):
-    # 4. Resource leak (Socket) - High
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.connect((host, port))
-    s.send(b'PING')
-    response = s.recv(1024)
-    return response
-
-def update_user_stats(user_ids):
-    # 5. N+1 Query - Critical
-    for uid in user_ids:
-        db.execute("SELECT * FROM stats WHERE user_id = ?", uid)
-
-def terrible_complexity(data):
-    # 6. Triple nested loop (O(n^3)) - Critical
-    for i in data:
-        for j in data:
-            for k in data:
-                print(i, j, k)
-"""
 
-    def test_comprehensive_performance_detection(self, agent, inefficient_data_processing_code):
-        """Test detection of all performance issues in realistic code."""
-        context = AnalysisContext(
-            code_content=inefficient_data_processing_code, filename="data_processor.py"
-        )
+@pytest.fixture(scope="module")
+def perf_analysis(agent, make_context, inefficient_data_processing_code):
+    """Run the agent once on the inefficient sample; shared by every assertion test."""
+    return agent.analyze(make_context(inefficient_data_processing_code, "data_processor.py"))
 
-        findings = agent.analyze(context)
 
-        # Should detect multiple issues
-        assert len(findings) >= 6
+@pytest.fixture(scope="module")
+def perf_by_issue_type(perf_analysis):
+    """Index the shared findings by issue_type once for O(1) lookups."""
+    return group_findings(perf_analysis)
 
-        # Verify each issue type is detected
-        issue_types = {f.issue_type for f in findings}
-        assert "performance/complexity" in issue_types  # Nested loops
-        assert "performance/inefficient-operation" in issue_types  # Linear search
-        assert "performance/resource-leak" in issue_types  # File and Socket
-        assert "performance/database" in issue_types  # N+1
 
-        # Verify severity distribution
-        critical_count = sum(1 for f in findings if f.is_critical)
-        high_count = sum(1 for f in findings if f.is_high_or_critical)
+class TestPerformanceAgentIntegration:
+    """Integration tests for PerformanceAgent with realistic code."""
+
+    def test_comprehensive_performance_detection(self, perf_analysis):
+        """Test detection of all performance issues in realistic code."""
+        # Should detect multiple issues
+        assert len(perf_analysis) >= 6
+
+    @pytest.mark.parametrize(
+        "expected_issue_type",
+        [
+            "performance/complexity",  # Nested loops
+            "performance/inefficient-operation",  # Linear search
+            "performance/resource-leak",  # File and Socket
+            "performance/database",  # N+1
+        ],
+    )
+    def test_comprehensive_detects_issue_type(self, perf_by_issue_type, expected_issue_type):
+        """Verify each issue type is detected in the realistic sample."""
+        assert perf_by_issue_type.get(expected_issue_type)
+
+    @pytest.mark.parametrize("expected_complexity", ["O(n^2)", "O(n^3)"])
+    def test_comprehensive_reports_loop_complexity(self, perf_by_issue_type, expected_complexity):
+        """Verify nested-loop findings report the detected complexity order."""
+        messages = [f.message for f in perf_by_issue_type["performance/complexity"]]
+        assert any(f"complejidad {expected_complexity}" in m for m in messages)
+
+    def test_comprehensive_severity_distribution(self, perf_analysis):
+        """Verify severity distribution of the realistic sample."""
+        sev_counts = Counter(f.severity for f in perf_analysis)
+        critical_count = sev_counts[Severity.CRITICAL]
+        high_count = critical_count + sev_counts[Severity.HIGH]
 
         assert critical_count >= 2  # Triple nested loops, N+1
         assert high_count >= 5  # + Double nested loops, File leak, Socket leak
 
-        # Verify findings have suggestions
-        for finding in findings:
+    def test_comprehensive_findings_have_suggestions(self, perf_analysis):
+        """Verify findings have suggestions."""
+        for finding in perf_analysis:
             assert finding.suggestion is not None
             assert len(finding.suggestion) > 10
 
-        # Verify findings are sorted by severity
-        severities = [f.severity.value for f in findings]
-        expected_order = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
+    def test_comprehensive_findings_sorted_by_severity(self, perf_analysis):
+        """Verify findings are sorted by severity."""
+        assert is_sorted_by_severity(perf_analysis)
 
-        # Check if sorted correctly (indices in expected_order should be non-decreasing)
-        indices = [expected_order.index(s) for s in severities]
-        assert indices == sorted(indices)
-
-    def test_optimized_code_no_false_positives(self, agent):
+    def test_optimized_code_no_false_positives(self, agent, make_context):
         """Test that optimized code doesn't generate false positives."""
         optimized_code = """
 def process_efficiently(users, transactions):
@@ -140,14 +112,14 @@ def get_stats_batch(user_ids):
     query = f"SELECT * FROM stats WHERE user_id IN ({placeholders})"
     db.execute(query, user_ids)
 """
-        context = AnalysisContext(code_content=optimized_code, filename="optimized.py")
+        context = make_context(optimized_code, "optimized.py")
 
         findings = agent.analyze(context)
 
         # Should have 0 findings for optimized code
         assert len(findings) == 0
 
-    def test_mixed_performance_file(self, agent):
+    def test_mixed_performance_file(self, agent, make_context):
         """Test file with mix of efficient and inefficient code."""
         mixed_code = """
 def good_function():
@@ -161,7 +133,7 @@ def bad_function(items):
         result.insert(0, item)  # O(n) inside loop
     return result
 """
-        context = AnalysisContext(code_content=mixed_code, filename="mixed.py")
+        context = make_context(mixed_code, "mixed.py")
 
         findings = agent.analyze(context)
 
@@ -186,24 +158,11 @@ def leak():
             assert finding.agent_name == "PerformanceAgent"
             assert finding.detected_at is not None
 
-    def test_large_file_performance(self, agent):
-        """Test PerformanceAgent performance with larger file."""
-        # Generate code with 500 simple functions
-        lines = ["def safe_function():"]
-        for i in range(500):
-            lines.append(f"    x_{i} = {i} * 2")
-        lines.append("    return x_499")
-
-        code_content = "\n".join(lines)
-
-        context = AnalysisContext(code_content=code_content, filename="large_clean.py")
-
-        start_time = time.time()
-        findings = agent.analyze(context)
-        end_time = time.time()
+    def test_large_file_performance(self, agent, large_clean_context, benchmark):
+        """Test PerformanceAgent performance with larger file (AST parsed once per session).
 
-        execution_time = end_time - start_time
+        Timing is only collected with --benchmark-enable; normal runs call analyze() once.
+        """
+        findings = benchmark(agent.analyze, large_clean_context)
 
-        # Should be fast
-        assert execution_time < 1.0
         assert len(findings) == 0
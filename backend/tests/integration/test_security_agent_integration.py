@@ -11,19 +11,8 @@ from src.agents.security_agent import SecurityAgent
 from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Severity
 
-
-class TestSecurityAgentIntegration:
-    """Integration tests for SecurityAgent with realistic code."""
-
-    @pytest.fixture
-    def agent(self):
-        """Create SecurityAgent instance."""
-        return SecurityAgent()
-
-    @pytest.fixture
-    def vulnerable_web_app_code(self):
-        """Realistic vulnerable web application code."""
-        return """
+# Source samples are built once at import and shared by the tests below
+VULNERABLE_WEB_APP_CODE = """
 import hashlib
 import pickle
 from flask import Flask, request
@@ -70,44 +59,7 @@ def load_data():
     return {'loaded': str(obj)}
 """
 
-    def test_comprehensive_vulnerability_detection(self, agent, vulnerable_web_app_code):
-        """Test detection of all vulnerability types in realistic code."""
-        context = AnalysisContext(code_content=vulnerable_web_app_code, filename="app.py")
-
-        findings = agent.analyze(context)
-
-        # Should detect multiple vulnerabilities
-        assert len(findings) >= 5
-
-        # Verify each vulnerability type is detected
-        issue_types = {f.issue_type for f in findings}
-        assert "hardcoded_credentials" in issue_types
-        assert "sql_injection" in issue_types
-        assert "weak_cryptography" in issue_types
-        assert "dangerous_function" in issue_types
-
-        # Verify severity distribution
-        critical_count = sum(1 for f in findings if f.is_critical)
-        high_count = sum(1 for f in findings if f.is_high_or_critical)
-
-        assert critical_count >= 2  # Password, API key, eval
-        assert high_count >= 4  # Including SQL injection
-
-        # Verify findings have suggestions
-        for finding in findings:
-            assert finding.suggestion is not None
-            assert len(finding.suggestion) > 10
-
-        # Verify findings are sorted by severity
-        severities = [f.severity.value for f in findings]
-        expected_order = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
-
-        for i in range(len(severities) - 1):
-            assert expected_order.index(severities[i]) <= expected_order.index(severities[i + 1])
-
-    def test_secure_code_no_false_positives(self, agent):
-        """Test that secure code doesn't generate false positives."""
-        secure_code = """
+SECURE_CODE = """
 import os
 import hashlib
 from sqlalchemy import create_engine, text
@@ -140,16 +92,8 @@ def process_data(data: dict) -> dict:
     }
     return processed
 """
-        context = AnalysisContext(code_content=secure_code, filename="secure_app.py")
 
-        findings = agent.analyze(context)
-
-        # Should have 0 findings for secure code
-        assert len(findings) == 0
-
-    def test_partial_vulnerability_file(self, agent):
-        """Test file with mix of secure and vulnerable code."""
-        mixed_code = """
+MIXED_CODE = """
 import hashlib
 
 # Secure part
@@ -167,7 +111,85 @@ class Config:
     DATABASE_URL = os.getenv('DATABASE_URL')
     SECRET_KEY = os.getenv('SECRET_KEY')
 """
-        context = AnalysisContext(code_content=mixed_code, filename="utils.py")
+
+# 100 safe functions followed by a single hardcoded password
+LARGE_CODE = "\n".join(
+    [
+        "import hashlib\n",
+        *(
+            f"def function_{i}(data):\n"
+            "    # Safe function\n"
+            "    return hashlib.sha256(data.encode()).hexdigest()\n"
+            for i in range(100)
+        ),
+        "# Single vulnerability",
+        'password = "HardcodedPassword123"\n',
+    ]
+)
+
+
+@pytest.fixture(scope="module")
+def vulnerable_web_app_code():
+    """Realistic vulnerable web application code."""
+    return VULNERABLE_WEB_APP_CODE
+
+
+@pytest.fixture(scope="module")
+def agent():
+    """Create a SecurityAgent shared by the module (analyze() is stateless)."""
+    return SecurityAgent()
+
+
+class TestSecurityAgentIntegration:
+    """Integration tests for SecurityAgent with realistic code."""
+
+    def test_comprehensive_vulnerability_detection(self, agent, vulnerable_web_app_code):
+        """Test detection of all vulnerability types in realistic code."""
+        context = AnalysisContext(code_content=vulnerable_web_app_code, filename="app.py")
+
+        findings = agent.analyze(context)
+
+        # Should detect multiple vulnerabilities
+        assert len(findings) >= 5
+
+        # Verify each vulnerability type is detected
+        issue_types = {f.issue_type for f in findings}
+        assert "hardcoded_credentials" in issue_types
+        assert "sql_injection" in issue_types
+        assert "weak_cryptography" in issue_types
+        assert "dangerous_function" in issue_types
+
+        # Verify severity distribution
+        critical_count = sum(1 for f in findings if f.is_critical)
+        high_count = sum(1 for f in findings if f.is_high_or_critical)
+
+        assert critical_count >= 2  # Password, API key, eval
+        assert high_count >= 4  # Including SQL injection
+
+        # Verify findings have suggestions
+        for finding in findings:
+            assert finding.suggestion is not None
+            assert len(finding.suggestion) > 10
+
+        # Verify findings are sorted by severity
+        severities = [f.severity.value for f in findings]
+        expected_order = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
+
+        for i in range(len(severities) - 1):
+            assert expected_order.index(severities[i]) <= expected_order.index(severities[i + 1])
+
+    def test_secure_code_no_false_positives(self, agent):
+        """Test that secure code doesn't generate false positives."""
+        context = AnalysisContext(code_content=SECURE_CODE, filename="secure_app.py")
+
+        findings = agent.analyze(context)
+
+        # Should have 0 findings for secure code
+        assert len(findings) == 0
+
+    def test_partial_vulnerability_file(self, agent):
+        """Test file with mix of secure and vulnerable code."""
+        context = AnalysisContext(code_content=MIXED_CODE, filename="utils.py")
 
         findings = agent.analyze(context)
 
@@ -194,26 +216,7 @@ class Config:
 
     def test_large_file_performance(self, agent):
         """Test SecurityAgent performance with larger file."""
-        # Generate code with 100 functions
-        large_code = """
-import hashlib
-
-"""
-        for i in range(100):
-            large_code += f"""
-def function_{i}(data):
-    # Safe function
-    return hashlib.sha256(data.encode()).hexdigest()
-
-"""
-
-        # Add one vulnerability at the end
-        large_code += """
-# Single vulnerability
-password = "HardcodedPassword123"
-"""
-
-        context = AnalysisContext(code_content=large_code, filename="large_module.py")
+        context = AnalysisContext(code_content=LARGE_CODE, filename="large_module.py")
 
         findings = agent.analyze(context)
 
@@ -6,8 +6,6 @@ realista que contiene múltiples tipos de problemas de estilo.
 
 from typing import Any, Dict
 
-import pytest
-
 from src.agents.style_agent import StyleAgent
 from src.core.events.event_bus import EventBus
 from src.core.events.observers import EventObserver
@@ -7,6 +7,11 @@ Tests Sprint 3 functionality including:
 - AI explanation generation
 """
 
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -18,14 +23,16 @@ from src.core.config.mcp_config import (
     format_security_context,
     get_security_context,
 )
-from src.external.interfaces.ai_client import AIResponse
+from src.external.interfaces.ai_client import AIClientError, AIResponse
 from src.schemas.ai_explanation import AIExplanation, RateLimitInfo
 from src.schemas.finding import Finding, Severity
+from src.services import ai_service
 from src.services.ai_service import (
     AIExplainerService,
     AIExplanationError,
     InMemoryRateLimiter,
     RateLimitExceeded,
+    _load_response_fields,
 )
 from src.services.mcp_context_enricher import (
     EnrichedContext,
@@ -37,9 +44,9 @@ from src.services.mcp_context_enricher import (
 # ============================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_security_finding() -> Finding:
-    """Create a sample security finding for testing."""
+    """Create a sample security finding for testing (Finding is frozen, so shared)."""
     return Finding(
         severity=Severity.CRITICAL,
         issue_type="dangerous_function",
@@ -52,7 +59,7 @@ def sample_security_finding() -> Finding:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_style_finding() -> Finding:
     """Create a sample style finding (non-security)."""
     return Finding(
@@ -69,7 +76,7 @@ def sample_style_finding() -> Finding:
 
 @pytest.fixture
 def mock_ai_client():
-    """Create a mock AI client."""
+    """Create a mock AI client (per test: tests reconfigure it and count awaits)."""
     client = AsyncMock()
     client.generate_explanation = AsyncMock(
         return_value=AIResponse(
@@ -84,10 +91,29 @@ def mock_ai_client():
     return client
 
 
+class FakeClock:
+    """Manually advanced monotonic clock for deterministic rate-limit tests."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def tick(self, delta: timedelta) -> None:
+        self.now += delta.total_seconds()
+
+
 @pytest.fixture
-def rate_limiter():
-    """Create a rate limiter with low limit for testing."""
-    return InMemoryRateLimiter(limit_per_hour=3)
+def clock():
+    """Create a frozen clock (per test: tests advance it)."""
+    return FakeClock()
+
+
+@pytest.fixture
+def rate_limiter(clock):
+    """Create a rate limiter with low limit for testing (per test: it holds token state)."""
+    return InMemoryRateLimiter(limit_per_hour=3, clock=clock)
 
 
 # ============================================================
@@ -147,8 +173,8 @@ class TestMCPConfig:
             description="Test description",
             impact="Test impact",
             mitigation="Test mitigation",
-            references=["https://owasp.org"],
-            cwe_ids=["CWE-94"],
+            references=("https://owasp.org",),
+            cwe_ids=("CWE-94",),
         )
 
         formatted = format_security_context(context)
@@ -157,6 +183,38 @@ class TestMCPConfig:
         assert "Test description" in formatted
         assert "CWE-94" in formatted
 
+    def test_get_security_context_is_memoized(self):
+        """Repeated lookups should be served from the cache."""
+        get_security_context.cache_clear()
+
+        first = get_security_context(rule_id="SEC002_SQL_INJECTION")
+        second = get_security_context(rule_id="SEC002_SQL_INJECTION")
+
+        assert first is second
+        assert get_security_context.cache_info().hits == 1
+
+    def test_format_security_context_is_cached_on_context(self):
+        """Formatting the same context twice should reuse the cached text."""
+        context = get_security_context(rule_id="SEC001_EVAL")
+
+        assert format_security_context(context) is format_security_context(context)
+
+    def test_security_context_is_hashable_with_tuple_fields(self):
+        """Tuple fields make contexts hashable and comparable by value."""
+        context = SecurityContext(
+            category="A03:2021 - Injection",
+            description="Test description",
+            impact="Test impact",
+            mitigation="Test mitigation",
+            references=("https://owasp.org",),
+            cwe_ids=("CWE-94", "CWE-89"),
+        )
+
+        assert context.cwe_ids == ("CWE-94", "CWE-89")
+        assert "CWE-89" in context.cwe_ids
+        assert {context: "ok"}[context] == "ok"
+        assert all(isinstance(ctx.references, tuple) for ctx in OWASP_TOP_10.values())
+
 
 # ============================================================
 # Tests for MCP Context Enricher
@@ -191,6 +249,15 @@ class TestMCPContextEnricher:
         # Style findings don't have OWASP context
         assert not result.is_security_finding
 
+    @pytest.mark.asyncio
+    async def test_enriched_context_is_frozen_and_slotted(self, sample_security_finding):
+        """EnrichedContext should be immutable and carry no per-instance __dict__."""
+        result = await MCPContextEnricher().enrich(sample_security_finding)
+
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            result.has_security_context = False
+
     @pytest.mark.asyncio
     async def test_enrich_batch(self, sample_security_finding, sample_style_finding):
         """Should enrich multiple findings."""
@@ -202,6 +269,48 @@ class TestMCPContextEnricher:
         assert len(results) == 2
         assert all(isinstance(r, EnrichedContext) for r in results)
 
+    @pytest.mark.asyncio
+    async def test_enrich_batch_runs_concurrently_and_keeps_order(
+        self, sample_security_finding, sample_style_finding
+    ):
+        """Batch enrichment should overlap MCP lookups and preserve input order."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_lookup(_finding):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return None
+
+        mcp_client = MagicMock()
+        mcp_client.get_security_context = slow_lookup
+        enricher = MCPContextEnricher(mcp_client=mcp_client)
+        findings = [sample_security_finding, sample_style_finding]
+
+        results = await enricher.enrich_batch(findings)
+
+        assert max_in_flight == 2
+        assert [r.finding for r in results] == findings
+
+    @pytest.mark.asyncio
+    async def test_enrich_offloads_large_snippet_to_thread(self, sample_security_finding):
+        """Large code snippets should be formatted off the event loop."""
+        enricher = MCPContextEnricher()
+        large_snippet = "x = 1\n" * (MCPContextEnricher.OFFLOAD_SNIPPET_THRESHOLD // 6 + 1)
+        finding = sample_security_finding.model_copy(update={"code_snippet": large_snippet})
+
+        with patch(
+            "src.services.mcp_context_enricher.asyncio.to_thread",
+            new=AsyncMock(return_value="formatted"),
+        ) as mock_to_thread:
+            result = await enricher.enrich(finding)
+
+        mock_to_thread.assert_awaited_once()
+        assert result.formatted_prompt_context == "formatted"
+
     @pytest.mark.asyncio
     async def test_formatted_context_includes_finding_info(self, sample_security_finding):
         """Formatted context should include finding details."""
@@ -221,6 +330,7 @@ class TestMCPContextEnricher:
 # ============================================================
 
 
+@pytest.mark.xdist_group("rate_limiter")
 class TestInMemoryRateLimiter:
     """Tests for the in-memory rate limiter."""
 
@@ -269,6 +379,73 @@ class TestInMemoryRateLimiter:
 
         assert info1.requests_remaining == info2.requests_remaining == 3
 
+    def test_requests_expire_after_window(self, rate_limiter, clock):
+        """Requests older than one hour should stop counting against the limit."""
+        user_id = "user-expiring"
+
+        for _ in range(3):
+            rate_limiter.check_and_consume(user_id)
+        with pytest.raises(RateLimitExceeded):
+            rate_limiter.check_and_consume(user_id)
+
+        clock.tick(timedelta(hours=1, seconds=1))
+        info = rate_limiter.check_and_consume(user_id)
+
+        assert info.requests_remaining == 2
+
+    def test_tokens_refill_gradually(self, rate_limiter, clock):
+        """Tokens should refill proportionally to elapsed time (limit/hour)."""
+        user_id = "user-refill"
+        start = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+
+        for _ in range(3):
+            rate_limiter.check_and_consume(user_id)
+
+        # Limit 3/hour -> one token every 20 minutes
+        clock.tick(timedelta(minutes=20))
+        with patch("src.services.ai_service.datetime") as mock_datetime:
+            mock_datetime.now.return_value = start
+            info = rate_limiter.get_remaining(user_id)
+
+        assert info.requests_remaining == 1
+        # Two tokens missing -> bucket full again 40 minutes after "now"
+        assert info.reset_at == start + timedelta(minutes=40)
+
+    def test_refill_ignores_wall_clock_jumps(self, rate_limiter):
+        """Moving the system clock forward must not refill tokens."""
+        user_id = "user-clock-jump"
+
+        for _ in range(3):
+            rate_limiter.check_and_consume(user_id)
+
+        with patch("src.services.ai_service.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2099, 1, 1, tzinfo=timezone.utc)
+            with pytest.raises(RateLimitExceeded):
+                rate_limiter.check_and_consume(user_id)
+
+    def test_defaults_to_monotonic_clock(self):
+        """Without an injected clock the limiter should read time.monotonic."""
+        with patch("src.services.ai_service.time.monotonic", return_value=5.0) as monotonic:
+            InMemoryRateLimiter(limit_per_hour=3).get_remaining("user-default-clock")
+
+        monotonic.assert_called_once_with()
+
+    def test_concurrent_consumers_never_exceed_limit(self):
+        """Concurrent requests for the same user should consume exactly the limit."""
+        limiter = InMemoryRateLimiter(limit_per_hour=50)
+
+        def consume(_):
+            try:
+                limiter.check_and_consume("user-concurrent")
+                return True
+            except RateLimitExceeded:
+                return False
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(consume, range(200)))
+
+        assert sum(results) == 50
+
 
 # ============================================================
 # Tests for AI Explainer Service
@@ -297,11 +474,13 @@ class TestAIExplainerService:
         assert rate_info.requests_remaining == 9
 
     @pytest.mark.asyncio
-    async def test_explain_finding_rate_limited(self, sample_security_finding, mock_ai_client):
+    async def test_explain_finding_rate_limited(
+        self, sample_security_finding, sample_style_finding, mock_ai_client, clock
+    ):
         """Should raise when rate limit exceeded."""
         service = AIExplainerService(
             ai_client=mock_ai_client,
-            rate_limiter=InMemoryRateLimiter(limit_per_hour=1),
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=1, clock=clock),
         )
 
         # First request succeeds
@@ -310,13 +489,235 @@ class TestAIExplainerService:
             user_id="limited-user",
         )
 
-        # Second request should fail
+        # Second request (a different finding, not cached) should fail
         with pytest.raises(RateLimitExceeded):
             await service.explain_finding(
-                finding=sample_security_finding,
+                finding=sample_style_finding,
                 user_id="limited-user",
             )
 
+    @pytest.mark.asyncio
+    async def test_explain_finding_reuses_cached_explanation(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """Repeated findings should be served from cache without calling AI or the limiter."""
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=1),
+        )
+
+        first, _ = await service.explain_finding(sample_security_finding, user_id="user-a")
+        same_finding_other_line = sample_security_finding.model_copy(update={"line_number": 7})
+        second, rate_info = await service.explain_finding(same_finding_other_line, user_id="user-a")
+
+        assert second is first
+        assert mock_ai_client.generate_explanation.await_count == 1
+        assert rate_info.requests_remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_explanation_cache_keys_on_code(self, sample_security_finding, mock_ai_client):
+        """Different snippets or source context should not share an explanation."""
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+        other_snippet = sample_security_finding.model_copy(update={"code_snippet": "eval(x)"})
+
+        await service.explain_finding(sample_security_finding, user_id="user-a")
+        await service.explain_finding(other_snippet, user_id="user-a")
+        await service.explain_finding(
+            sample_security_finding, code_context="import os", user_id="user-a"
+        )
+
+        assert mock_ai_client.generate_explanation.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_explanation_cache_keys_on_message_and_severity(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """Findings whose prompt differs in message or severity should not share an explanation."""
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+        other_message = sample_security_finding.model_copy(update={"message": "eval() on input"})
+        other_severity = sample_security_finding.model_copy(update={"severity": Severity.HIGH})
+
+        for finding in (sample_security_finding, other_message, other_severity):
+            await service.explain_finding(finding, user_id="user-a")
+
+        assert mock_ai_client.generate_explanation.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_explanation_cache_is_bounded_lru(self, sample_security_finding, mock_ai_client):
+        """The cache should evict the least recently used explanation."""
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+            explanation_cache_size=1,
+        )
+        other_snippet = sample_security_finding.model_copy(update={"code_snippet": "eval(x)"})
+
+        await service.explain_finding(sample_security_finding, user_id="user-a")
+        await service.explain_finding(other_snippet, user_id="user-a")
+        await service.explain_finding(sample_security_finding, user_id="user-a")
+
+        assert mock_ai_client.generate_explanation.await_count == 3
+        assert len(service._explanation_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_findings_share_one_ai_call(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """Identical findings explained concurrently should wait on a single model call."""
+        response = mock_ai_client.generate_explanation.return_value
+
+        async def slow_generate(prompt):
+            await asyncio.sleep(0.05)
+            return response
+
+        mock_ai_client.generate_explanation.side_effect = slow_generate
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+
+        results = await asyncio.gather(
+            *(service.explain_finding(sample_security_finding, user_id="user-a") for _ in range(3))
+        )
+
+        assert mock_ai_client.generate_explanation.await_count == 1
+        assert results[1][0] is results[0][0] is results[2][0]
+        assert results[2][1].requests_remaining == 9
+        assert service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_inflight_failure_propagates_to_waiters(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """A failed in-flight call should raise for every caller waiting on it."""
+
+        async def failing_generate(prompt):
+            await asyncio.sleep(0.01)
+            raise AIClientError("boom")
+
+        mock_ai_client.generate_explanation.side_effect = failing_generate
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+
+        results = await asyncio.gather(
+            *(service.explain_finding(sample_security_finding, user_id="user-a") for _ in range(2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, AIExplanationError) for result in results)
+        assert mock_ai_client.generate_explanation.await_count == 1
+        assert service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_inflight_leader_cancellation_does_not_cancel_waiters(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """A joined waiter should still get an explanation when the leader is cancelled."""
+        response = mock_ai_client.generate_explanation.return_value
+        leader_started = asyncio.Event()
+
+        async def slow_generate(prompt):
+            leader_started.set()
+            await asyncio.sleep(0.05)
+            return response
+
+        mock_ai_client.generate_explanation.side_effect = slow_generate
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+
+        leader = asyncio.create_task(
+            service.explain_finding(sample_security_finding, user_id="user-a")
+        )
+        await leader_started.wait()
+        waiter = asyncio.create_task(
+            service.explain_finding(sample_security_finding, user_id="user-b")
+        )
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        explanation, _ = await waiter
+
+        assert explanation.model_used == response.model_name
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert mock_ai_client.generate_explanation.await_count == 2
+        assert service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_explain_findings_bounds_concurrency_and_keeps_order(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """explain_findings should respect max_concurrent and return results in input order."""
+        active = 0
+        peak = 0
+
+        async def tracked_generate(prompt):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            snippet = prompt.split("# Línea")[1].splitlines()[1]
+            return AIResponse(
+                content=json.dumps(
+                    {"explanation": f"Explicación para {snippet}", "suggested_fix": "fix()"}
+                ),
+                model_name="gemini",
+                tokens_used=10,
+                finish_reason="STOP",
+            )
+
+        mock_ai_client.generate_explanation.side_effect = tracked_generate
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+        findings = [
+            sample_security_finding.model_copy(update={"code_snippet": f"eval(x{i})"})
+            for i in range(5)
+        ]
+
+        results = await service.explain_findings(findings, user_id="user-a", max_concurrent=2)
+
+        assert peak == 2
+        assert [explanation.explanation for explanation, _ in results] == [
+            f"Explicación para eval(x{i})" for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_identical_responses_are_parsed_once(
+        self, sample_security_finding, mock_ai_client
+    ):
+        """The same model response for different findings should reuse the parsed result."""
+        service = AIExplainerService(
+            ai_client=mock_ai_client,
+            rate_limiter=InMemoryRateLimiter(limit_per_hour=10),
+        )
+        other_snippet = sample_security_finding.model_copy(update={"code_snippet": "eval(x)"})
+
+        with patch.object(service, "_parse_response", wraps=service._parse_response) as parse:
+            first, _ = await service.explain_finding(sample_security_finding, user_id="user-a")
+            second, _ = await service.explain_finding(other_snippet, user_id="user-a")
+
+            assert parse.call_count == 1
+            assert second is first
+
+            service.clear_caches()
+            await service.explain_finding(sample_security_finding, user_id="user-a")
+
+        assert parse.call_count == 2
+        assert mock_ai_client.generate_explanation.await_count == 3
+
     @pytest.mark.asyncio
     async def test_explain_finding_parses_json_response(
         self, sample_security_finding, mock_ai_client
@@ -376,6 +777,61 @@ class TestAIExplainerService:
 
         assert service.is_configured == mock_ai_client.is_configured
 
+    @pytest.mark.parametrize("loader", ["default", "stdlib", "simdjson"])
+    def test_parse_response_with_each_json_backend(self, mock_ai_client, monkeypatch, loader):
+        """Parsing should behave the same with simdjson, orjson and the stdlib fallback."""
+        if loader == "simdjson":
+            monkeypatch.setattr("src.services.ai_service.simdjson", pytest.importorskip("simdjson"))
+        else:
+            monkeypatch.setattr("src.services.ai_service.simdjson", None)
+        if loader == "stdlib":
+            monkeypatch.setattr("src.services.ai_service.json_loads", json.loads)
+        service = AIExplainerService(ai_client=mock_ai_client)
+        fenced = '```json\n{"explanation": "Explicación larga", "suggested_fix": "fix()"}\n```'
+
+        parsed = service._parse_response(fenced, "gemini", 10)
+        fallback = service._parse_response("texto plano sin JSON", "gemini", 10)
+
+        assert parsed.explanation == "Explicación larga"
+        assert parsed.suggested_fix == "fix()"
+        assert fallback.explanation == "texto plano sin JSON"
+
+    def test_simdjson_parser_is_reused_per_thread(self, monkeypatch):
+        """The optional simdjson backend keeps one reusable Parser per thread."""
+        monkeypatch.setattr("src.services.ai_service.simdjson", pytest.importorskip("simdjson"))
+        monkeypatch.setattr("src.services.ai_service._simdjson_local", threading.local())
+        content = '{"explanation": "ok", "references": ["CWE-94"], "extra": {"x": 1}}'
+
+        def load_twice():
+            first = _load_response_fields(content)
+            parser = ai_service._simdjson_local.parser
+            second = _load_response_fields(content)
+            assert ai_service._simdjson_local.parser is parser
+            assert first == second == {"explanation": "ok", "references": ["CWE-94"]}
+            return id(parser)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            parser_ids = {pool.submit(load_twice).result(), load_twice()}
+
+        assert len(parser_ids) == 2
+
+    def test_parse_response_reads_only_known_fields(self, mock_ai_client):
+        """Extra keys in the model response are ignored; references keep their order."""
+        service = AIExplainerService(ai_client=mock_ai_client)
+        content = json.dumps(
+            {
+                "explanation": "Explicación suficientemente larga",
+                "references": ["CWE-89", "OWASP A03:2021"],
+                "debug": {"trace": list(range(1000))},
+            }
+        )
+
+        parsed = service._parse_response(content, "gemini", 10)
+
+        assert parsed.references == ["CWE-89", "OWASP A03:2021"]
+        assert parsed.suggested_fix == "# Sin sugerencia disponible"
+        assert parsed.attack_example is None
+
 
 # ============================================================
 # Tests for AIExplanation Schema
@@ -400,7 +856,8 @@ class TestAIExplanationSchema:
 
         assert data["explanation"] == "Test explanation"
         assert data["tokens_used"] == 100
-        assert "generated_at" in data
+        assert data["generated_at"] == explanation.generated_at.isoformat()
+        assert data["generated_at"].endswith("+00:00")
 
     def test_from_dict_deserialization(self):
         """Should deserialize from JSONB dict."""
@@ -419,3 +876,33 @@ class TestAIExplanationSchema:
         assert explanation.explanation == "Test explanation with sufficient length for validation"
         assert explanation.model_used == "test-model"
         assert explanation.generated_at.year == 2024
+
+    def test_from_dict_accepts_z_suffix_without_mutating_input(self):
+        """Should parse 'Z' timestamps and leave the stored JSONB dict untouched."""
+        data = {
+            "explanation": "Test explanation with sufficient length for validation",
+            "suggested_fix": "# fix",
+            "model_used": "test-model",
+            "tokens_used": 50,
+            "generated_at": "2024-01-15T10:30:00Z",
+        }
+
+        explanation = AIExplanation.from_dict(data)
+
+        assert explanation.generated_at == datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        assert data["generated_at"] == "2024-01-15T10:30:00Z"
+
+    def test_to_dict_round_trip(self):
+        """to_dict output should be JSON-serializable and rebuild an equal explanation."""
+        explanation = AIExplanation(
+            explanation="Test explanation",
+            suggested_fix="# fixed",
+            references=["CWE-94"],
+            model_used="gemini-1.5-flash",
+            tokens_used=100,
+        )
+
+        data = json.loads(json.dumps(explanation.to_dict()))
+
+        assert isinstance(data["generated_at"], str)
+        assert AIExplanation.from_dict(data) == explanation
@@ -5,9 +5,10 @@ Tests cover:
 - Initialization
 - Severity mapping
 - Output parsing
-- Analysis execution
+- Analysis execution (in-process and subprocess fallback)
 """
 
+import asyncio
 import subprocess
 from unittest.mock import MagicMock, patch
 
@@ -17,6 +18,34 @@ from src.agents.analyzers.flake8_analyzer import Flake8Analyzer
 from src.schemas.finding import Severity
 
 
+@pytest.fixture(scope="module")
+def analyzer():
+    """Shared Flake8Analyzer (read-only: tests never mutate it)."""
+    return Flake8Analyzer()
+
+
+@pytest.fixture
+def mock_subprocess_run(monkeypatch):
+    """Replace subprocess.run with a MagicMock for the duration of one test."""
+    mock = MagicMock()
+    monkeypatch.setattr(subprocess, "run", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_subprocess_popen(monkeypatch):
+    """Replace subprocess.Popen with a MagicMock usable as a context manager."""
+    mock = MagicMock()
+    monkeypatch.setattr(subprocess, "Popen", mock)
+    return mock
+
+
+@pytest.fixture
+def subprocess_backend(monkeypatch):
+    """Force the flake8 subprocess fallback used when pycodestyle/pyflakes are missing."""
+    monkeypatch.setattr("src.agents.analyzers.flake8_analyzer.pycodestyle", None)
+
+
 class TestFlake8AnalyzerInitialization:
     """Tests for Flake8Analyzer initialization."""
 
@@ -36,54 +65,35 @@ class TestFlake8AnalyzerInitialization:
 class TestFlake8AnalyzerMapSeverity:
     """Tests for severity mapping."""
 
-    def test_map_severity_fatal_returns_high(self):
-        """Test that 'F' (pyflakes) errors map to HIGH severity."""
-        result = Flake8Analyzer._map_severity("F401")
-        assert result == Severity.HIGH
-
-    def test_map_severity_error_returns_medium(self):
-        """Test that 'E' (error) maps to MEDIUM severity."""
-        result = Flake8Analyzer._map_severity("E501")
-        assert result == Severity.MEDIUM
-
-    def test_map_severity_complexity_returns_medium(self):
-        """Test that 'C' (complexity) maps to MEDIUM severity."""
-        result = Flake8Analyzer._map_severity("C901")
-        assert result == Severity.MEDIUM
-
-    def test_map_severity_warning_returns_low(self):
-        """Test that 'W' (warning) maps to LOW severity."""
-        result = Flake8Analyzer._map_severity("W291")
-        assert result == Severity.LOW
-
-    def test_map_severity_naming_returns_low(self):
-        """Test that 'N' (naming) maps to LOW severity."""
-        result = Flake8Analyzer._map_severity("N801")
-        assert result == Severity.LOW
-
-    def test_map_severity_unknown_returns_low(self):
-        """Test that unknown types default to LOW severity."""
-        assert Flake8Analyzer._map_severity("X999") == Severity.LOW
-        assert Flake8Analyzer._map_severity("") == Severity.LOW
-
-    def test_map_severity_lowercase_works(self):
-        """Test that lowercase prefixes work."""
-        assert Flake8Analyzer._map_severity("f401") == Severity.HIGH
-        assert Flake8Analyzer._map_severity("e501") == Severity.MEDIUM
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            ("F401", Severity.HIGH),  # pyflakes
+            ("E501", Severity.MEDIUM),  # error
+            ("C901", Severity.MEDIUM),  # complexity
+            ("W291", Severity.LOW),  # warning
+            ("N801", Severity.LOW),  # naming
+            ("X999", Severity.LOW),  # unknown prefix
+            ("", Severity.LOW),  # empty code
+            ("f401", Severity.HIGH),  # lowercase prefix
+            ("e501", Severity.MEDIUM),
+        ],
+    )
+    def test_map_severity(self, code, expected):
+        """Test that each flake8 code prefix maps to its severity."""
+        assert Flake8Analyzer._map_severity(code) == expected
 
 
 class TestFlake8AnalyzerParseOutput:
     """Tests for output parsing."""
 
-    def test_parse_output_empty_returns_empty_list(self):
+    def test_parse_output_empty_returns_empty_list(self, analyzer):
         """Test parsing empty output."""
-        analyzer = Flake8Analyzer()
         result = analyzer._parse_output("", "x = 1", "StyleAgent")
         assert result == []
 
-    def test_parse_output_valid_line(self):
+    def test_parse_output_valid_line(self, analyzer):
         """Test parsing valid flake8 output line."""
-        analyzer = Flake8Analyzer()
         code_content = "x = 1\n"
         # Flake8 format: {row}:{col}:{code}:{text}
         output = "1:5:E501:line too long (120 > 79 characters)"
@@ -93,9 +103,8 @@ class TestFlake8AnalyzerParseOutput:
         assert result[0].severity == Severity.MEDIUM  # E -> MEDIUM
         assert "line too long" in result[0].message
 
-    def test_parse_output_multiple_issues(self):
+    def test_parse_output_multiple_issues(self, analyzer):
         """Test parsing multiple issues."""
-        analyzer = Flake8Analyzer()
         code_content = "import os\nx = 1\ny = 2\n"
         output = """1:1:F401:'os' imported but unused
 2:5:E501:line too long
@@ -106,17 +115,15 @@ class TestFlake8AnalyzerParseOutput:
         assert result[1].severity == Severity.MEDIUM  # E -> MEDIUM
         assert result[2].severity == Severity.LOW  # W -> LOW
 
-    def test_parse_output_preserves_line_numbers(self):
+    def test_parse_output_preserves_line_numbers(self, analyzer):
         """Test that line numbers are correctly preserved."""
-        analyzer = Flake8Analyzer()
         code_content = "\n" * 50 + "x = 1\n"
         output = "42:1:W291:trailing whitespace"
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert result[0].line_number == 42
 
-    def test_parse_output_invalid_format_skipped(self):
+    def test_parse_output_invalid_format_skipped(self, analyzer):
         """Test that invalid format lines are skipped."""
-        analyzer = Flake8Analyzer()
         code_content = "x = 1\ny = 2\n"
         output = """1:1:E501:line too long
 not a valid line
@@ -124,251 +131,423 @@ not a valid line
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert len(result) == 2
 
-    def test_parse_output_extracts_code_snippet(self):
+    def test_parse_output_keeps_colons_in_message(self, analyzer):
+        """Test that colons inside the message text are preserved."""
+        code_content = "import os\n"
+        output = "1:1:F401:'os' imported but unused: see docs"
+        result = analyzer._parse_output(output, code_content, "StyleAgent")
+        assert len(result) == 1
+        assert result[0].rule_id == "FLAKE8_F401"
+        assert result[0].message == "'os' imported but unused: see docs"
+
+    def test_parse_output_skips_non_numeric_row(self, analyzer):
+        """Test that a line whose row is not a number is skipped."""
+        result = analyzer._parse_output("x:1:E501:line too long", "x = 1\n", "StyleAgent")
+        assert result == []
+
+    def test_parse_output_reuses_given_code_lines(self, analyzer):
+        """Test that precomputed code lines are used instead of re-splitting."""
+        code_lines = ["first_line = 1", "second_line = 2"]
+        result = analyzer._parse_output(
+            "2:1:E501:line too long", "ignored", "StyleAgent", code_lines=code_lines
+        )
+        assert result[0].code_snippet == "second_line = 2"
+
+    def test_iter_parse_is_lazy(self, analyzer):
+        """Test that _iter_parse consumes output lines only as findings are requested."""
+        output_lines = iter(["1:1:F401:'os' imported but unused", "2:1:E501:line too long"])
+
+        findings = analyzer._iter_parse(output_lines, ["import os", "x = 1"], "StyleAgent")
+
+        assert next(findings).rule_id == "FLAKE8_F401"
+        assert next(output_lines) == "2:1:E501:line too long"
+
+    def test_parse_output_extracts_code_snippet(self, analyzer):
         """Test that code snippet is extracted from code content."""
-        analyzer = Flake8Analyzer()
         code_content = "first_line = 1\nsecond_line = 2\nthird_line = 3\n"
         output = "2:1:E501:line too long in this file"  # was "2:1:E501:test"
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert result[0].code_snippet == "second_line = 2"
 
-    def test_parse_output_sets_agent_name(self):
+    def test_parse_output_sets_agent_name(self, analyzer):
         """Test that agent name is set correctly."""
-        analyzer = Flake8Analyzer()
         code_content = "x = 1\n"
         output = "1:1:E501:line too long error message"  # was "1:1:E501:test"
         result = analyzer._parse_output(output, code_content, "TestAgent")
         assert result[0].agent_name == "TestAgent"
 
-    def test_parse_output_sets_rule_id(self):
+    def test_parse_output_sets_rule_id(self, analyzer):
         """Test that rule_id includes FLAKE8 prefix."""
-        analyzer = Flake8Analyzer()
         code_content = "x = 1\n"
         output = "1:1:E501:line too long error message"  # was "1:1:E501:test"
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert result[0].rule_id == "FLAKE8_E501"
 
-    def test_parse_output_sets_issue_type(self):
+    def test_parse_output_sets_issue_type(self, analyzer):
         """Test that issue_type is set to style/pep8."""
-        analyzer = Flake8Analyzer()
         code_content = "x = 1\n"
         output = "1:1:E501:line too long error message"  # was "1:1:E501:test"
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert result[0].issue_type == "style/pep8"
 
 
+@pytest.mark.usefixtures("subprocess_backend")
 class TestFlake8AnalyzerAnalyze:
     """Tests for analyze method."""
 
-    def test_analyze_with_no_issues(self):
+    def test_analyze_with_no_issues(self, analyzer, mock_subprocess_run):
         """Test analysis of clean code."""
-        analyzer = Flake8Analyzer()
         code = "x = 1\n"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            result = analyzer.analyze(code)
-            assert result == []
+        mock_subprocess_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
+        result = analyzer.analyze(code)
+        assert result == []
 
-    def test_analyze_returns_findings(self):
+    def test_analyze_returns_findings(self, analyzer, mock_subprocess_run):
         """Test that analyze returns findings for code with issues."""
-        analyzer = Flake8Analyzer()
         code = "import os\nx = 1\n"
 
         flake8_output = "1:1:F401:'os' imported but unused"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
-            result = analyzer.analyze(code)
-            assert len(result) == 1
-            assert "'os' imported but unused" in result[0].message
+        mock_subprocess_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
+        result = analyzer.analyze(code)
+        assert len(result) == 1
+        assert "'os' imported but unused" in result[0].message
 
-    def test_analyze_handles_file_not_found(self):
+    def test_analyze_handles_file_not_found(self, analyzer, mock_subprocess_run):
         """Test that FileNotFoundError (flake8 not installed) is handled."""
-        analyzer = Flake8Analyzer()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = FileNotFoundError("flake8 not found")
-            result = analyzer.analyze("some code")
-            assert result == []
+        mock_subprocess_run.side_effect = FileNotFoundError("flake8 not found")
+        result = analyzer.analyze("some code")
+        assert result == []
 
-    def test_analyze_handles_generic_exception(self):
+    def test_analyze_handles_generic_exception(self, analyzer, mock_subprocess_run):
         """Test that generic exceptions are handled gracefully."""
-        analyzer = Flake8Analyzer()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = Exception("Unexpected error")
-            result = analyzer.analyze("some code")
-            assert result == []
+        mock_subprocess_run.side_effect = Exception("Unexpected error")
+        result = analyzer.analyze("some code")
+        assert result == []
 
-    def test_analyze_cleans_up_temp_file(self):
-        """Test that temporary file is cleaned up after analysis."""
-        analyzer = Flake8Analyzer()
+    def test_analyze_pipes_code_through_stdin(self, analyzer, mock_subprocess_run):
+        """Test that the code is sent via stdin and no temporary file is created."""
+
+        mock_subprocess_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
+        with patch("tempfile.NamedTemporaryFile") as mock_tmp:
+            analyzer.analyze("x = 1")
+            mock_tmp.assert_not_called()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            with patch("os.path.exists", return_value=True):
-                with patch("os.remove") as mock_remove:
-                    analyzer.analyze("x = 1")
-                    mock_remove.assert_called()
+        cmd = mock_subprocess_run.call_args.args[0]
+        assert cmd[-1] == "-"
+        assert mock_subprocess_run.call_args.kwargs["input"] == "x = 1"
 
-    def test_analyze_with_agent_name(self):
+    def test_analyze_with_agent_name(self, analyzer, mock_subprocess_run):
         """Test analyze with custom agent name."""
-        analyzer = Flake8Analyzer()
         code = "import os\n"
 
         flake8_output = "1:1:F401:unused"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
-            result = analyzer.analyze(code, agent_name="CustomAgent")
-            assert len(result) == 1
-            assert result[0].agent_name == "CustomAgent"
+        mock_subprocess_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
+        result = analyzer.analyze(code, agent_name="CustomAgent")
+        assert len(result) == 1
+        assert result[0].agent_name == "CustomAgent"
 
-    def test_analyze_default_agent_name(self):
+    def test_analyze_default_agent_name(self, analyzer, mock_subprocess_run):
         """Test analyze uses default agent name."""
-        analyzer = Flake8Analyzer()
         code = "import os\n"
 
         flake8_output = "1:1:F401:unused"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
-            result = analyzer.analyze(code)
-            assert len(result) == 1
-            assert result[0].agent_name == "StyleAgent"
+        mock_subprocess_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
+        result = analyzer.analyze(code)
+        assert len(result) == 1
+        assert result[0].agent_name == "StyleAgent"
 
 
-class TestFlake8AnalyzerIssueTypes:
-    """Tests for issue type categorization by error code."""
+@pytest.mark.usefixtures("subprocess_backend")
+class TestFlake8AnalyzerBatch:
+    """Tests for analyze_batch with the subprocess backend."""
 
-    def test_e1_indentation_error(self):
-        """Test E1xx indentation errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "x = 1\n"
-        output = "1:1:E101:indentation contains mixed spaces and tabs"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
-        assert result[0].severity == Severity.MEDIUM
+    def test_analyze_batch_runs_single_subprocess(self, analyzer, mock_subprocess_popen):
+        """Test that all snippets are analyzed with one streamed flake8 invocation."""
+        codes = ["import os\n", "x = 1\n", "import sys\n"]
+        flake8_output = [
+            "0.py:1:1:F401:'os' imported but unused\n",
+            "./2.py:1:1:F401:'sys' imported but unused\n",
+        ]
 
-    def test_e2_whitespace_error(self):
-        """Test E2xx whitespace errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "x=1\n"
-        output = "1:2:E225:missing whitespace around operator"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
-        assert result[0].severity == Severity.MEDIUM
+        mock_subprocess_popen.return_value.__enter__.return_value.stdout = iter(flake8_output)
+        result = analyzer.analyze_batch(codes, agent_name="CustomAgent")
 
-    def test_e3_blank_line_error(self):
-        """Test E3xx blank line errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "def foo():\n    pass\n"
-        output = "1:1:E302:expected 2 blank lines, found 1"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
-        assert result[0].severity == Severity.MEDIUM
+        mock_subprocess_popen.assert_called_once()
+        assert mock_subprocess_popen.call_args.args[0][-3:] == ["0.py", "1.py", "2.py"]
+        assert [len(findings) for findings in result] == [1, 0, 1]
+        assert "'sys'" in result[2][0].message
+        assert result[2][0].code_snippet == "import sys"
+        assert result[0][0].agent_name == "CustomAgent"
 
-    def test_e5_line_length_error(self):
-        """Test E5xx line length errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "x = 1\n"
-        output = "1:80:E501:line too long (120 > 79 characters)"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
-        assert result[0].severity == Severity.MEDIUM
+    def test_analyze_batch_empty_list(self, analyzer, mock_subprocess_popen):
+        """Test that an empty batch does not spawn flake8."""
+        assert analyzer.analyze_batch([]) == []
+        mock_subprocess_popen.assert_not_called()
 
-    def test_e7_statement_error(self):
-        """Test E7xx statement errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "if x == None: pass\n"
-        output = "1:6:E711:comparison to None"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
-        assert result[0].severity == Severity.MEDIUM
+    def test_analyze_batch_handles_file_not_found(self, analyzer, mock_subprocess_popen):
+        """Test that a missing flake8 yields empty results for every snippet."""
+        mock_subprocess_popen.side_effect = FileNotFoundError("flake8 not found")
+        assert analyzer.analyze_batch(["x = 1\n", "y = 2\n"]) == [[], []]
 
-    def test_f4_import_error(self):
-        """Test F4xx import errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "import os\n"
-        output = "1:1:F401:'os' imported but unused"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
-        assert result[0].severity == Severity.HIGH
+    def test_analyze_batch_matches_single_analysis(self, analyzer):
+        """Test that a real batched run reports the same issues as analyze per snippet."""
+        codes = ["import os\n", "x = 1\n", "def f():\n    return  1\n"]
 
-    def test_f8_name_error(self):
-        """Test F8xx name errors are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "print(foo)\n"
-        output = "1:7:F821:undefined name 'foo'"
-        result = analyzer._parse_output(output, code, "StyleAgent")
-        assert len(result) == 1
+        batched = analyzer.analyze_batch(codes)
+        single = [analyzer.analyze(code) for code in codes]
+
+        assert [[f.rule_id for f in findings] for findings in batched] == [
+            [f.rule_id for f in findings] for findings in single
+        ]
+
+
+class TestFlake8AnalyzerColumnar:
+    """Tests for analyze_to_columnar."""
+
+    def test_columnar_matches_row_analysis(self, analyzer):
+        """Test that each columnar row equals the Finding from analyze."""
+        code = "import os\ndef f():\n    return  1\n"
+
+        rows = analyzer.analyze(code, agent_name="CustomAgent")
+        soa = analyzer.analyze_to_columnar(code, agent_name="CustomAgent")
+
+        assert len(soa) == len(rows) > 0
+        assert [f.model_dump(exclude={"detected_at"}) for f in soa] == [
+            f.model_dump(exclude={"detected_at"}) for f in rows
+        ]
+        assert soa.line_numbers.typecode == "I"
+
+    def test_columnar_interns_repeated_strings(self, analyzer):
+        """Test that repeated rule ids and agent names share one string object."""
+        soa = analyzer.analyze_to_columnar("import os\nimport sys\n")
+
+        assert soa.rule_ids == ["FLAKE8_F401", "FLAKE8_F401"]
+        assert soa.rule_ids[0] is soa.rule_ids[1]
+        assert soa.agent_names[0] is soa.agent_names[1]
+
+    @pytest.mark.usefixtures("subprocess_backend")
+    def test_columnar_handles_file_not_found(self, analyzer, mock_subprocess_run):
+        """Test that a missing flake8 yields an empty result."""
+        mock_subprocess_run.side_effect = FileNotFoundError("flake8 not found")
+        assert len(analyzer.analyze_to_columnar("x = 1\n")) == 0
+
+
+class TestFlake8AnalyzerAsync:
+    """Tests for analyze_async."""
+
+    @pytest.mark.asyncio
+    async def test_analyze_async_subprocess_matches_sync(self, analyzer):
+        """Test that the asyncio subprocess path reports the same rules as analyze."""
+        subprocess_analyzer = Flake8Analyzer(use_subprocess=True)
+        codes = ["import os\n", "def f():\n    return  1\n"]
+
+        results = await asyncio.gather(*(subprocess_analyzer.analyze_async(code) for code in codes))
+
+        assert [[f.rule_id for f in findings] for findings in results] == [
+            [f.rule_id for f in analyzer.analyze(code)] for code in codes
+        ]
+
+    @pytest.mark.asyncio
+    async def test_analyze_async_does_not_call_blocking_subprocess(
+        self, analyzer, mock_subprocess_run
+    ):
+        """Test that the async path never uses subprocess.run."""
+        in_process = await analyzer.analyze_async("import os\n", "CustomAgent")
+        via_subprocess = await Flake8Analyzer(use_subprocess=True).analyze_async("x = 1\n")
+        mock_subprocess_run.assert_not_called()
+
+        assert in_process[0].agent_name == "CustomAgent"
+        assert via_subprocess == []
+
+    @pytest.mark.asyncio
+    async def test_analyze_async_handles_file_not_found(self):
+        """Test that a missing flake8 executable yields no findings."""
+        analyzer = Flake8Analyzer(use_subprocess=True)
+
+        with patch(
+            "asyncio.create_subprocess_exec", side_effect=FileNotFoundError("flake8 not found")
+        ):
+            assert await analyzer.analyze_async("import os\n") == []
+
+
+class TestFlake8AnalyzerInProcess:
+    """Tests for the in-process pycodestyle/pyflakes backend."""
+
+    def test_analyze_does_not_spawn_subprocess(self, analyzer, mock_subprocess_run):
+        """Test that default flake8 rules run without launching flake8."""
+        code = "import os\nx=1\n"
+
+        result = analyzer.analyze(code)
+
+        mock_subprocess_run.assert_not_called()
+        assert [(f.line_number, f.rule_id) for f in result] == [
+            (1, "FLAKE8_F401"),
+            (2, "FLAKE8_E225"),
+        ]
+        assert result[0].message == "'os' imported but unused"
         assert result[0].severity == Severity.HIGH
 
-    def test_w_warning(self):
-        """Test W warnings are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "x = 1  \n"
-        output = "1:6:W291:trailing whitespace"
-        result = analyzer._parse_output(output, code, "StyleAgent")
+    def test_analyze_respects_default_ignore_list(self, analyzer):
+        """Test that rules flake8 ignores by default (e.g. E226) are not reported."""
+        result = analyzer.analyze("x = 1*2\n")
+        assert result == []
+
+    def test_analyze_reports_syntax_error_as_e999(self, analyzer):
+        """Test that invalid code yields a single E999 finding like flake8."""
+        result = analyzer.analyze("def broken(\n")
         assert len(result) == 1
-        assert result[0].severity == Severity.LOW
+        assert result[0].rule_id == "FLAKE8_E999"
+        assert result[0].message.startswith("SyntaxError:")
+
+    def test_use_subprocess_flag_forces_subprocess(self, mock_subprocess_run):
+        """Test that use_subprocess=True keeps the flake8 subprocess path."""
+        analyzer = Flake8Analyzer(use_subprocess=True)
+
+        mock_subprocess_run.return_value = MagicMock(
+            stdout="1:1:F401:unused", stderr="", returncode=1
+        )
+        result = analyzer.analyze("import os\n")
+        mock_subprocess_run.assert_called_once()
+
+        assert result[0].rule_id == "FLAKE8_F401"
+
+    def test_subprocess_stdin_matches_in_process(self, analyzer):
+        """Test that a real flake8 run over stdin reports the same rules as in-process."""
+        code = "import os\ndef f():\n    return  1\n"
+
+        via_stdin = Flake8Analyzer(use_subprocess=True).analyze(code)
+        in_process = analyzer.analyze(code)
+
+        assert [f.rule_id for f in via_stdin] == [f.rule_id for f in in_process]
+        assert [f.line_number for f in via_stdin] == [f.line_number for f in in_process]
+
+    @pytest.mark.parametrize(
+        "code, expected_rules",
+        [
+            pytest.param(
+                'x = 1\ny = "' + "a" * 85 + '"\nz = [1 ,2]\nw = "' + "b" * 100 + '"\n',
+                ["FLAKE8_E231", "FLAKE8_E501"],
+                id="project-options",
+            ),
+            pytest.param(
+                "import os  # noqa\nimport sys  # noqa: F401\nx=1  # noqa\n"
+                "l = lambda: 0  # noqa: E731\nimport re  # noqa:E501\n",
+                ["FLAKE8_E741", "FLAKE8_F401", "FLAKE8_E402"],
+                id="noqa",
+            ),
+            pytest.param("# flake8: noqa\nimport os\n", [], id="file-noqa"),
+            pytest.param("x = 1\n  y = 2\n", ["FLAKE8_E999"], id="indentation-error"),
+        ],
+    )
+    def test_all_backends_report_identical_findings(self, analyzer, code, expected_rules):
+        """Test that in-process, stdin and batch backends agree (options, noqa, E999 text)."""
+        subprocess_analyzer = Flake8Analyzer(use_subprocess=True)
+
+        def summary(findings):
+            return [(f.line_number, f.rule_id, f.message, f.severity) for f in findings]
+
+        in_process = summary(analyzer.analyze(code))
+
+        assert in_process == summary(subprocess_analyzer.analyze(code))
+        assert in_process == summary(subprocess_analyzer.analyze_batch([code])[0])
+        assert [rule_id for _, rule_id, _, _ in in_process] == expected_rules
+
+    def test_style_guide_is_built_once(self, analyzer):
+        """Test that pycodestyle options are built at construction, not per call."""
+
+        with patch("pycodestyle.StyleGuide") as mock_guide:
+            analyzer.analyze("x = 1\n")
+            analyzer.analyze("y = 2\n")
+            mock_guide.assert_not_called()
+
+    def test_analyze_batch_does_not_spawn_subprocess(self, analyzer, mock_subprocess_run):
+        """Test that analyze_batch analyzes each snippet in-process."""
+
+        result = analyzer.analyze_batch(["import os\n", "x = 1\n"])
+        mock_subprocess_run.assert_not_called()
+
+        assert [[f.rule_id for f in findings] for findings in result] == [["FLAKE8_F401"], []]
+
+    def test_run_in_process_output_is_sorted(self, analyzer):
+        """Test that pycodestyle and pyflakes results are merged by position."""
+        output = analyzer._run_in_process("import os\ny = undefined  \n")
+        assert output.splitlines() == [
+            "1:1:F401:'os' imported but unused",
+            "2:5:F821:undefined name 'undefined'",
+            "2:14:W291:trailing whitespace",
+        ]
 
-    def test_c9_complexity(self):
-        """Test C9xx complexity warnings are parsed."""
-        analyzer = Flake8Analyzer()
-        code = "def complex(): pass\n"
-        output = "1:1:C901:'complex' is too complex (15)"
+
+class TestFlake8AnalyzerIssueTypes:
+    """Tests for issue type categorization by error code."""
+
+    @pytest.mark.parametrize(
+        ("code", "output", "expected"),
+        [
+            ("x = 1\n", "1:1:E101:indentation contains mixed spaces and tabs", Severity.MEDIUM),
+            ("x=1\n", "1:2:E225:missing whitespace around operator", Severity.MEDIUM),
+            ("def foo():\n    pass\n", "1:1:E302:expected 2 blank lines, found 1", Severity.MEDIUM),
+            ("x = 1\n", "1:80:E501:line too long (120 > 79 characters)", Severity.MEDIUM),
+            ("if x == None: pass\n", "1:6:E711:comparison to None", Severity.MEDIUM),
+            ("import os\n", "1:1:F401:'os' imported but unused", Severity.HIGH),
+            ("print(foo)\n", "1:7:F821:undefined name 'foo'", Severity.HIGH),
+            ("x = 1  \n", "1:6:W291:trailing whitespace", Severity.LOW),
+            ("def complex(): pass\n", "1:1:C901:'complex' is too complex (15)", Severity.MEDIUM),
+        ],
+        ids=["E1", "E2", "E3", "E5", "E7", "F4", "F8", "W", "C9"],
+    )
+    def test_issue_type_is_parsed(self, analyzer, code, output, expected):
+        """Test that each flake8 error family is parsed with its severity."""
         result = analyzer._parse_output(output, code, "StyleAgent")
         assert len(result) == 1
-        assert result[0].severity == Severity.MEDIUM
+        assert result[0].severity == expected
 
 
+@pytest.mark.usefixtures("subprocess_backend")
 class TestFlake8AnalyzerEdgeCases:
     """Tests for edge cases and error handling."""
 
-    def test_analyze_empty_code(self):
+    def test_analyze_empty_code(self, analyzer, mock_subprocess_run):
         """Test analyzing empty code."""
-        analyzer = Flake8Analyzer()
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            result = analyzer.analyze("")
-            assert result == []
+        mock_subprocess_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
+        result = analyzer.analyze("")
+        assert result == []
 
-    def test_parse_output_with_special_characters(self):
+    def test_parse_output_with_special_characters(self, analyzer):
         """Test parsing output with special characters in message."""
-        analyzer = Flake8Analyzer()
         code = "x = 1\n"
         output = "1:1:E501:line too long (contains 'quotes' and \"double quotes\")"
         result = analyzer._parse_output(output, code, "StyleAgent")
         assert len(result) == 1
 
-    def test_analyze_unicode_code(self):
+    def test_analyze_unicode_code(self, analyzer, mock_subprocess_run):
         """Test analyzing code with unicode characters."""
-        analyzer = Flake8Analyzer()
         code = '# -*- coding: utf-8 -*-\n"""Módulo con caracteres especiales: áéíóú."""\n'
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            result = analyzer.analyze(code)
-            assert isinstance(result, list)
+        mock_subprocess_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
+        result = analyzer.analyze(code)
+        assert isinstance(result, list)
 
-    def test_finding_has_all_required_fields(self):
+    def test_finding_has_all_required_fields(self, analyzer, mock_subprocess_run):
         """Test that findings have all required fields."""
-        analyzer = Flake8Analyzer()
         code = "import os\n"
 
         flake8_output = "1:1:F401:'os' imported but unused"
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
-            result = analyzer.analyze(code)
-            assert len(result) == 1
-            finding = result[0]
-
-            # Check all Finding fields
-            assert finding.severity is not None
-            assert finding.issue_type is not None
-            assert finding.message is not None
-            assert finding.line_number is not None
-            assert finding.agent_name is not None
-            assert finding.rule_id is not None
+        mock_subprocess_run.return_value = MagicMock(stdout=flake8_output, stderr="", returncode=1)
+        result = analyzer.analyze(code)
+        assert len(result) == 1
+        finding = result[0]
+
+        # Check all Finding fields
+        assert finding.severity is not None
+        assert finding.issue_type is not None
+        assert finding.message is not None
+        assert finding.line_number is not None
+        assert finding.agent_name is not None
+        assert finding.rule_id is not None
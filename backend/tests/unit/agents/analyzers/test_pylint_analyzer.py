@@ -8,6 +8,7 @@ Tests cover:
 - Analysis execution
 """
 
+import io
 import subprocess
 from unittest.mock import MagicMock, patch
 
@@ -16,6 +17,45 @@ import pytest
 from src.agents.analyzers.pylint_analyzer import PylintAnalyzer
 from src.schemas.finding import Severity
 
+# Pylint format: {line}:{column}:{msg_id}:{msg}
+PYLINT_OUTPUT_SINGLE = "1:0:C0114:Missing module docstring"
+PYLINT_OUTPUT_MULTI = "\n".join(
+    (
+        "1:0:E0001:Syntax error",
+        "2:0:W0612:Unused variable 'y'",
+        "3:0:C0103:Invalid name 'z'",
+    )
+)
+SINGLE_LINE_CODE = "x = 1\n"
+THREE_LINE_CODE = "x = 1\ny = 2\nz = 3\n"
+FIFTY_BLANK_LINES_CODE = "\n" * 50 + "x = 1\n"
+NAMED_LINES_CODE = "first_line = 1\nsecond_line = 2\nthird_line = 3\n"
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """Shared PylintAnalyzer (read-only: tests never mutate it)."""
+    return PylintAnalyzer()
+
+
+def completed_process(stdout: str = "", returncode: int = 0) -> MagicMock:
+    """Result of subprocess.run as read by PylintAnalyzer."""
+    return MagicMock(stdout=stdout, stderr="", returncode=returncode)
+
+
+@pytest.fixture
+def mock_subprocess_run(monkeypatch):
+    """Replace subprocess.run for one test; returns clean pylint output by default."""
+    mock = MagicMock(return_value=completed_process())
+    monkeypatch.setattr(subprocess, "run", mock)
+    return mock
+
+
+@pytest.fixture(scope="module")
+def single_issue_findings(analyzer):
+    """PYLINT_OUTPUT_SINGLE parsed once for the module (Findings are frozen)."""
+    return tuple(analyzer._parse_output(PYLINT_OUTPUT_SINGLE, SINGLE_LINE_CODE, "StyleAgent"))
+
 
 class TestPylintAnalyzerInitialization:
     """Tests for PylintAnalyzer initialization."""
@@ -36,246 +76,174 @@ class TestPylintAnalyzerInitialization:
 class TestPylintAnalyzerMapSeverity:
     """Tests for severity mapping."""
 
-    def test_map_severity_error_returns_high(self):
-        """Test that 'E' (error) maps to HIGH severity."""
-        result = PylintAnalyzer._map_severity("E0001")
-        assert result == Severity.HIGH
-
-    def test_map_severity_fatal_returns_high(self):
-        """Test that 'F' (fatal) maps to HIGH severity."""
-        result = PylintAnalyzer._map_severity("F0001")
-        assert result == Severity.HIGH
-
-    def test_map_severity_warning_returns_medium(self):
-        """Test that 'W' (warning) maps to MEDIUM severity."""
-        result = PylintAnalyzer._map_severity("W0612")
-        assert result == Severity.MEDIUM
-
-    def test_map_severity_convention_returns_low(self):
-        """Test that 'C' (convention) maps to LOW severity."""
-        result = PylintAnalyzer._map_severity("C0114")
-        assert result == Severity.LOW
-
-    def test_map_severity_refactor_returns_low(self):
-        """Test that 'R' (refactor) maps to LOW severity."""
-        result = PylintAnalyzer._map_severity("R0903")
-        assert result == Severity.LOW
-
-    def test_map_severity_information_returns_low(self):
-        """Test that 'I' (information) maps to LOW severity."""
-        result = PylintAnalyzer._map_severity("I0001")
-        assert result == Severity.LOW
-
-    def test_map_severity_unknown_returns_low(self):
-        """Test that unknown types default to LOW severity."""
-        assert PylintAnalyzer._map_severity("X9999") == Severity.LOW
-        assert PylintAnalyzer._map_severity("") == Severity.LOW
-
-    def test_map_severity_lowercase_works(self):
-        """Test that lowercase prefixes work."""
-        assert PylintAnalyzer._map_severity("e0001") == Severity.HIGH
-        assert PylintAnalyzer._map_severity("w0001") == Severity.MEDIUM
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            ("E0001", Severity.HIGH),  # error
+            ("F0001", Severity.HIGH),  # fatal
+            ("W0612", Severity.MEDIUM),  # warning
+            ("C0114", Severity.LOW),  # convention
+            ("R0903", Severity.LOW),  # refactor
+            ("I0001", Severity.LOW),  # information
+            ("X9999", Severity.LOW),  # unknown type
+            ("", Severity.LOW),  # empty code
+            ("e0001", Severity.HIGH),  # lowercase prefix
+            ("w0001", Severity.MEDIUM),
+        ],
+    )
+    def test_map_severity(self, code, expected):
+        """Test that each pylint message type maps to its severity."""
+        assert PylintAnalyzer._map_severity(code) == expected
 
 
 class TestPylintAnalyzerParseOutput:
     """Tests for output parsing."""
 
-    def test_parse_output_empty_returns_empty_list(self):
+    def test_parse_output_empty_returns_empty_list(self, analyzer):
         """Test parsing empty output."""
-        analyzer = PylintAnalyzer()
         result = analyzer._parse_output("", "x = 1", "StyleAgent")
         assert result == []
 
-    def test_parse_output_valid_format(self):
+    def test_parse_output_valid_format(self, single_issue_findings):
         """Test parsing valid pylint text output."""
-        analyzer = PylintAnalyzer()
-        code_content = "x = 1\ny = 2\n"
-        # Pylint format: {line}:{column}:{msg_id}:{msg}
-        output = "1:0:C0114:Missing module docstring"
-        result = analyzer._parse_output(output, code_content, "StyleAgent")
+        result = single_issue_findings
         assert len(result) == 1
         assert result[0].line_number == 1
         assert result[0].severity == Severity.LOW
         assert "Missing module docstring" in result[0].message
 
-    def test_parse_output_multiple_issues(self):
+    def test_parse_output_multiple_issues(self, analyzer):
         """Test parsing multiple issues."""
-        analyzer = PylintAnalyzer()
-        code_content = "x = 1\ny = 2\nz = 3\n"
-        output = """1:0:E0001:Syntax error
-2:0:W0612:Unused variable 'y'
-3:0:C0103:Invalid name 'z'"""
-        result = analyzer._parse_output(output, code_content, "StyleAgent")
+        result = analyzer._parse_output(PYLINT_OUTPUT_MULTI, THREE_LINE_CODE, "StyleAgent")
         assert len(result) == 3
         assert result[0].severity == Severity.HIGH  # E -> HIGH
         assert result[1].severity == Severity.MEDIUM  # W -> MEDIUM
         assert result[2].severity == Severity.LOW  # C -> LOW
 
-    def test_parse_output_invalid_format_skipped(self):
+    def test_parse_output_invalid_format_skipped(self, analyzer):
         """Test that invalid format lines are skipped."""
-        analyzer = PylintAnalyzer()
-        code_content = "x = 1\n"
-        output = """1:0:C0114:Missing module docstring
+        code_content = SINGLE_LINE_CODE
+        output = f"""{PYLINT_OUTPUT_SINGLE}
 not a valid line
 another invalid line"""
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert len(result) == 1
 
-    def test_parse_output_preserves_line_numbers(self):
+    def test_parse_output_preserves_line_numbers(self, analyzer):
         """Test that line numbers are correctly preserved."""
-        analyzer = PylintAnalyzer()
-        code_content = "\n" * 50 + "x = 1\n"
         output = "42:0:C0114:Test message"
-        result = analyzer._parse_output(output, code_content, "StyleAgent")
+        result = analyzer._parse_output(output, FIFTY_BLANK_LINES_CODE, "StyleAgent")
         assert result[0].line_number == 42
 
-    def test_parse_output_extracts_code_snippet(self):
+    def test_parse_output_extracts_code_snippet(self, analyzer):
         """Test that code snippet is extracted from code content."""
-        analyzer = PylintAnalyzer()
-        code_content = "first_line = 1\nsecond_line = 2\nthird_line = 3\n"
         output = "2:0:C0114:Test message"
-        result = analyzer._parse_output(output, code_content, "StyleAgent")
+        result = analyzer._parse_output(output, NAMED_LINES_CODE, "StyleAgent")
         assert result[0].code_snippet == "second_line = 2"
 
-    def test_parse_output_sets_agent_name(self):
+    def test_parse_output_sets_agent_name(self, analyzer):
         """Test that agent name is set correctly."""
-        analyzer = PylintAnalyzer()
-        code_content = "x = 1\n"
+        code_content = SINGLE_LINE_CODE
         output = "1:0:C0114:Test message"
         result = analyzer._parse_output(output, code_content, "TestAgent")
         assert result[0].agent_name == "TestAgent"
 
-    def test_parse_output_sets_rule_id(self):
+    def test_parse_output_sets_rule_id(self, analyzer):
         """Test that rule_id includes PYLINT prefix."""
-        analyzer = PylintAnalyzer()
-        code_content = "x = 1\n"
+        code_content = SINGLE_LINE_CODE
         output = "1:0:C0114:Test message"
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert result[0].rule_id == "PYLINT_C0114"
 
-    def test_parse_output_sets_issue_type(self):
+    def test_parse_output_sets_issue_type(self, analyzer):
         """Test that issue_type is set to style/pep8."""
-        analyzer = PylintAnalyzer()
-        code_content = "x = 1\n"
+        code_content = SINGLE_LINE_CODE
         output = "1:0:C0114:Test message"
         result = analyzer._parse_output(output, code_content, "StyleAgent")
         assert result[0].issue_type == "style/pep8"
 
 
 class TestPylintAnalyzerAnalyze:
-    """Tests for analyze method."""
+    """Tests for the subprocess contract of the analyze method."""
 
-    def test_analyze_with_no_issues(self):
-        """Test analysis of clean code."""
-        analyzer = PylintAnalyzer()
-        code = "x = 1\n"
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            result = analyzer.analyze(code)
-            assert result == []
-
-    def test_analyze_returns_findings(self):
+    def test_analyze_returns_findings(self, analyzer, mock_subprocess_run):
         """Test that analyze returns findings for code with issues."""
-        analyzer = PylintAnalyzer()
-        code = "x = 1\n"
-
-        pylint_output = "1:0:C0114:Missing module docstring"
+        mock_subprocess_run.return_value = completed_process(PYLINT_OUTPUT_SINGLE, returncode=4)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=pylint_output, stderr="", returncode=4)
-            result = analyzer.analyze(code)
-            assert len(result) == 1
-            assert result[0].message == "Missing module docstring"
+        result = analyzer.analyze(SINGLE_LINE_CODE)
+        assert len(result) == 1
+        assert result[0].message == "Missing module docstring"
 
-    def test_analyze_handles_file_not_found(self):
+    def test_analyze_handles_file_not_found(self, analyzer, mock_subprocess_run):
         """Test that FileNotFoundError (pylint not installed) is handled."""
-        analyzer = PylintAnalyzer()
+        mock_subprocess_run.side_effect = FileNotFoundError("pylint not found")
+        assert analyzer.analyze("some code") == []
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = FileNotFoundError("pylint not found")
-            result = analyzer.analyze("some code")
-            assert result == []
-
-    def test_analyze_handles_generic_exception(self):
+    def test_analyze_handles_generic_exception(self, analyzer, mock_subprocess_run):
         """Test that generic exceptions are handled gracefully."""
-        analyzer = PylintAnalyzer()
+        mock_subprocess_run.side_effect = Exception("Unexpected error")
+        assert analyzer.analyze("some code") == []
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = Exception("Unexpected error")
-            result = analyzer.analyze("some code")
-            assert result == []
-
-    def test_analyze_cleans_up_temp_file(self):
+    def test_analyze_cleans_up_temp_file(self, mock_subprocess_run):
         """Test that temporary file is cleaned up after analysis."""
-        analyzer = PylintAnalyzer()
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            with patch("os.path.exists", return_value=True):
-                with patch("os.remove") as mock_remove:
-                    analyzer.analyze("x = 1")
-                    # os.remove should be called to clean up temp file
-                    mock_remove.assert_called()
-
-    def test_analyze_with_agent_name(self):
-        """Test analyze with custom agent name."""
-        analyzer = PylintAnalyzer()
-        code = "x = 1\n"
+        # In-memory temp file from an injected factory: no real filesystem access
+        fake_file = io.StringIO()
+        fake_file.name = "/fake/snippet.py"
+        factory = MagicMock(return_value=fake_file)
+        analyzer = PylintAnalyzer(tempfile_factory=factory)
+
+        with (
+            patch("os.path.exists", return_value=True),
+            patch("os.remove") as mock_remove,
+        ):
+            analyzer.analyze("x = 1")
+
+        factory.assert_called_once()
+        assert mock_subprocess_run.call_args.args[0][-1] == "/fake/snippet.py"
+        # os.remove should be called to clean up temp file
+        mock_remove.assert_called_once_with("/fake/snippet.py")
+
+    def test_analyze_default_agent_name(self, analyzer, mock_subprocess_run):
+        """Test analyze uses default agent name."""
+        mock_subprocess_run.return_value = completed_process(PYLINT_OUTPUT_SINGLE, returncode=4)
 
-        pylint_output = "1:0:C0114:Missing module docstring"
+        result = analyzer.analyze(SINGLE_LINE_CODE)
+        assert len(result) == 1
+        assert result[0].agent_name == "StyleAgent"
 
-        with patch.object(analyzer, "_cmd_template", []):
-            with patch("src.agents.analyzers.pylint_analyzer.subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(stdout=pylint_output, stderr="", returncode=4)
-                result = analyzer.analyze(code, agent_name="CustomAgent")
-                assert len(result) == 1
-                assert result[0].agent_name == "CustomAgent"
 
-    def test_analyze_default_agent_name(self):
-        """Test analyze uses default agent name."""
-        analyzer = PylintAnalyzer()
-        code = "x = 1\n"
+class TestPylintAnalyzerAnalyzeOutput:
+    """Tests for the findings built from pylint output (no subprocess involved)."""
 
-        pylint_output = "1:0:C0114:Missing module docstring"
+    def test_analyze_with_no_issues(self, analyzer):
+        """Test analysis of clean code."""
+        result = analyzer._parse_output("", SINGLE_LINE_CODE, "StyleAgent")
+        assert result == []
 
-        with patch.object(analyzer, "_cmd_template", []):
-            with patch("src.agents.analyzers.pylint_analyzer.subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(stdout=pylint_output, stderr="", returncode=4)
-                result = analyzer.analyze(code)
-                assert len(result) == 1
-                assert result[0].agent_name == "StyleAgent"
+    def test_analyze_with_agent_name(self, analyzer):
+        """Test analyze with custom agent name."""
+        result = analyzer._parse_output(PYLINT_OUTPUT_SINGLE, SINGLE_LINE_CODE, "CustomAgent")
+        assert len(result) == 1
+        assert result[0].agent_name == "CustomAgent"
 
 
 class TestPylintAnalyzerIntegration:
     """Integration-like tests for end-to-end behavior."""
 
-    def test_finding_has_all_required_fields(self):
+    def test_finding_has_all_required_fields(self, single_issue_findings):
         """Test that findings have all required fields."""
-        analyzer = PylintAnalyzer()
-        code = "x = 1\n"
-
-        pylint_output = "1:0:C0114:Missing module docstring"
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=pylint_output, stderr="", returncode=4)
-            result = analyzer.analyze(code)
-            assert len(result) == 1
-            finding = result[0]
-
-            # Check all Finding fields
-            assert finding.severity is not None
-            assert finding.issue_type is not None
-            assert finding.message is not None
-            assert finding.line_number is not None
-            assert finding.agent_name is not None
-            assert finding.rule_id is not None
-
-    def test_empty_code_returns_empty_list(self):
+        assert len(single_issue_findings) == 1
+        finding = single_issue_findings[0]
+
+        # Check all Finding fields
+        assert finding.severity is not None
+        assert finding.issue_type is not None
+        assert finding.message is not None
+        assert finding.line_number is not None
+        assert finding.agent_name is not None
+        assert finding.rule_id is not None
+
+    def test_empty_code_returns_empty_list(self, analyzer):
         """Test analyzing empty code."""
-        analyzer = PylintAnalyzer()
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout="", stderr="", returncode=0)
-            result = analyzer.analyze("")
-            assert result == []
+        result = analyzer._parse_output("", "", "StyleAgent")
+        assert result == []
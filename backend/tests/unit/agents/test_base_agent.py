@@ -3,8 +3,7 @@ Unit tests for BaseAgent abstract class
 Tests para la clase base BaseAgent
 """
 
-from typing import List
-from unittest.mock import Mock
+from typing import Any, List, Tuple
 
 import pytest
 
@@ -36,35 +35,76 @@ class DummyAgent(BaseAgent):
         ]
 
 
+class BadAgent(BaseAgent):
+    """Agente con nombre vacío: su constructor debe fallar."""
+
+    def __init__(self):
+        super().__init__(name="")
+
+    def analyze(self, context: AnalysisContext) -> List[Finding]:
+        return []
+
+
+class EventRecorder:
+    """Event bus mínimo que guarda cada (event_type, data) publicado."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, dict]] = []
+
+    def publish(self, event_type: str, data: dict) -> None:
+        self.events.append((event_type, data))
+
+
+class LogRecorder:
+    """Logger mínimo que guarda (nivel, args) de cada llamada."""
+
+    def __init__(self):
+        self.records: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def info(self, *args: Any) -> None:
+        self.records.append(("info", args))
+
+    def warning(self, *args: Any) -> None:
+        self.records.append(("warning", args))
+
+    def error(self, *args: Any) -> None:
+        self.records.append(("error", args))
+
+    def debug(self, *args: Any) -> None:
+        self.records.append(("debug", args))
+
+
+@pytest.fixture(scope="module")
+def shared_agent():
+    """DummyAgent compartido por los tests de solo lectura."""
+    return DummyAgent()
+
+
+@pytest.fixture
+def fresh_agent():
+    """DummyAgent nuevo para tests que modifican su estado."""
+    return DummyAgent()
+
+
 class TestBaseAgentInitialization:
     """Tests para inicialización del agente."""
 
-    def test_create_agent_with_defaults(self):
+    def test_create_agent_with_defaults(self, shared_agent):
         """Test crear agente con valores por defecto."""
-        agent = DummyAgent()
 
-        assert agent.name == "DummyAgent"
-        assert agent.version == "1.0.0"
-        assert agent.category == "test"
-        assert agent.enabled is True
+        assert shared_agent.name == "DummyAgent"
+        assert shared_agent.version == "1.0.0"
+        assert shared_agent.category == "test"
+        assert shared_agent.enabled is True
 
     def test_agent_name_required(self):
         """Test que el nombre es requerido."""
         with pytest.raises(ValueError, match="name cannot be empty"):
-
-            class BadAgent(BaseAgent):
-                def __init__(self):
-                    super().__init__(name="")
-
-                def analyze(self, context):
-                    pass
-
             BadAgent()
 
-    def test_agent_info_dict(self):
+    def test_agent_info_dict(self, shared_agent):
         """Test que get_info retorna diccionario correcto."""
-        agent = DummyAgent()
-        info = agent.get_info()
+        info = shared_agent.get_info()
 
         assert isinstance(info, dict)
         assert info["name"] == "DummyAgent"
@@ -76,44 +116,39 @@ class TestBaseAgentInitialization:
 class TestBaseAgentMethods:
     """Tests para métodos del agente."""
 
-    def test_is_enabled_when_enabled(self):
+    def test_is_enabled_when_enabled(self, shared_agent):
         """Test is_enabled cuando está habilitado."""
-        agent = DummyAgent()
-        assert agent.is_enabled() is True
+        assert shared_agent.is_enabled() is True
 
-    def test_is_enabled_when_disabled(self):
+    def test_is_enabled_when_disabled(self, fresh_agent):
         """Test is_enabled cuando está deshabilitado."""
-        agent = DummyAgent()
-        agent.disable()
-        assert agent.is_enabled() is False
+        fresh_agent.disable()
+        assert fresh_agent.is_enabled() is False
 
-    def test_enable_agent(self):
+    def test_enable_agent(self, fresh_agent):
         """Test habilitar un agente."""
-        agent = DummyAgent()
-        agent.disable()
-        assert agent.enabled is False
+        fresh_agent.disable()
+        assert fresh_agent.enabled is False
 
-        agent.enable()
-        assert agent.enabled is True
+        fresh_agent.enable()
+        assert fresh_agent.enabled is True
 
-    def test_disable_agent(self):
+    def test_disable_agent(self, fresh_agent):
         """Test deshabilitar un agente."""
-        agent = DummyAgent()
-        assert agent.enabled is True
+        assert fresh_agent.enabled is True
 
-        agent.disable()
-        assert agent.enabled is False
+        fresh_agent.disable()
+        assert fresh_agent.enabled is False
 
 
 class TestBaseAgentAnalyze:
     """Tests para el método analyze."""
 
-    def test_analyze_returns_findings(self):
+    def test_analyze_returns_findings(self, shared_agent):
         """Test que analyze retorna lista de findings."""
-        agent = DummyAgent()
         context = AnalysisContext(code_content="print('hello')", filename="test.py")
 
-        findings = agent.analyze(context)
+        findings = shared_agent.analyze(context)
 
         assert isinstance(findings, list)
         assert len(findings) >= 1
@@ -129,19 +164,17 @@ class TestBaseAgentAnalyze:
 class TestBaseAgentRepr:
     """Tests para representación string."""
 
-    def test_repr_contains_name_and_version(self):
+    def test_repr_contains_name_and_version(self, shared_agent):
         """Test que __repr__ contiene nombre y versión."""
-        agent = DummyAgent()
-        repr_str = repr(agent)
+        repr_str = repr(shared_agent)
 
         assert "DummyAgent" in repr_str
         assert "1.0.0" in repr_str
         assert "test" in repr_str
 
-    def test_str_representation(self):
+    def test_str_representation(self, shared_agent):
         """Test que __str__ es legible."""
-        agent = DummyAgent()
-        str_repr = str(agent)
+        str_repr = str(shared_agent)
 
         assert "DummyAgent" in str_repr
         assert "1.0.0" in str_repr
@@ -152,28 +185,25 @@ class TestBaseAgentRepr:
 class TestBaseAgentEvents:
     """Tests para emisión de eventos."""
 
-    def test_emit_agent_started(self):
+    def test_emit_agent_started(self, fresh_agent):
         """Test que _emit_agent_started publica evento."""
-        event_bus_mock = Mock()
-        agent = DummyAgent()
-        agent.event_bus = event_bus_mock
+        event_bus = EventRecorder()
+        fresh_agent.event_bus = event_bus
 
         context = AnalysisContext(code_content="code", filename="test.py")
 
-        agent._emit_agent_started(context)
+        fresh_agent._emit_agent_started(context)
 
-        event_bus_mock.publish.assert_called_once()
         # publish recibe (event_type, data)
-        event_type = event_bus_mock.publish.call_args[0][0]
-        data = event_bus_mock.publish.call_args[0][1]
+        assert len(event_bus.events) == 1
+        event_type, data = event_bus.events[0]
         assert event_type == "AGENT_STARTED"
         assert data["agent_name"] == "DummyAgent"
 
-    def test_emit_agent_completed(self):
+    def test_emit_agent_completed(self, fresh_agent):
         """Test que _emit_agent_completed publica evento."""
-        event_bus_mock = Mock()
-        agent = DummyAgent()
-        agent.event_bus = event_bus_mock
+        event_bus = EventRecorder()
+        fresh_agent.event_bus = event_bus
 
         context = AnalysisContext(code_content="code", filename="test.py")
         findings = [
@@ -186,58 +216,55 @@ class TestBaseAgentEvents:
             )
         ]
 
-        agent._emit_agent_completed(context, findings)
+        fresh_agent._emit_agent_completed(context, findings)
 
-        event_bus_mock.publish.assert_called_once()
         # publish recibe (event_type, data)
-        event_type = event_bus_mock.publish.call_args[0][0]
-        data = event_bus_mock.publish.call_args[0][1]
+        assert len(event_bus.events) == 1
+        event_type, data = event_bus.events[0]
         assert event_type == "AGENT_COMPLETED"
         assert data["findings_count"] == 1
 
-    def test_emit_agent_failed(self):
+    def test_emit_agent_failed(self, fresh_agent):
         """Test que _emit_agent_failed publica evento."""
-        event_bus_mock = Mock()
-        agent = DummyAgent()
-        agent.event_bus = event_bus_mock
+        event_bus = EventRecorder()
+        fresh_agent.event_bus = event_bus
         context = AnalysisContext(code_content="code", filename="test.py")
 
         error = RuntimeError("boom")
-        agent._emit_agent_failed(context, error)
+        fresh_agent._emit_agent_failed(context, error)
 
-        event_bus_mock.publish.assert_called_once()
         # publish recibe (event_type, data)
-        event_type = event_bus_mock.publish.call_args[0][0]
-        data = event_bus_mock.publish.call_args[0][1]
+        assert len(event_bus.events) == 1
+        event_type, data = event_bus.events[0]
         assert event_type == "AGENT_FAILED"
         assert "boom" in data["error"]
 
-    def test_no_events_when_event_bus_none(self):
+    def test_no_events_when_event_bus_none(self, fresh_agent):
         """Test que no falla si event_bus es None."""
-        agent = DummyAgent()
-        agent.event_bus = None
+        fresh_agent.event_bus = None
 
         context = AnalysisContext(code_content="code", filename="test.py")
 
         # No debe lanzar excepción
-        agent._emit_agent_started(context)
-        agent._emit_agent_completed(context, [])
+        fresh_agent._emit_agent_started(context)
+        fresh_agent._emit_agent_completed(context, [])
 
 
 class TestBaseAgentLogging:
     """Tests para el logging del agente."""
 
-    def test_log_helpers_delegate_to_logger(self):
+    def test_log_helpers_delegate_to_logger(self, fresh_agent):
         """Test que los helpers de log delegan en el logger."""
-        agent = DummyAgent()
-        agent.logger = Mock()
-
-        agent.log_info("info")
-        agent.log_warning("warn")
-        agent.log_error("err")
-        agent.log_debug("dbg")
-
-        agent.logger.info.assert_called_once_with("[%s] %s", "DummyAgent", "info")
-        agent.logger.warning.assert_called_once_with("[%s] %s", "DummyAgent", "warn")
-        agent.logger.error.assert_called_once_with("[%s] %s", "DummyAgent", "err")
-        agent.logger.debug.assert_called_once_with("[%s] %s", "DummyAgent", "dbg")
+        fresh_agent.logger = LogRecorder()
+
+        fresh_agent.log_info("info")
+        fresh_agent.log_warning("warn")
+        fresh_agent.log_error("err")
+        fresh_agent.log_debug("dbg")
+
+        assert fresh_agent.logger.records == [
+            ("info", ("[%s] %s", "DummyAgent", "info")),
+            ("warning", ("[%s] %s", "DummyAgent", "warn")),
+            ("error", ("[%s] %s", "DummyAgent", "err")),
+            ("debug", ("[%s] %s", "DummyAgent", "dbg")),
+        ]
@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock, patch
+import ast
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -6,120 +7,127 @@ from src.agents.quality_agent import QualityAgent
 from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Finding, Severity
 
+RADON_VISIT = "src.agents.quality_agent.radon_visit"
+MI_VISIT = "src.agents.quality_agent.mi_visit"
 
-class TestQualityAgent:
-    """Test suite for QualityAgent."""
+# Valid Python with a 105-line function, parsed once (the agent only walks the tree)
+LONG_FUNCTION_CODE = "def long_func():\n" + "\n".join(f"    x = {i}" for i in range(105))
+_LONG_FUNCTION_TREE = ast.parse(LONG_FUNCTION_CODE)
+_TRIVIAL_FUNCTION_TREE = ast.parse("def foo(): pass")
+
+
+def _raising(exc: Exception):
+    """Callable that raises ``exc`` whatever it is called with."""
+
+    def _raise(*_args, **_kwargs):
+        raise exc
+
+    return _raise
+
+
+@pytest.fixture(scope="module")
+def mock_event_bus():
+    """Mock the EventBus (shared by the module, reset before each test)."""
+    return MagicMock()
+
+
+@pytest.fixture(autouse=True)
+def _reset_event_bus(mock_event_bus):
+    """Clear recorded calls so per-test publish assertions stay isolated."""
+    mock_event_bus.reset_mock()
+
+
+@pytest.fixture(scope="module")
+def agent(mock_event_bus):
+    """Create one QualityAgent for the module (tests never mutate it)."""
+    return QualityAgent(event_bus=mock_event_bus)
 
-    @pytest.fixture
-    def mock_event_bus(self):
-        """Mock the EventBus."""
-        return MagicMock()
 
-    @pytest.fixture
-    def agent(self, mock_event_bus):
-        """Create QualityAgent instance."""
-        return QualityAgent(event_bus=mock_event_bus)
+class TestQualityAgent:
+    """Test suite for QualityAgent."""
 
-    def test_analyze_quality_metrics(self, agent, mock_event_bus):
+    def test_analyze_quality_metrics(self, agent, mock_event_bus, make_context, monkeypatch):
         """Test detection of all quality metrics (Happy Path)."""
         code = """
 def complex_function(x):
     pass
 """
-        context = AnalysisContext(code_content=code, filename="quality_test.py")
+        context = make_context(code, "quality_test.py")
 
         # Mock Radon Complexity
-        with patch("src.agents.quality_agent.radon_visit") as mock_radon_visit, patch(
-            "src.agents.quality_agent.mi_visit"
-        ) as mock_mi_visit:
-
-            mock_func = MagicMock()
-            mock_func.name = "complex_function"
-            mock_func.complexity = 15
-            mock_func.lineno = 2
-            mock_radon_visit.return_value = [mock_func]
+        mock_func = MagicMock()
+        mock_func.name = "complex_function"
+        mock_func.complexity = 15
+        mock_func.lineno = 2
+        monkeypatch.setattr(RADON_VISIT, lambda *_: [mock_func])
 
-            # Mock Radon Maintainability
-            mock_mi_visit.return_value = 40.0
+        # Mock Radon Maintainability
+        monkeypatch.setattr(MI_VISIT, lambda *_: 40.0)
 
-            findings = agent.analyze(context)
+        findings = agent.analyze(context)
 
-            assert mock_event_bus.publish.called
-            issue_types = [f.issue_type for f in findings]
-            assert "quality/cyclomatic-complexity" in issue_types
-            assert "quality/maintainability-index" in issue_types
+        assert mock_event_bus.publish.called
+        issue_types = [f.issue_type for f in findings]
+        assert "quality/cyclomatic-complexity" in issue_types
+        assert "quality/maintainability-index" in issue_types
 
     def test_measure_function_length(self, agent):
         """Test specifically function length detection."""
-        # Create a valid python code with a long function
-        code = "def long_func():\n" + "\n".join([f"    x = {i}" for i in range(105)])
-        import ast
-
-        tree = ast.parse(code)
-        findings = agent.measure_function_length(tree)
+        findings = agent.measure_function_length(_LONG_FUNCTION_TREE)
         assert len(findings) == 1
         assert findings[0].issue_type == "quality/function-length"
         assert "105" in findings[0].message or "106" in findings[0].message
 
-    def test_calculate_maintainability_index(self, agent):
+    def test_calculate_maintainability_index(self, agent, monkeypatch):
         """Test MI calculation."""
-        with patch("src.agents.quality_agent.mi_visit") as mock_mi:
-            mock_mi.return_value = 30.0
-            score = agent.calculate_maintainability_index("some code")
-            assert score == 30.0
+        monkeypatch.setattr(MI_VISIT, lambda *_: 30.0)
+        score = agent.calculate_maintainability_index("some code")
+        assert score == 30.0
 
-    def test_syntax_error_handling(self, agent):
+    def test_syntax_error_handling(self, agent, make_context):
         """Test handling of syntax errors in AST parsing."""
-        context = AnalysisContext(code_content="def broken_code(", filename="error.py")
+        context = make_context("def broken_code(", "error.py")
         findings = agent.analyze(context)
         assert len(findings) == 0
 
-    def test_complexity_thresholds(self, agent):
+    def test_complexity_thresholds(self, agent, monkeypatch):
         """Test different complexity thresholds (High/Critical)."""
-        import ast
-
-        tree = ast.parse("def foo(): pass")
+        # Case 1: Critical (> 50)
+        mock_crit = MagicMock()
+        mock_crit.name = "crit_func"
+        mock_crit.complexity = 51
+        mock_crit.lineno = 1
 
-        with patch("src.agents.quality_agent.radon_visit") as mock_radon_visit:
-            # Case 1: Critical (> 50)
-            mock_crit = MagicMock()
-            mock_crit.name = "crit_func"
-            mock_crit.complexity = 51
-            mock_crit.lineno = 1
+        # Case 2: High (> 20)
+        mock_high = MagicMock()
+        mock_high.name = "high_func"
+        mock_high.complexity = 21
+        mock_high.lineno = 5
 
-            # Case 2: High (> 20)
-            mock_high = MagicMock()
-            mock_high.name = "high_func"
-            mock_high.complexity = 21
-            mock_high.lineno = 5
+        monkeypatch.setattr(RADON_VISIT, lambda *_: [mock_crit, mock_high])
 
-            mock_radon_visit.return_value = [mock_crit, mock_high]
+        findings = agent.calculate_complexity(_TRIVIAL_FUNCTION_TREE)
 
-            findings = agent.calculate_complexity(tree)
+        assert len(findings) == 2
+        severities = [f.severity for f in findings]
+        assert Severity.CRITICAL in severities
+        assert Severity.HIGH in severities
 
-            assert len(findings) == 2
-            severities = [f.severity for f in findings]
-            assert Severity.CRITICAL in severities
-            assert Severity.HIGH in severities
-
-    def test_maintainability_critical(self, agent):
+    def test_maintainability_critical(self, agent, make_context, monkeypatch):
         """Test critical maintainability index."""
         # Use valid code so AST parsing succeeds
-        context = AnalysisContext(code_content="def foo(): pass", filename="test.py")
-
-        with patch("src.agents.quality_agent.mi_visit") as mock_mi, patch(
-            "src.agents.quality_agent.radon_visit", return_value=[]
-        ):
+        context = make_context("def foo(): pass", "test.py")
 
-            # Mock MI < 20
-            mock_mi.return_value = 10.0
+        # Mock MI < 20
+        monkeypatch.setattr(MI_VISIT, lambda *_: 10.0)
+        monkeypatch.setattr(RADON_VISIT, lambda *_: [])
 
-            findings = agent.analyze(context)
-            mi_finding = next(
-                (f for f in findings if f.issue_type == "quality/maintainability-index"), None
-            )
-            assert mi_finding is not None
-            assert mi_finding.severity == Severity.CRITICAL
+        findings = agent.analyze(context)
+        mi_finding = next(
+            (f for f in findings if f.issue_type == "quality/maintainability-index"), None
+        )
+        assert mi_finding is not None
+        assert mi_finding.severity == Severity.CRITICAL
 
     def test_short_file_duplication(self, agent):
         """Test that short files skip duplication check."""
@@ -139,38 +147,36 @@ def complex_function(x):
         assert findings[0].issue_type == "quality/duplication"
         assert "Bloque de código duplicado" in findings[0].message
 
-    def test_radon_not_installed(self, agent):
+    def test_radon_not_installed(self, agent, monkeypatch):
         """Test behavior when radon is not installed."""
-        with patch("src.agents.quality_agent.radon_visit", None), patch(
-            "src.agents.quality_agent.mi_visit", None
-        ):
+        monkeypatch.setattr(RADON_VISIT, None)
+        monkeypatch.setattr(MI_VISIT, None)
 
-            findings_cc = agent.calculate_complexity(MagicMock())
-            assert len(findings_cc) == 0
+        findings_cc = agent.calculate_complexity(MagicMock())
+        assert len(findings_cc) == 0
 
-            score = agent.calculate_maintainability_index("code")
-            assert score == 100.0
+        score = agent.calculate_maintainability_index("code")
+        assert score == 100.0
 
-    def test_exception_handling_in_analyze(self, agent):
+    def test_exception_handling_in_analyze(self, agent, make_context, monkeypatch):
         """Test global exception handling in analyze method."""
-        context = AnalysisContext(code_content="code", filename="test.py")
-        with patch("ast.parse", side_effect=Exception("Unexpected error")):
-            findings = agent.analyze(context)
-            assert len(findings) == 0
+        context = make_context("code", "test.py")
+        # Patch get_ast (not ast.parse): the shared context may already hold a cached AST
+        monkeypatch.setattr(AnalysisContext, "get_ast", _raising(Exception("Unexpected error")))
+        findings = agent.analyze(context)
+        assert len(findings) == 0
 
-    def test_exception_in_complexity_calculation(self, agent):
+    def test_exception_in_complexity_calculation(self, agent, monkeypatch):
         """Test exception handling inside calculate_complexity."""
-        with patch("src.agents.quality_agent.radon_visit") as mock_radon:
-            mock_radon.side_effect = Exception("Radon error")
-            findings = agent.calculate_complexity(MagicMock())
-            assert len(findings) == 0
+        monkeypatch.setattr(RADON_VISIT, _raising(Exception("Radon error")))
+        findings = agent.calculate_complexity(MagicMock())
+        assert len(findings) == 0
 
-    def test_mi_visit_exception(self, agent):
+    def test_mi_visit_exception(self, agent, monkeypatch):
         """Test exception inside calculate_maintainability_index."""
-        with patch("src.agents.quality_agent.mi_visit") as mock_mi:
-            mock_mi.side_effect = Exception("MI Error")
-            score = agent.calculate_maintainability_index("code")
-            assert score == 100.0
+        monkeypatch.setattr(MI_VISIT, _raising(Exception("MI Error")))
+        score = agent.calculate_maintainability_index("code")
+        assert score == 100.0
 
     def test_duplication_with_comments(self, agent):
         """Test that comments are ignored in duplication check."""
@@ -8,6 +8,9 @@ Tests cover all 4 detection modules:
 4. Weak cryptography detection
 """
 
+import re
+import time
+
 import pytest
 
 from src.agents.security_agent import SecurityAgent
@@ -15,6 +18,12 @@ from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Severity
 
 
+@pytest.fixture(scope="module")
+def agent():
+    """Shared SecurityAgent; analyze() keeps no per-call state on the agent."""
+    return SecurityAgent()
+
+
 class TestSecurityAgentInitialization:
     """Test SecurityAgent initialization."""
 
@@ -35,15 +44,64 @@ class TestSecurityAgentInitialization:
         assert info["name"] == "SecurityAgent"
         assert info["category"] == "security"
 
+    def test_build_matcher_uses_literal_search_without_metacharacters(self):
+        """Test literal patterns are matched with a substring check, case-folded."""
+        matcher = SecurityAgent._build_matcher("YOUR_", re.IGNORECASE)
+
+        assert not isinstance(getattr(matcher, "__self__", None), re.Pattern)
+        assert matcher("your_password_here")
+        assert matcher("Your_Password_Here")
+        assert not matcher("real-secret")
+
+    def test_build_matcher_literal_is_case_sensitive_without_ignorecase(self):
+        """Test literal patterns keep exact case when IGNORECASE is not requested."""
+        matcher = SecurityAgent._build_matcher("YOUR_")
+
+        assert matcher("YOUR_KEY")
+        assert not matcher("your_key")
+
+    def test_build_matcher_compiles_regex_patterns(self):
+        """Test regex patterns are precompiled and searched."""
+        matcher = SecurityAgent._build_matcher(r"xxx+", re.IGNORECASE)
+
+        assert isinstance(matcher.__self__, re.Pattern)
+        assert matcher("value_xxxx")
+        assert not matcher("value_xx")
+
+    def test_compiled_rules_shared_across_instances(self):
+        """Test regex rules are compiled once per class, not per instance."""
+        first, second = SecurityAgent(), SecurityAgent()
+
+        assert first._rules is second._rules
+        assert first._rules is SecurityAgent._compiled_rules()
+
+    def test_find_keyword_lines_maps_matches_to_line_numbers(self):
+        """Test the keyword prefilter reports candidate lines per rule group."""
+        agent = SecurityAgent()
+        code = "x = 1\ncursor.EXECUTE(query)\nAPI_KEY = 'abc'\ny = 2\ntoken = t\n"
+        context = AnalysisContext(code_content=code, filename="prefilter.py")
+
+        keyword_lines = agent._find_keyword_lines(context)
+
+        assert keyword_lines == {"sql": {2}, "credential": {3, 5}}
+
+    def test_line_numbers_follow_get_lines_with_mixed_line_endings(self):
+        """Test offsets map to the same line numbering as get_lines() for CRLF/CR sources."""
+        agent = SecurityAgent()
+        code = "x = 1\r\ncursor.execute(q)\rdb_password = 'SuperSecret123'\n"
+        context = AnalysisContext(code_content=code, filename="endings.py")
+
+        keyword_lines = agent._find_keyword_lines(context)
+        findings = agent._detect_hardcoded_credentials(context)
+
+        assert keyword_lines == {"sql": {2}, "credential": {3}}
+        assert [f.line_number for f in findings] == [3]
+        assert context.get_lines()[2] == "db_password = 'SuperSecret123'"
+
 
 class TestDangerousFunctionsDetection:
     """Test detection of dangerous functions."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create SecurityAgent instance."""
-        return SecurityAgent()
-
     def test_detect_eval_function(self, agent):
         """Test detection of eval() function."""
         code = """
@@ -119,11 +177,6 @@ result = evaluate_math(5, 3)
 class TestSQLInjectionDetection:
     """Test detection of SQL injection vulnerabilities."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create SecurityAgent instance."""
-        return SecurityAgent()
-
     def test_detect_string_concatenation_sql(self, agent):
         """Test detection of SQL injection via string concatenation."""
         code = 'cursor.execute("SELECT * FROM users WHERE id=" + user_id)'
@@ -173,11 +226,6 @@ cursor.execute('INSERT INTO logs VALUES (?, ?)', (timestamp, message))
 class TestHardcodedCredentialsDetection:
     """Test detection of hardcoded credentials."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create SecurityAgent instance."""
-        return SecurityAgent()
-
     def test_detect_hardcoded_password(self, agent):
         """Test detection of hardcoded password."""
         code = 'password = "MySecretPass123"'
@@ -251,11 +299,6 @@ secret = "example_secret"
 class TestWeakCryptographyDetection:
     """Test detection of weak cryptographic algorithms."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create SecurityAgent instance."""
-        return SecurityAgent()
-
     def test_detect_md5_usage(self, agent):
         """Test detection of MD5 hash algorithm."""
         code = """
@@ -309,11 +352,6 @@ hash_value = hashlib.md5(data).hexdigest()
 class TestComplexScenarios:
     """Test complex scenarios with multiple vulnerabilities."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create SecurityAgent instance."""
-        return SecurityAgent()
-
     def test_multiple_vulnerabilities_in_one_file(self, agent):
         """Test detection of multiple vulnerability types."""
         code = """
@@ -410,3 +448,45 @@ class TestComplexScenarios:
         # First findings should be CRITICAL
         for i in range(min(2, len(findings))):
             assert findings[i].severity in [Severity.CRITICAL, Severity.HIGH]
+
+
+class TestPatternBacktracking:
+    """Test that regex rules scan adversarial lines in linear time."""
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            'cursor.execute("' + "a" * 1_000_000,
+            "cursor.execute(" + " " * 1_000_000 + "x",
+            'password = "' + "a" * 1_000_000,
+            "api_key =" + " " * 1_000_000 + "x",
+        ],
+        ids=["sql-unterminated", "sql-whitespace", "password-unterminated", "key-whitespace"],
+    )
+    def test_adversarial_megabyte_line_is_scanned_quickly(self, agent, line):
+        """A 1MB line that almost matches a rule must not trigger backtracking blowup."""
+        context = AnalysisContext(code_content=line, filename="adversarial.py")
+
+        start = time.perf_counter()
+        findings = agent.analyze(context)
+        elapsed = time.perf_counter() - start
+
+        assert not [
+            f for f in findings if f.issue_type in ("sql_injection", "hardcoded_credentials")
+        ]
+        assert elapsed < 2.0
+
+    def test_possessive_patterns_keep_rule_semantics(self, agent):
+        """Possessive quantifiers still match the same vulnerable lines."""
+        code = (
+            'cursor.execute("SELECT * FROM t WHERE a=" + x + "b")\n'
+            "cursor.execute(  'SELECT %s' % name)\n"
+            'api_key  =  "sk_live_abcdefghijkl"\n'
+        )
+        context = AnalysisContext(code_content=code, filename="test.py")
+        findings = agent.analyze(context)
+
+        lines = {(f.issue_type, f.line_number) for f in findings}
+        assert ("sql_injection", 1) in lines
+        assert ("sql_injection", 2) in lines
+        assert ("hardcoded_credentials", 3) in lines
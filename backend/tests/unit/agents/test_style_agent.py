@@ -1,5 +1,6 @@
 """Tests unitarios para StyleAgent."""
 
+import ast
 from typing import Any, Dict
 from unittest.mock import MagicMock, patch
 
@@ -80,6 +81,23 @@ class TestLineLengthDetection:
         trailing_findings = [f for f in findings if "blanco al final" in f.message.lower()]
         assert len(trailing_findings) >= 1
 
+    @pytest.mark.parametrize(
+        "code, expected",
+        [
+            ("if True:\n\tx = 1\n", True),
+            ("if True:\n  \tx = 1\n", True),
+            ("if True:\n    x = 1\n", False),
+            ("x = '\t'\n", False),
+        ],
+    )
+    def test_detect_tab_indentation(self, code, expected):
+        """Detecta tabs al inicio de la indentación, solos o tras espacios."""
+        context = AnalysisContext(code_content=code, filename="test.py")
+
+        findings = StyleAgent()._check_line_style(context)
+
+        assert any(f.rule_id == "STYLE003_TABS" for f in findings) is expected
+
 
 class TestDocstringDetection:
     """Tests para detección de docstrings faltantes."""
@@ -367,6 +385,67 @@ class TestErrorHandling:
         assert len(findings) <= 5
 
 
+class TestAstReuse:
+    """Tests para la reutilización del AST entre módulos."""
+
+    def test_code_is_parsed_once_per_context(self):
+        """Docstrings, imports y nombres comparten el AST cacheado del contexto."""
+        code = """
+import os
+
+def camelCase():
+    pass
+"""
+        context = AnalysisContext(code_content=code, filename="test.py")
+        context.get_ast()
+        agent = StyleAgent()
+
+        with patch("ast.parse", side_effect=AssertionError("re-parse")) as mock_parse:
+            findings = (
+                agent._check_docstrings(context)
+                + agent._check_imports(context)
+                + agent._check_naming_conventions(context)
+            )
+
+        mock_parse.assert_not_called()
+        rule_ids = {f.rule_id for f in findings}
+        assert "STYLE010_MISSING_DOCSTRING" in rule_ids
+        assert "STYLE020_UNUSED_IMPORT" in rule_ids
+        assert "STYLE030_FUNC_NAMING" in rule_ids
+
+    def test_analyze_walks_ast_once(self):
+        """analyze recolecta los nodos en un solo recorrido para los modulos AST."""
+        code = """
+import os
+
+class badclass:
+    pass
+"""
+        context = AnalysisContext(code_content=code, filename="test.py")
+        agent = StyleAgent()
+
+        with patch.object(
+            agent, "_collect_style_nodes", wraps=agent._collect_style_nodes
+        ) as mock_collect, patch("src.agents.style_agent.ast.walk", wraps=ast.walk) as mock_walk:
+            findings = agent.analyze(context)
+
+        mock_collect.assert_called_once_with(context)
+        mock_walk.assert_called_once()
+        rule_ids = {f.rule_id for f in findings}
+        assert {"STYLE010_MISSING_DOCSTRING", "STYLE020_UNUSED_IMPORT"} <= rule_ids
+        assert "STYLE031_CLASS_NAMING" in rule_ids
+
+    def test_flake8_reuses_context_lines(self):
+        """Flake8Analyzer recibe las lineas cacheadas del contexto."""
+        context = AnalysisContext(code_content="import os\n", filename="test.py")
+        agent = StyleAgent()
+
+        with patch.object(agent.flake8_analyzer, "analyze", return_value=[]) as mock_analyze:
+            agent._run_flake8(context)
+
+        assert mock_analyze.call_args.kwargs["code_lines"] is context.get_lines()
+
+
 class TestIssueTypeCategories:
     """Tests para verificar categorías correctas de issue_type."""
 
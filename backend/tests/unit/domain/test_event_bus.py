@@ -2,7 +2,7 @@
 
 import pytest
 
-from src.core.events.event_bus import EventBus
+from src.core.events.event_bus import EventBus, EventType
 from src.core.events.observers import EventObserver
 
 
@@ -93,3 +93,55 @@ class TestEventBus:
         event_bus.publish("analysis_started", {"id": "test"})
 
         assert len(working_observer.received_events) == 1
+
+    def test_publish_batch_delivers_events_in_order(self, event_bus):
+        """publish_batch entrega todos los eventos en orden y convierte los Enum."""
+        observer = MockObserver()
+        event_bus.subscribe(observer)
+
+        event_bus.publish_batch(
+            [
+                (EventType.AGENT_STARTED, {"agent": "a"}),
+                ("finding_detected", {"line": 3}),
+                (EventType.AGENT_COMPLETED, {"agent": "a"}),
+            ]
+        )
+
+        assert [event for event, _ in observer.received_events] == [
+            "agent_started",
+            "finding_detected",
+            "agent_completed",
+        ]
+
+    def test_publish_batch_isolates_failing_events(self, event_bus):
+        """Un evento que falla en un observer no corta el resto del lote."""
+
+        class FlakyObserver(MockObserver):
+            def on_event(self, event_type: str, data: dict) -> None:
+                if data.get("fail"):
+                    raise ValueError("Observer error")
+                super().on_event(event_type, data)
+
+        flaky = FlakyObserver()
+        working = MockObserver()
+        event_bus.subscribe(flaky)
+        event_bus.subscribe(working)
+
+        event_bus.publish_batch([("a", {"fail": True}), ("b", {})])
+
+        assert flaky.received_events == [("b", {})]
+        assert len(working.received_events) == 2
+
+    def test_subscribe_during_publish_applies_to_next_event(self, event_bus):
+        """Un observer suscrito durante una publicación recibe solo los siguientes eventos."""
+        late_observer = MockObserver()
+
+        class SubscribingObserver(EventObserver):
+            def on_event(self, event_type: str, data: dict) -> None:
+                event_bus.subscribe(late_observer)
+
+        event_bus.subscribe(SubscribingObserver())
+        event_bus.publish("first", {})
+        event_bus.publish("second", {})
+
+        assert late_observer.received_events == [("second", {})]
@@ -9,7 +9,11 @@ from src.models.code_review import CodeReviewEntity
 from src.models.enums.review_status import ReviewStatus
 from src.repositories.code_review_repository import CodeReviewRepository
 from src.schemas.analysis import CodeReview
-from src.utils.encryption.aes_encryptor import decrypt_aes256, encrypt_aes256
+from src.utils.encryption.aes_encryptor import (
+    decrypt_aes256,
+    encrypt_aes256,
+    encrypt_aes256_bytes,
+)
 
 
 def test_encrypt_decrypt_cycle():
@@ -29,6 +33,19 @@ def test_encrypt_empty_raises_error():
         encrypt_aes256("")
 
 
+def test_encrypt_bytes_decrypt_cycle():
+    """Verifica que los bytes UTF-8 encriptados se recuperen como texto."""
+    encrypted = encrypt_aes256_bytes("Código secreto ñ".encode("utf-8"))
+
+    assert decrypt_aes256(encrypted) == "Código secreto ñ"
+
+
+def test_encrypt_bytes_empty_raises_error():
+    """Verifica que encriptar bytes vacíos lance error."""
+    with pytest.raises(ValueError):
+        encrypt_aes256_bytes(b"")
+
+
 def test_decrypt_empty_returns_empty():
     """Verifica que desencriptar bytes vacíos retorne string vacío."""
     assert decrypt_aes256(b"") == ""
@@ -1,9 +1,12 @@
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException, UploadFile
 
 from src.models.enums.review_status import ReviewStatus
+from src.schemas.analysis import AnalysisContext
 from src.schemas.finding import Finding, Severity
 from src.services.analysis_service import AnalysisService
 
@@ -241,3 +244,77 @@ async def test_analyze_code_agent_failure(service, mock_repo):
 
         assert result.status == ReviewStatus.COMPLETED
         mock_repo.create.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_analyze_code_agent_failure_keeps_other_findings(service, mock_repo):
+    """Los hallazgos de los agentes que terminan se conservan si otro falla."""
+    mock_file = AsyncMock(spec=UploadFile)
+    mock_file.filename = "valid.py"
+    mock_file.read.return_value = b"import os\n" * 6
+    style_finding = Finding(
+        severity=Severity.LOW,
+        issue_type="style",
+        message="Line too long found",
+        line_number=1,
+        agent_name="StyleAgent",
+    )
+    quality_finding = Finding(
+        severity=Severity.MEDIUM,
+        issue_type="quality",
+        message="Function too complex",
+        line_number=2,
+        agent_name="QualityAgent",
+    )
+
+    with patch("src.services.analysis_service.SecurityAgent") as MockSecurityAgent, patch(
+        "src.services.analysis_service.StyleAgent"
+    ) as MockStyleAgent, patch("src.services.analysis_service.QualityAgent") as MockQualityAgent:
+        MockSecurityAgent.return_value.analyze.side_effect = Exception("Security Agent Failed")
+        MockStyleAgent.return_value.analyze.return_value = [style_finding]
+        MockQualityAgent.return_value.analyze.return_value = [quality_finding]
+
+        await service.analyze_code(mock_file, "user_123")
+
+    review = mock_repo.create.call_args.args[0]
+    assert review.findings == [style_finding, quality_finding]
+
+
+@pytest.mark.asyncio
+async def test_run_agents_propagates_cancellation(service):
+    """Una cancelación de un agente se propaga en lugar de tratarse como hallazgos."""
+    context = AnalysisContext(code_content="import os\n", filename="valid.py")
+
+    with patch("src.services.analysis_service.SecurityAgent") as MockSecurityAgent, patch(
+        "src.services.analysis_service.StyleAgent"
+    ) as MockStyleAgent, patch("src.services.analysis_service.QualityAgent") as MockQualityAgent:
+        MockSecurityAgent.return_value.analyze.side_effect = asyncio.CancelledError()
+        MockStyleAgent.return_value.analyze.return_value = []
+        MockQualityAgent.return_value.analyze.return_value = []
+
+        with pytest.raises(asyncio.CancelledError):
+            await service._run_agents(context)
+
+
+@pytest.mark.asyncio
+async def test_analyze_code_runs_agents_concurrently(service, mock_repo):
+    """Los agentes se ejecutan en hilos en paralelo, no uno tras otro."""
+    mock_file = AsyncMock(spec=UploadFile)
+    mock_file.filename = "valid.py"
+    mock_file.read.return_value = b"import os\n" * 6
+
+    def slow_analyze(context):
+        time.sleep(0.1)
+        return []
+
+    with patch("src.services.analysis_service.SecurityAgent") as MockSecurityAgent, patch(
+        "src.services.analysis_service.StyleAgent"
+    ) as MockStyleAgent, patch("src.services.analysis_service.QualityAgent") as MockQualityAgent:
+        for mock_agent in (MockSecurityAgent, MockStyleAgent, MockQualityAgent):
+            mock_agent.return_value.analyze.side_effect = slow_analyze
+
+        start = time.perf_counter()
+        await service.analyze_code(mock_file, "user_123")
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.25
@@ -3,13 +3,14 @@ Unit tests for Analysis Schemas
 Tests para los esquemas de análisis
 """
 
+import json
 from datetime import datetime
 
 import pytest
 from pydantic import ValidationError
 
 from src.schemas.analysis import AnalysisContext, AnalysisRequest, AnalysisResponse
-from src.schemas.finding import Finding, Severity
+from src.schemas.finding import Finding, FindingsSoA, Severity
 
 
 class TestAnalysisContext:
@@ -150,6 +151,24 @@ class TestFinding:
         assert finding.line_number == 10
         assert isinstance(finding.detected_at, datetime)
 
+    def test_finding_is_immutable(self):
+        """Test que Finding es inmutable y se modifica solo vía model_copy."""
+        finding = Finding(
+            severity=Severity.LOW,
+            issue_type="style",
+            message="Line too long",
+            line_number=3,
+            agent_name="StyleAgent",
+        )
+
+        with pytest.raises(ValidationError):
+            finding.line_number = 4
+
+        moved = finding.model_copy(update={"line_number": 4})
+        assert moved.line_number == 4
+        assert finding.line_number == 3
+        assert hash(finding) != hash(moved)
+
     def test_invalid_line_number_zero(self):
         """Test que line_number < 1 lanza error."""
         with pytest.raises(ValidationError):
@@ -265,6 +284,17 @@ class TestAnalysisContextHelpers:
         assert context.get_line(99) is None
         assert context.get_code_snippet(1, 2) == "a\nb"
 
+    def test_line_offsets_and_line_number_lookup(self):
+        context = AnalysisContext(code_content="ab\r\ncd\n\nefg", filename="file.py")
+        assert context.get_line_offsets() == [0, 4, 7, 8]
+        assert context.get_line_offsets() is context.get_line_offsets()
+        assert context.get_line_number(0) == 1
+        assert context.get_line_number(3) == 1
+        assert context.get_line_number(4) == 2
+        assert context.get_line_number(7) == 3
+        assert context.get_line_number(context.code_content.index("efg")) == 4
+        assert len(context.get_line_offsets()) == len(context.get_lines())
+
     def test_finding_from_and_to_dict_without_detected_at(self):
         data = {
             "severity": "CRITICAL",
@@ -278,6 +308,22 @@ class TestAnalysisContextHelpers:
         assert serialized["severity"] == "CRITICAL"
         assert "detected_at" in serialized
 
+    def test_finding_dict_round_trip(self):
+        finding = Finding(
+            severity=Severity.HIGH,
+            issue_type="sql_injection",
+            message="Possible SQL injection",
+            line_number=3,
+            agent_name="SecurityAgent",
+            rule_id="SEC002",
+        )
+        serialized = finding.to_dict()
+        assert isinstance(serialized["detected_at"], str)
+        data = dict(serialized, detected_at=None)
+        assert Finding.from_dict(serialized) == finding
+        assert Finding.from_dict(data).detected_at is not None
+        assert data["detected_at"] is None
+
     def test_calculate_penalty_map(self):
         finding = Finding(
             severity=Severity.HIGH,
@@ -287,3 +333,51 @@ class TestAnalysisContextHelpers:
             agent_name="TestAgent",
         )
         assert finding.calculate_penalty() == 5
+
+
+class TestFindingsSoA:
+    @staticmethod
+    def _findings():
+        return [
+            Finding(
+                severity=severity,
+                issue_type="style/pep8",
+                message=f"Issue number {line}",
+                line_number=line,
+                agent_name="StyleAgent",
+                code_snippet="x = 1",
+                rule_id="FLAKE8_E501",
+            )
+            for line, severity in ((1, Severity.HIGH), (7, Severity.LOW))
+        ]
+
+    def test_from_findings_builds_parallel_columns(self):
+        soa = FindingsSoA.from_findings(self._findings())
+        assert len(soa) == 2
+        assert soa.line_numbers.tolist() == [1, 7]
+        assert isinstance(soa.severities, bytearray)
+        assert soa.rule_ids[0] is soa.rule_ids[1]
+
+    def test_getitem_builds_finding_on_demand(self):
+        findings = self._findings()
+        soa = FindingsSoA.from_findings(findings)
+        assert soa[-1].model_dump(exclude={"detected_at"}) == findings[-1].model_dump(
+            exclude={"detected_at"}
+        )
+        assert soa[0].detected_at == soa.detected_at
+        assert [f.line_number for f in soa] == [1, 7]
+        with pytest.raises(IndexError):
+            soa[2]
+
+    def test_to_dict_is_json_serializable(self):
+        serialized = FindingsSoA.from_findings(self._findings()).to_dict()
+        assert json.loads(json.dumps(serialized)) == serialized
+        assert serialized["severities"] == ["HIGH", "LOW"]
+        assert serialized["line_numbers"] == [1, 7]
+
+    def test_to_dict_detected_at_matches_finding_to_dict(self):
+        soa = FindingsSoA.from_findings(self._findings())
+        serialized = soa.to_dict()["detected_at"]
+        assert serialized == soa[0].to_dict()["detected_at"]
+        assert serialized == soa.detected_at.isoformat()
+        assert serialized.endswith("+00:00")
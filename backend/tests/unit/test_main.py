@@ -19,6 +19,16 @@ def test_health_endpoint():
     assert "service" in data
 
 
+def test_database_pool_health_endpoint():
+    """Test pool stats endpoint exposes the configured pool size"""
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["pool"]["pool_size"] >= 1
+    assert "max_overflow" in data["pool"]
+
+
 def test_root_endpoint():
     """Test root endpoint returns 200"""
     response = client.get("/")